@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import threading
+import time
+from utils.local_store import local_store
+from utils.snapshot import write_snapshot
+
+ACCOUNT_PATH = 'data/account.json'
+
+class AccountSession:
+    """Compte Destiny 2 enregistré, chargé une fois et partagé par toutes les pages.
+
+    Le fichier n'est relu que si sa date de modification ou sa taille change
+    (vérifiées au plus une fois par `check_interval` secondes). La relecture
+    peut avoir lieu sur n'importe quel thread ; les abonnés sont appelés via
+    `dispatcher` (thread GUI dans l'application) pour ne jamais toucher aux
+    widgets depuis un thread de travail.
+    """
+
+    def __init__(self, path=ACCOUNT_PATH, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.data = None
+        self.listeners = []
+        self.dispatcher = None
+        self.lock = threading.RLock()
+        self._stamp = None
+        self._checked_at = 0.0
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _refresh(self, force=False):
+        """Recharge le fichier s'il a été modifié depuis la dernière lecture."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        with self.lock:
+            self._checked_at = now
+            stamp = self._file_stamp()
+            if stamp == self._stamp and not force:
+                return
+            self._stamp = stamp
+            previous = self.data
+            self.data = None
+            if stamp is not None:
+                try:
+                    with open(self.path, 'r') as f:
+                        self.data = json.load(f)
+                    logging.debug(f"Compte chargé depuis {self.path}")
+                except Exception as e:
+                    logging.error(f"Erreur lors du chargement du compte: {str(e)}")
+        if previous is not None or self.data is not None:
+            self._notify()
+
+    def set_dispatcher(self, dispatcher):
+        """`dispatcher(fonction)` exécute la fonction sur le thread des abonnés (file d'attente Qt)."""
+        self.dispatcher = dispatcher
+
+    def _notify(self):
+        if self.dispatcher is not None:
+            self.dispatcher(self._notify_listeners)
+        else:
+            self._notify_listeners()
+
+    def _notify_listeners(self):
+        for callback in list(self.listeners):
+            try:
+                callback(self)
+            except Exception as e:
+                logging.error(f"Erreur dans un abonné au compte: {str(e)}")
+
+    def add_listener(self, callback):
+        """Appelle `callback(session)` quand le compte change (y compris hors application)."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def save(self, response_data):
+        """Enregistre la réponse SearchDestinyPlayerByBungieName comme compte courant."""
+        with self.lock:
+            write_snapshot(self.path, response_data)
+            self.data = response_data
+            self._stamp = self._file_stamp()
+            self._checked_at = time.monotonic()
+        try:
+            local_store.put_document('account', response_data)
+        except Exception as e:
+            logging.error(f"Erreur lors de l'enregistrement du compte dans le stockage local: {str(e)}")
+        self._notify()
+
+    def reload(self):
+        """Force la relecture du fichier."""
+        self._refresh(force=True)
+
+    @property
+    def player_info(self):
+        self._refresh()
+        data = self.data
+        if not data or not data.get('Response'):
+            return None
+        return data['Response'][0]
+
+    @property
+    def is_registered(self):
+        return self.player_info is not None
+
+    @property
+    def membership_id(self):
+        info = self.player_info
+        return info['membershipId'] if info else None
+
+    @property
+    def membership_type(self):
+        info = self.player_info
+        return info['membershipType'] if info else None
+
+    def membership(self):
+        """Retourne (membership_type, membership_id) ou lève une erreur si aucun compte."""
+        info = self.player_info
+        if info is None:
+            raise LookupError("Aucun compte Destiny 2 enregistré")
+        return info['membershipType'], info['membershipId']
+
+account_session = AccountSession()
@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from api.bungie_client import bungie_client, BungieAPIError
+from api.pgcr_meta import parse_period
+from utils.local_store import local_store
+
+PAGE_SIZE = 250          # Maximum accepté par GetActivityHistory
+PGCR_BATCH = 50          # PGCR validés par transaction (point de reprise)
+
+def encode_pgcr(pgcr):
+    return zlib.compress(json.dumps(pgcr, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), 6)
+
+def decode_pgcr(payload):
+    return json.loads(zlib.decompress(payload))
+
+def activity_row(activity):
+    details = activity['activityDetails']
+    return (int(details['instanceId']), parse_period(activity.get('period')), details.get('mode', 0),
+            ','.join(str(mode) for mode in details.get('modes', [])), details.get('referenceId'))
+
+class CrawlReport:
+    __slots__ = ('characters', 'pages', 'activities', 'pgcrs', 'errors', 'elapsed')
+
+    def __init__(self):
+        self.characters = 0
+        self.pages = 0
+        self.activities = 0
+        self.pgcrs = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (f"CrawlReport({self.characters} personnage(s), {self.pages} pages, {self.activities} activités, "
+                f"{self.pgcrs} PGCR, {self.errors} erreur(s), {self.elapsed:.1f} s)")
+
+class ActivityCrawler:
+    """Parcourt l'historique d'activités de chaque personnage puis télécharge les PGCR.
+
+    Reprise : chaque page d'historique est validée avec son point de reprise
+    (dernière activité connue, page de rattrapage, parcours complet) et les
+    PGCR par lots ; une nouvelle exécution ne récupère que les nouvelles
+    activités, le reste du rattrapage interrompu et les PGCR manquants.
+    """
+
+    def __init__(self, client=bungie_client, store=local_store, max_workers=12):
+        self.client = client
+        self.store = store
+        self.max_workers = max_workers
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _page(self, membership_type, membership_id, character_id, page):
+        return self.client.get_activity_history(membership_type, membership_id, character_id,
+                                                count=PAGE_SIZE, page=page)
+
+    def crawl_history(self, membership_type, membership_id, character_id, report, progress=None):
+        checkpoint = self.store.get_crawl_checkpoint(character_id) or {
+            'newest_instance_id': None, 'resume_page': 0, 'complete': False}
+        newest = checkpoint['newest_instance_id']
+        if newest is None and checkpoint['complete']:
+            # Historique vide au dernier passage : on le reparcourt entièrement
+            checkpoint.update(resume_page=0, complete=False)
+
+        # 1. Nouvelles activités : des plus récentes jusqu'à la dernière connue
+        if newest is not None:
+            page = 0
+            top = None
+            while not self.stop_event.is_set():
+                activities = self._page(membership_type, membership_id, character_id, page)
+                report.pages += 1
+                rows = [activity_row(activity) for activity in activities]
+                fresh = [row for row in rows if row[0] > newest]
+                top = top or (rows[0][0] if rows else None)
+                report.activities += self.store.save_activity_page(membership_id, character_id, fresh, checkpoint)
+                if len(fresh) < len(rows) or len(rows) < PAGE_SIZE:
+                    break
+                page += 1
+            if top is not None and not self.stop_event.is_set():
+                checkpoint['newest_instance_id'] = newest = max(newest, top)
+                self.store.save_activity_page(membership_id, character_id, [], checkpoint)
+
+        # 2. Rattrapage de l'historique complet, repris à la dernière page validée.
+        # Les nouvelles activités décalent les pages vers l'arrière : on peut revoir
+        # des activités déjà stockées, jamais en sauter.
+        page = checkpoint['resume_page']
+        while not checkpoint['complete'] and not self.stop_event.is_set():
+            activities = self._page(membership_type, membership_id, character_id, page)
+            report.pages += 1
+            rows = [activity_row(activity) for activity in activities]
+            if page == 0 and rows and checkpoint['newest_instance_id'] is None:
+                checkpoint['newest_instance_id'] = rows[0][0]
+            page += 1
+            checkpoint['resume_page'] = page
+            checkpoint['complete'] = len(rows) < PAGE_SIZE
+            report.activities += self.store.save_activity_page(membership_id, character_id, rows, checkpoint)
+            if progress:
+                progress(f"Historique {character_id} : page {page}")
+
+    def _fetch_pgcr(self, instance_id):
+        pgcr = self.client.get_pgcr(instance_id) or {}
+        details = pgcr.get('activityDetails', {})
+        return (instance_id, parse_period(pgcr.get('period')), details.get('mode', 0), encode_pgcr(pgcr))
+
+    def crawl_pgcrs(self, membership_id, report, progress=None, limit=None):
+        missing = self.store.missing_pgcr_ids(membership_id, limit)
+        if not missing:
+            return
+        batch = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_pgcr, instance_id) for instance_id in missing]
+            for future in as_completed(futures):
+                if self.stop_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                try:
+                    batch.append(future.result())
+                except (BungieAPIError, ValueError) as e:
+                    report.errors += 1
+                    logging.debug(f"PGCR ignoré: {str(e)}")
+                    continue
+                if len(batch) >= PGCR_BATCH:
+                    self.store.put_pgcrs(batch)
+                    report.pgcrs += len(batch)
+                    batch = []
+                    if progress:
+                        progress(f"PGCR : {report.pgcrs}/{len(missing)}")
+        if batch:
+            self.store.put_pgcrs(batch)
+            report.pgcrs += len(batch)
+
+    def crawl(self, membership_type, membership_id, character_ids=None, progress=None, pgcr_limit=None):
+        """Synchronise l'historique de tous les personnages puis les PGCR manquants."""
+        start = time.perf_counter()
+        self.stop_event.clear()
+        report = CrawlReport()
+        if character_ids is None:
+            character_ids = [character['character_id'] for character in self.store.get_characters(membership_id)]
+        for character_id in character_ids:
+            if self.stop_event.is_set():
+                break
+            try:
+                self.crawl_history(membership_type, membership_id, character_id, report, progress)
+                report.characters += 1
+            except BungieAPIError as e:
+                report.errors += 1
+                logging.error(f"Historique de {character_id} interrompu: {str(e)}")
+        if not self.stop_event.is_set():
+            self.crawl_pgcrs(membership_id, report, progress, pgcr_limit)
+        report.elapsed = time.perf_counter() - start
+        logging.info(f"✓ Exploration de l'historique : {report}")
+        return report
+
+activity_crawler = ActivityCrawler()
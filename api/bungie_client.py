@@ -1,11 +1,30 @@
 import requests
 import logging
+import threading
+import time
+from requests.adapters import HTTPAdapter
 from utils.config import OAUTH_CONFIG
+from api.rate_limiter import bungie_rate_limiter
+
+PLATFORM_URL = 'https://www.bungie.net/Platform'
+STATS_URL = 'https://stats.bungie.net/Platform'
+THROTTLE_CODES = (36, 51)  # ThrottleLimitExceeded*, PerApplicationThrottleExceeded
+
+class BungieAPIError(Exception):
+    """Réponse d'erreur de l'API Bungie (ErrorCode != 1)."""
+
+    def __init__(self, message, error_code=None, status=None):
+        super().__init__(message)
+        self.error_code = error_code
+        self.status = status
 
 class BungieClient:
-    def __init__(self):
+    def __init__(self, rate_limiter=bungie_rate_limiter):
         self.api_key = OAUTH_CONFIG['api_key']
-        
+        self.rate_limiter = rate_limiter
+        self._session = None
+        self._session_lock = threading.Lock()
+
     def get_headers(self, access_token=None):
         headers = {
             'X-API-Key': self.api_key,
@@ -14,7 +33,73 @@ class BungieClient:
         if access_token:
             headers['Authorization'] = f'Bearer {access_token}'
         return headers
-        
+
+    @property
+    def session(self):
+        """Session HTTP partagée (connexions réutilisées entre threads)."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount('https://', adapter)
+                session.headers.update(self.get_headers())
+                self._session = session
+            return self._session
+
+    def get(self, path, params=None, base=PLATFORM_URL, retries=3, timeout=15, access_token=None):
+        """GET limité en débit ; retourne le champ `Response` ou lève BungieAPIError."""
+        url = f"{base}{path}"
+        headers = {'Authorization': f'Bearer {access_token}'} if access_token else None
+        for attempt in range(retries):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            except requests.RequestException as e:
+                if attempt == retries - 1:
+                    raise BungieAPIError(str(e))
+                time.sleep(2 ** attempt)
+                continue
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            throttle = data.get('ThrottleSeconds', 0)
+            if response.status_code == 429 or data.get('ErrorCode') in THROTTLE_CODES:
+                self.rate_limiter.penalize(max(throttle, 2 ** attempt))
+                continue
+            if throttle:
+                self.rate_limiter.penalize(throttle)
+            if response.status_code >= 500 and attempt < retries - 1:
+                time.sleep(2 ** attempt)
+                continue
+            if data.get('ErrorCode', 0) != 1:
+                raise BungieAPIError(data.get('Message') or f"HTTP {response.status_code}",
+                                     data.get('ErrorCode'), response.status_code)
+            return data.get('Response')
+        raise BungieAPIError(f"Échec après {retries} tentatives: {path}")
+
+    def get_pgcr(self, activity_id):
+        """Post Game Carnage Report d'une activité (servi par stats.bungie.net)."""
+        return self.get(f"/Destiny2/Stats/PostGameCarnageReport/{activity_id}/", base=STATS_URL)
+
+    def get_activity_history(self, membership_type, membership_id, character_id, mode=0, count=250, page=0):
+        """Une page de l'historique d'activités d'un personnage (plus récentes d'abord)."""
+        response = self.get(
+            f"/Destiny2/{membership_type}/Account/{membership_id}/Character/{character_id}/Stats/Activities/",
+            params={'mode': mode, 'count': count, 'page': page}
+        )
+        return (response or {}).get('activities', [])
+
+    def get_profile(self, membership_type, membership_id, components, access_token=None):
+        """Profil ; sans jeton OAuth, les composants privés (102, 201...) sont absents de la réponse."""
+        return self.get(f"/Destiny2/{membership_type}/Profile/{membership_id}/", params={'components': components},
+                        access_token=access_token)
+
+    def get_members_of_group(self, group_id, page=1):
+        """Une page des membres d'un clan : (membres, d'autres pages à suivre)."""
+        response = self.get(f"/GroupV2/{group_id}/Members/", params={'currentpage': page}) or {}
+        return response.get('results', []), bool(response.get('hasMore'))
+
     def search_destiny_player(self, display_name, display_name_code):
         try:
             headers = self.get_headers()
@@ -33,4 +118,6 @@ class BungieClient:
             
         except Exception as e:
             logging.error(f"Erreur lors de la recherche du joueur: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+bungie_client = BungieClient()
@@ -0,0 +1,115 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from api.bungie_client import bungie_client, BungieAPIError
+from api.manifest import manifest
+from utils.local_store import local_store
+
+# 100 : profil, 200 : personnages, 201/205 : inventaires et équipement, 300 : instances
+# (201 n'est renvoyé que si le membre rend son inventaire public)
+ROSTER_COMPONENTS = '100,200,201,205,300'
+ITEM_TYPE_WEAPON = 3
+
+class RosterReport:
+    __slots__ = ('members', 'profiles', 'errors', 'elapsed')
+
+    def __init__(self):
+        self.members = 0
+        self.profiles = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (f"RosterReport({self.profiles}/{self.members} profil(s), {self.errors} erreur(s), "
+                f"{self.elapsed:.1f} s)")
+
+def member_row(result):
+    """Résultat de GetMembersOfGroup -> (membership_id, membership_type, nom, en ligne, arrivée)."""
+    info = result.get('destinyUserInfo', {})
+    name = info.get('bungieGlobalDisplayName') or info.get('displayName')
+    code = info.get('bungieGlobalDisplayNameCode')
+    if name and code:
+        name = f"{name}#{code:04d}"
+    return (str(info['membershipId']), info.get('membershipType'), name,
+            int(bool(result.get('isOnline'))), result.get('joinDate'))
+
+class ClanRoster:
+    """Récupère les profils de tous les membres d'un clan dans le stockage local.
+
+    Les profils sont téléchargés en parallèle (pool borné) sous le limiteur de
+    débit partagé du client, puis enregistrés par `upsert_profile` : les vues
+    agrégées (puissance par membre, détenteurs de chaque arme) sont de simples
+    requêtes SQL sur les tables existantes.
+    """
+
+    def __init__(self, client=bungie_client, store=local_store, max_workers=8):
+        self.client = client
+        self.store = store
+        self.max_workers = max_workers
+
+    def fetch_members(self, group_id):
+        members, page, more = [], 1, True
+        while more:
+            results, more = self.client.get_members_of_group(group_id, page)
+            members += [member_row(result) for result in results if result.get('destinyUserInfo')]
+            page += 1
+        return members
+
+    def _sync_member(self, membership_type, membership_id):
+        response = self.client.get_profile(membership_type, membership_id, ROSTER_COMPONENTS)
+        if not response:
+            raise BungieAPIError(f"Profil vide pour {membership_id}")
+        self.store.upsert_profile(membership_type, membership_id, response)
+
+    def sync(self, group_id, progress=None):
+        """Met à jour le roster puis le profil de chaque membre ; retourne un RosterReport."""
+        start = time.perf_counter()
+        report = RosterReport()
+        members = self.fetch_members(group_id)
+        self.store.upsert_clan_members(group_id, members)
+        report.members = len(members)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._sync_member, member[1], member[0]): member for member in members}
+            for future in as_completed(futures):
+                membership_id, _, name = futures[future][:3]
+                try:
+                    future.result()
+                    self.store.mark_clan_member_synced(group_id, membership_id)
+                    report.profiles += 1
+                except (BungieAPIError, KeyError, ValueError) as e:
+                    # Profil privé ou introuvable : le membre reste dans le roster sans données
+                    report.errors += 1
+                    logging.warning(f"Profil de {name or membership_id} ignoré: {str(e)}")
+                if progress:
+                    progress(f"Profils : {report.profiles + report.errors}/{report.members}")
+        report.elapsed = time.perf_counter() - start
+        logging.info(f"✓ Clan {group_id} synchronisé : {report}")
+        return report
+
+    def roster(self, group_id):
+        return self.store.get_clan_roster(group_id)
+
+    def weapon_holders(self, group_id):
+        """Armes détenues dans le clan, triées par nombre de détenteurs."""
+        rows = self.store.get_clan_item_holders(group_id)
+        definitions = manifest.get_item_definitions({row['item_hash'] for row in rows})
+        weapons = {}
+        for row in rows:
+            definition = definitions.get(str(row['item_hash']), {})
+            if definition.get('itemType') != ITEM_TYPE_WEAPON:
+                continue
+            weapon = weapons.get(row['item_hash'])
+            if weapon is None:
+                display = definition.get('displayProperties', {})
+                weapon = weapons[row['item_hash']] = {
+                    'item_hash': row['item_hash'],
+                    'name': display.get('name', str(row['item_hash'])),
+                    'type': definition.get('itemTypeDisplayName', ''),
+                    'holders': [],
+                }
+            weapon['holders'].append((row['display_name'] or row['membership_id'], row['power']))
+        for weapon in weapons.values():
+            weapon['holders'].sort(key=lambda holder: holder[1] or 0, reverse=True)
+        return sorted(weapons.values(), key=lambda weapon: (-len(weapon['holders']), weapon['name']))
+
+clan_roster = ClanRoster()
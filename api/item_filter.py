@@ -0,0 +1,450 @@
+import re
+from functools import lru_cache
+from api.models import WEAPON_BUCKETS, ARMOR_BUCKETS, AMMO_TYPES, ENERGY_TYPES
+from api.search_index import normalize, tokenize, plug_names
+from api.wishlist import wishlist
+
+class FilterSyntaxError(ValueError):
+    """Expression de filtre invalide."""
+
+# Hashes DestinyStatDefinition (noms anglais et français)
+STAT_ALIASES = {
+    'range': 1240592695, 'portee': 1240592695,
+    'stability': 155624089, 'stabilite': 155624089,
+    'handling': 943549884, 'maniement': 943549884,
+    'reload': 4188031367, 'rechargement': 4188031367,
+    'impact': 4043523819,
+    'rpm': 4284893193, 'cadence': 4284893193,
+    'magazine': 3871231066, 'chargeur': 3871231066,
+    'aimassist': 1345609583, 'aide': 1345609583,
+    'zoom': 3555269338,
+    'blastradius': 3614673599, 'rayon': 3614673599,
+    'velocity': 2523465841, 'vitesse': 2523465841,
+    'chargetime': 2961396640,
+    'drawtime': 447667954,
+    'mobility': 2996146975, 'mobilite': 2996146975,
+    'resilience': 392767087,
+    'recovery': 1943323491, 'recuperation': 1943323491,
+    'discipline': 1735777505,
+    'intellect': 144602215, 'intelligence': 144602215,
+    'strength': 4244567218, 'force': 4244567218,
+}
+AMMO_ALIASES = {'primary': 1, 'primaire': 1, 'special': 2, 'speciale': 2, 'heavy': 3, 'lourde': 3, 'power': 3}
+ENERGY_ALIASES = {
+    'kinetic': None, 'cinetique': None, 'arc': 1, 'solar': 2, 'solaire': 2,
+    'void': 3, 'cryo': 3, 'stasis': 4, 'stasique': 4, 'strand': 6,
+}
+TIER_ALIASES = {'exotic': 6, 'exotique': 6, 'legendary': 5, 'legendaire': 5, 'rare': 4, 'uncommon': 3, 'common': 2}
+
+_COMPARISON = re.compile(r'^([a-z_]*)(>=|<=|>|<|=)?(-?\d+(?:\.\d+)?)$')
+_OPERATORS = {
+    '>=': lambda a, b: a >= b, '<=': lambda a, b: a <= b, '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b, '=': lambda a, b: a == b,
+}
+
+def parse_comparison(value):
+    """'range>=60' -> ('range', '>=', 60) ; '>=1800' -> ('', '>=', 1800)."""
+    match = _COMPARISON.match(normalize(value).replace(' ', ''))
+    if not match:
+        raise FilterSyntaxError(f"Comparaison invalide : {value}")
+    name, operator, number = match.groups()
+    number = float(number) if '.' in number else int(number)
+    return name, operator or '=', number
+
+def comparison_bounds(operator, number):
+    """Bornes entières (incluses) d'une comparaison, pour les index triés."""
+    return {
+        '>=': (number, None), '>': (int(number) + 1, None), '<=': (None, number),
+        '<': (None, int(number) - 1 if number == int(number) else int(number)), '=': (number, number),
+    }[operator]
+
+# --- Arbre compilé ---
+
+class Term:
+    """Feuille : prédicat sur un enregistrement, avec recherche d'index optionnelle.
+
+    `selectivity` estime la fraction des enregistrements retenus ; les
+    feuilles les plus sélectives sont évaluées en premier.
+    """
+    __slots__ = ('description', 'predicate', 'lookup', 'selectivity')
+
+    def __init__(self, description, predicate, lookup=None, selectivity=0.5):
+        self.description = description
+        self.predicate = predicate
+        self.lookup = lookup
+        self.selectivity = selectivity
+
+    def matches(self, record):
+        return self.predicate(record)
+
+    def keys(self, context):
+        """Clés retenues d'après l'index seul (mémorisées pendant une évaluation)."""
+        if self.lookup is None:
+            return None
+        cache = context['lookups']
+        if self not in cache:
+            cache[self] = self.lookup(context['index'])
+        return cache[self]
+
+    def estimate(self, context, candidates):
+        keys = self.keys(context)
+        return len(keys) if keys is not None else self.selectivity * len(candidates) + len(candidates)
+
+    def evaluate(self, context, candidates):
+        keys = self.keys(context)
+        if keys is not None:
+            return candidates & keys
+        items = context['items']
+        return {key for key in candidates if self.predicate(items[key])}
+
+class And:
+    __slots__ = ('children', 'selectivity')
+
+    def __init__(self, children):
+        # Ordre statique (prédicats sans index) : le plus sélectif d'abord
+        self.children = sorted(children, key=lambda child: child.selectivity)
+        selectivity = 1.0
+        for child in self.children:
+            selectivity *= child.selectivity
+        self.selectivity = selectivity
+
+    def matches(self, record):
+        return all(child.matches(record) for child in self.children)
+
+    def estimate(self, context, candidates):
+        return min(child.estimate(context, candidates) for child in self.children)
+
+    def evaluate(self, context, candidates):
+        # Ordre dynamique : taille réelle des ensembles d'index, puis coût estimé
+        for child in sorted(self.children, key=lambda child: child.estimate(context, candidates)):
+            candidates = child.evaluate(context, candidates)
+            if not candidates:
+                break
+        return candidates
+
+class Or:
+    __slots__ = ('children', 'selectivity')
+
+    def __init__(self, children):
+        self.children = sorted(children, key=lambda child: -child.selectivity)
+        self.selectivity = min(1.0, sum(child.selectivity for child in self.children))
+
+    def matches(self, record):
+        return any(child.matches(record) for child in self.children)
+
+    def estimate(self, context, candidates):
+        return sum(child.estimate(context, candidates) for child in self.children)
+
+    def evaluate(self, context, candidates):
+        result = set()
+        remaining = candidates
+        for child in self.children:
+            found = child.evaluate(context, remaining)
+            result |= found
+            remaining = remaining - found
+            if not remaining:
+                break
+        return result
+
+class Not:
+    __slots__ = ('child', 'selectivity')
+
+    def __init__(self, child):
+        self.child = child
+        self.selectivity = 1.0 - child.selectivity
+
+    def matches(self, record):
+        return not self.child.matches(record)
+
+    def estimate(self, context, candidates):
+        return len(candidates)
+
+    def evaluate(self, context, candidates):
+        return candidates - self.child.evaluate(context, candidates)
+
+# --- Analyse ---
+
+# '-' collé à une parenthèse : négation du groupe (syntaxe DIM)
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|(-)(?=\()|(-)?(?:([a-z_]+):)?("[^"]*"?|[^\s()]+))', re.IGNORECASE)
+
+def tokenize_query(query):
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if not match or match.end() == position:
+            raise FilterSyntaxError(f"Caractère inattendu : {query[position:]}")
+        position = match.end()
+        opening, closing, negated_group, negated, key, value = match.groups()
+        if opening:
+            tokens.append(('(',))
+        elif negated_group:
+            tokens.append(('not',))
+        elif closing:
+            tokens.append((')',))
+        else:
+            quoted = value.startswith('"')
+            if quoted and (len(value) < 2 or not value.endswith('"')):
+                raise FilterSyntaxError("Guillemet non fermé")
+            if not quoted and value == '-':
+                raise FilterSyntaxError("Négation sans terme")
+            value = value.strip('"')
+            if key is None and not quoted and not negated and value.lower() in ('or', 'ou', 'and', 'et', 'not'):
+                tokens.append((value.lower(),))
+            else:
+                tokens.append(('term', bool(negated), key.lower() if key else None, value))
+    return tokens
+
+class _Parser:
+    """expression := et ('or' et)* ; et := unaire+ ; unaire := '-'|'not' unaire | '(' expression ')' | terme"""
+
+    def __init__(self, tokens, schema):
+        self.tokens = tokens
+        self.position = 0
+        self.schema = schema
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self):
+        node = self.expression()
+        if self.peek() is not None:
+            raise FilterSyntaxError("Parenthèse fermante en trop")
+        return node
+
+    def expression(self):
+        children = [self.conjunction()]
+        while self.peek() and self.peek()[0] in ('or', 'ou'):
+            self.position += 1
+            children.append(self.conjunction())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def conjunction(self):
+        children = []
+        while self.peek() and self.peek()[0] not in ('or', 'ou', ')'):
+            if self.peek()[0] in ('and', 'et'):
+                self.position += 1
+                continue
+            children.append(self.unary())
+        if not children:
+            raise FilterSyntaxError("Expression vide")
+        return children[0] if len(children) == 1 else And(children)
+
+    def unary(self):
+        token = self.peek()
+        if token is None:
+            raise FilterSyntaxError("Expression incomplète")
+        self.position += 1
+        if token[0] == 'not':
+            return Not(self.unary())
+        if token[0] == '(':
+            node = self.expression()
+            if self.peek() != (')',):
+                raise FilterSyntaxError("Parenthèse non fermée")
+            self.position += 1
+            return node
+        _, negated, key, value = token
+        node = self.schema.term(key, value)
+        return Not(node) if negated else node
+
+class FilterSchema:
+    """Mots-clés d'un type d'enregistrement : fabrique de Term par mot-clé."""
+
+    def __init__(self, factories, text_factory):
+        self.factories = factories
+        self.text_factory = text_factory
+
+    def term(self, key, value):
+        if key is None:
+            return self.text_factory(value)
+        factory = self.factories.get(key)
+        if factory is None:
+            raise FilterSyntaxError(f"Filtre inconnu : {key}")
+        return factory(value)
+
+class CompiledFilter:
+    def __init__(self, query, root):
+        self.query = query
+        self.root = root
+
+    def matches(self, record):
+        return self.root.matches(record)
+
+    def filter(self, records):
+        """Filtre une liste d'enregistrements par prédicats (sans index)."""
+        return [record for record in records if self.root.matches(record)]
+
+    def filter_keys(self, index, candidates=None):
+        """Clés des items de l'index qui satisfont l'expression."""
+        context = {'index': index, 'items': index.items, 'lookups': {}}
+        candidates = set(index.items) if candidates is None else set(candidates)
+        return self.root.evaluate(context, candidates)
+
+@lru_cache(maxsize=256)
+def _compile(query, schema):
+    tokens = tokenize_query(query)
+    if not tokens:
+        return None
+    return CompiledFilter(query, _Parser(tokens, schema).parse())
+
+def compile_filter(query, schema=None):
+    """Analyse et compile une expression (une seule fois par texte) ; None si vide."""
+    return _compile(query.strip(), schema or ITEM_FILTERS)
+
+# --- Items d'inventaire (ItemInstance + InventoryIndex) ---
+
+def _text_in(value, names):
+    wanted = normalize(value)
+    return any(wanted in normalize(name) for name in names)
+
+def _field_term(field, value, names, selectivity):
+    words = tokenize(value)
+    if not words:
+        raise FilterSyntaxError(f"Valeur vide pour {field}")
+
+    def lookup(index):
+        keys = None
+        for word in words:
+            found = index.term_keys(word, (field,))
+            keys = found if keys is None else keys & found
+        return keys
+    return Term(f"{field}:{value}", lambda item: _text_in(value, names(item)), lookup, selectivity)
+
+def _ammo_term(value):
+    ammo_type = AMMO_ALIASES.get(normalize(value))
+    if ammo_type is None:
+        raise FilterSyntaxError(f"Munitions inconnues : {value}")
+    term = normalize(AMMO_TYPES[ammo_type])
+    return Term(f"ammo:{value}", lambda item: item.definition is not None and item.definition.ammo_type == ammo_type,
+                lambda index: set(index.postings['ammo'].get(term, ())), 0.33)
+
+def _element_term(value):
+    name = normalize(value)
+    if name not in ENERGY_ALIASES:
+        raise FilterSyntaxError(f"Élément inconnu : {value}")
+    energy_type = ENERGY_ALIASES[name]
+    terms = tokenize(ENERGY_TYPES.get(energy_type, '') if energy_type is not None else 'Cinétique')
+
+    def lookup(index):
+        keys = None
+        for term in terms:
+            found = set(index.postings['element'].get(term, ()))
+            keys = found if keys is None else keys & found
+        return keys or set()
+    return Term(f"element:{value}",
+                lambda item: item.definition is not None and item.definition.energy_type == energy_type,
+                lookup, 0.2)
+
+def _slot_term(slots, description, selectivity):
+    return Term(description, lambda item: item.bucket_type in slots,
+                lambda index: set().union(*(index.postings['slot'].get(slot, ()) for slot in slots)),
+                selectivity)
+
+def _wishlist_kind(item):
+    """True : roll à jeter, False : roll recherché, None : absent de la wishlist."""
+    match = wishlist.match(item)
+    return match.trash if match else None
+
+def _is_term(value):
+    name = normalize(value)
+    if name in ('weapon', 'arme'):
+        return _slot_term(WEAPON_BUCKETS, 'is:weapon', 0.4)
+    if name in ('armor', 'armure'):
+        return _slot_term(ARMOR_BUCKETS, 'is:armor', 0.5)
+    if name in WEAPON_BUCKETS + ARMOR_BUCKETS:
+        return _slot_term((name,), f"is:{name}", 0.12)
+    if name in TIER_ALIASES:
+        tier = TIER_ALIASES[name]
+        return Term(f"is:{name}", lambda item: item.definition is not None and item.definition.tier_type == tier,
+                    selectivity=0.1 if tier == 6 else 0.5)
+    if name in AMMO_ALIASES:
+        return _ammo_term(name)
+    if name in ENERGY_ALIASES:
+        return _element_term(name)
+    if name in ('vault', 'coffre'):
+        return Term('is:vault', lambda item: item.in_vault, selectivity=0.6)
+    if name in ('equipped', 'equipe'):
+        return Term('is:equipped', lambda item: item.location == 'equipped', selectivity=0.05)
+    if name in ('inventory', 'inventaire'):
+        return Term('is:inventory', lambda item: item.location == 'inventory', selectivity=0.3)
+    if name in ('wishlist', 'godroll'):
+        return Term('is:wishlist', lambda item: _wishlist_kind(item) is False, selectivity=0.05)
+    if name in ('trash', 'poubelle'):
+        return Term('is:trash', lambda item: _wishlist_kind(item) is True, selectivity=0.05)
+    raise FilterSyntaxError(f"Filtre is: inconnu : {value}")
+
+def _stat_term(value):
+    name, operator, number = parse_comparison(value)
+    stat_hash = STAT_ALIASES.get(name.replace('_', ''))
+    if stat_hash is None:
+        raise FilterSyntaxError(f"Stat inconnue : {name or value}")
+    compare = _OPERATORS[operator]
+    low, high = comparison_bounds(operator, number)
+
+    def predicate(item):
+        stat = item.stat(stat_hash, None)
+        return stat is not None and compare(stat, number)
+    return Term(f"stat:{value}", predicate, lambda index: index.stat_keys(stat_hash, low, high), 0.3)
+
+def _power_term(value):
+    _, operator, number = parse_comparison(value)
+    compare = _OPERATORS[operator]
+    return Term(f"power:{value}", lambda item: bool(item.light) and compare(item.light, number), selectivity=0.5)
+
+def _text_term(value):
+    return Term(value, lambda item: _text_in(value, [item.name] + plug_names(item)),
+                lambda index: index.search_keys(value), 0.05)
+
+ITEM_FILTERS = FilterSchema({
+    'is': _is_term,
+    'not': lambda value: Not(_is_term(value)),
+    'ammo': _ammo_term,
+    'munitions': _ammo_term,
+    'element': _element_term,
+    'energy': _element_term,
+    'perk': lambda value: _field_term('perk', value, plug_names, 0.05),
+    'name': lambda value: _field_term('name', value, lambda item: [item.name], 0.02),
+    'nom': lambda value: _field_term('name', value, lambda item: [item.name], 0.02),
+    'stat': _stat_term,
+    'power': _power_term,
+    'light': _power_term,
+}, _text_term)
+
+# --- Armes meta (dictionnaires name/type/activity/usage_rate) ---
+
+def _usage(weapon):
+    try:
+        return float(str(weapon.get('usage_rate', '')).strip().rstrip('%').replace(',', '.'))
+    except ValueError:
+        return None
+
+def _meta_usage_term(value):
+    _, operator, number = parse_comparison(value)
+    compare = _OPERATORS[operator]
+
+    def predicate(weapon):
+        usage = _usage(weapon)
+        return usage is not None and compare(usage, number)
+    return Term(f"usage:{value}", predicate, selectivity=0.5)
+
+def _meta_field_term(field, selectivity):
+    def factory(value):
+        return Term(f"{field}:{value}", lambda weapon: normalize(value) in normalize(weapon.get(field, '')),
+                    selectivity=selectivity)
+    return factory
+
+def _meta_is_term(value):
+    name = normalize(value)
+    if name in ('pve', 'pvp'):
+        return Term(f"is:{name}", lambda weapon: normalize(weapon.get('activity', '')) == name, selectivity=0.5)
+    return _meta_field_term('type', 0.2)(value)
+
+META_FILTERS = FilterSchema({
+    'is': _meta_is_term,
+    'activity': _meta_is_term,
+    'type': _meta_field_term('type', 0.2),
+    'name': _meta_field_term('name', 0.05),
+    'nom': _meta_field_term('name', 0.05),
+    'usage': _meta_usage_term,
+}, _meta_field_term('name', 0.05))
@@ -0,0 +1,233 @@
+import heapq
+from itertools import combinations
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from api.models import ARMOR_BUCKETS
+
+# Stats d'armure (DestinyStatDefinition), dans l'ordre des vecteurs
+ARMOR_STATS = (
+    ('mobility', 2996146975, "Mobilité"),
+    ('resilience', 392767087, "Résilience"),
+    ('recovery', 1943323491, "Récupération"),
+    ('discipline', 1735777505, "Discipline"),
+    ('intellect', 144602215, "Intelligence"),
+    ('strength', 4244567218, "Force"),
+)
+STAT_KEYS = tuple(key for key, _, _ in ARMOR_STATS)
+STAT_HASHES = tuple(stat_hash for _, stat_hash, _ in ARMOR_STATS)
+MAX_TIER = 10
+
+class LoadoutResult:
+    __slots__ = ('items', 'stats', 'tiers', 'score')
+
+    def __init__(self, items, stats, tiers, score):
+        self.items = items
+        self.stats = stats
+        self.tiers = tiers
+        self.score = score
+
+    @property
+    def total_tier(self):
+        return sum(self.tiers)
+
+    def __repr__(self):
+        return f"LoadoutResult(T{self.total_tier}, {dict(zip(STAT_KEYS, self.stats))})"
+
+def stat_vector(item):
+    return [item.stat(stat_hash) for stat_hash in STAT_HASHES]
+
+def prune_dominated(vectors):
+    """Indices des pièces non dominées (et sans doublon) : une pièce au moins égale
+    partout et meilleure sur une stat la rend inutile."""
+    if len(vectors) == 0:
+        return np.arange(0)
+    # Tri par total décroissant : une pièce ne peut être dominée que par une pièce placée avant
+    order = np.argsort(-vectors.sum(axis=1), kind='stable')
+    kept = []
+    for index in order:
+        vector = vectors[index]
+        if kept:
+            kept_vectors = vectors[kept]
+            if np.any(np.all(kept_vectors >= vector, axis=1)):
+                continue
+        kept.append(index)
+    return np.array(kept, dtype=np.int64)
+
+CAP = MAX_TIER * 10
+
+def _score(totals):
+    """Score d'une combinaison : paliers (plafonnés à 10) puis total utile des stats pour départager."""
+    capped = np.minimum(totals, CAP)
+    return (capped // 10).sum(axis=-1) * 1000 + capped.sum(axis=-1)
+
+def _bound(totals_sum):
+    """Score maximal possible pour un total de stats donné (tous paliers confondus)."""
+    useful = min(int(totals_sum), CAP * len(STAT_HASHES))
+    return (useful // 10) * 1000 + useful
+
+def search_combinations(slots, targets, top=20):
+    """Séparation et évaluation sur 5 slots.
+
+    `slots` : liste de 5 tableaux (n_i, 6) de stats ; `targets` : minima (6,).
+    Les pièces sont triées par total décroissant. Les deux premiers slots
+    sont parcourus avec élagage (minimum par stat inatteignable, ou score
+    maximal possible inférieur au k-ième meilleur) ; le troisième est filtré
+    en bloc puis combiné d'un coup avec les deux derniers, précombinés.
+    Retourne [(score, (i0, i1, i2, i3, i4), totaux)].
+    """
+    targets = np.asarray(targets, dtype=np.int32)
+    if any(len(slot) == 0 for slot in slots):
+        return []
+    slots = [np.asarray(slot, dtype=np.int32) for slot in slots]
+    orders = [np.argsort(-slot.sum(axis=1), kind='stable') for slot in slots]
+    slots = [slot[order] for slot, order in zip(slots, orders)]
+    totals_by_slot = [slot.sum(axis=1) for slot in slots]
+
+    tail = (slots[3][:, None, :] + slots[4][None, :, :]).reshape(-1, len(STAT_HASHES))
+    tail_index = np.indices((len(slots[3]), len(slots[4]))).reshape(2, -1).T
+    tail_total_max = int(tail.sum(axis=1).max())
+
+    # Contraintes agrégées : pour chaque sous-ensemble des stats ciblées, la somme
+    # des minima doit rester atteignable (bien plus strict que stat par stat)
+    targeted = [index for index, value in enumerate(targets) if value > 0]
+    masks = np.array([[1 if index in subset else 0 for index in range(len(STAT_HASHES))]
+                      for size in range(1, len(targeted) + 1)
+                      for subset in combinations(targeted, size)] or [[0] * len(STAT_HASHES)], dtype=np.int32)
+    needed = masks @ targets
+    tail_max = (tail @ masks.T).max(axis=0)
+    slot_max = [(slot @ masks.T).max(axis=0) for slot in slots]
+    stat_max = [slot_max[1] + slot_max[2] + tail_max, slot_max[2] + tail_max]
+    total_max = [int(totals_by_slot[1][0] + totals_by_slot[2][0]) + tail_total_max,
+                 int(totals_by_slot[2][0]) + tail_total_max]
+
+    best = []  # tas min de (score, combinaison, totaux)
+
+    def threshold():
+        return best[0][0] if len(best) >= top else -1
+
+    for i0, v0 in enumerate(slots[0]):
+        if _bound(totals_by_slot[0][i0] + total_max[0]) <= threshold():
+            break  # Pièces triées par total : les suivantes ne peuvent pas faire mieux
+        if np.any(masks @ v0 + stat_max[0] < needed):
+            continue
+        for i1, v1 in enumerate(slots[1]):
+            p1 = v0 + v1
+            p1_total = int(totals_by_slot[0][i0] + totals_by_slot[1][i1])
+            if _bound(p1_total + total_max[1]) <= threshold():
+                break
+            if np.any(masks @ p1 + stat_max[1] < needed):
+                continue
+            # Troisième slot filtré en bloc : minima atteignables et score possible
+            p2 = p1 + slots[2]
+            feasible = np.all(p2 @ masks.T + tail_max >= needed, axis=1)
+            feasible &= (np.minimum(p1_total + totals_by_slot[2] + tail_total_max, CAP * len(STAT_HASHES)) // 10 * 1000
+                         + np.minimum(p1_total + totals_by_slot[2] + tail_total_max, CAP * len(STAT_HASHES))) > threshold()
+            candidates = np.flatnonzero(feasible)
+            if len(candidates) == 0:
+                continue
+            totals = (p2[candidates][:, None, :] + tail[None, :, :]).reshape(-1, len(STAT_HASHES))
+            valid = np.flatnonzero(np.all(totals >= targets, axis=1))
+            if len(valid) == 0:
+                continue
+            scores = _score(totals[valid])
+            if len(valid) > top:
+                keep = np.argpartition(-scores, top - 1)[:top]
+                valid, scores = valid[keep], scores[keep]
+            for row, score in zip(valid, scores):
+                score = int(score)
+                if score <= threshold():
+                    continue
+                i2 = candidates[row // len(tail)]
+                i3, i4 = tail_index[row % len(tail)]
+                combination = (int(orders[0][i0]), int(orders[1][i1]), int(orders[2][i2]),
+                               int(orders[3][i3]), int(orders[4][i4]))
+                entry = (score, combination, tuple(int(v) for v in totals[row]))
+                if len(best) < top:
+                    heapq.heappush(best, entry)
+                else:
+                    heapq.heapreplace(best, entry)
+    return sorted(best, reverse=True)
+
+def _search_task(args):
+    """Point d'entrée des processus : (choix d'exotique, slots, cibles, top)."""
+    exotic, slots, targets, top = args
+    return exotic, search_combinations(slots, targets, top)
+
+class LoadoutOptimizer:
+    """Optimiseur d'armure : cibles de paliers de stats sur l'armure possédée d'une classe."""
+
+    def __init__(self, items, class_type):
+        self.class_type = class_type
+        self.pieces = {slot: [] for slot in ARMOR_BUCKETS}
+        for item in items:
+            definition = item.definition
+            if definition is None or not item.instance_id or definition.class_type != class_type:
+                continue
+            if item.bucket_type in self.pieces:
+                self.pieces[item.bucket_type].append(item)
+
+    def _slot_arrays(self, pieces):
+        vectors = np.array([stat_vector(item) for item in pieces], dtype=np.int32).reshape(-1, len(STAT_HASHES))
+        kept = prune_dominated(vectors)
+        return [pieces[i] for i in kept], vectors[kept]
+
+    def optimize(self, targets, bonus=None, top=20, processes=None):
+        """Meilleures combinaisons atteignant `targets` ({stat: palier}).
+
+        `bonus` : stats ajoutées à l'ensemble (mods, fragments) ; une seule
+        pièce exotique au plus, chaque choix d'exotique étant cherché dans un
+        processus séparé.
+        """
+        start = time.perf_counter()
+        bonus = np.array([(bonus or {}).get(key, 0) for key in STAT_KEYS], dtype=np.int32)
+        target_values = np.array([min((targets or {}).get(key, 0), MAX_TIER) * 10 for key in STAT_KEYS],
+                                 dtype=np.int32)
+        legendary = {}
+        exotics = []
+        for slot_index, slot in enumerate(ARMOR_BUCKETS):
+            pieces = [item for item in self.pieces[slot] if not item.is_exotic]
+            legendary[slot] = self._slot_arrays(pieces)
+            exotics += [(slot_index, item) for item in self.pieces[slot] if item.is_exotic]
+
+        tasks = []
+        choices = [None] + exotics
+        for choice_index, choice in enumerate(choices):
+            slots = [legendary[slot][1] for slot in ARMOR_BUCKETS]
+            if choice is not None:
+                slot_index, item = choice
+                slots[slot_index] = np.array([stat_vector(item)], dtype=np.int32)
+            # Le bonus s'applique une fois à l'ensemble : ajouté aux pièces du premier slot
+            slots[0] = slots[0] + bonus
+            tasks.append((choice_index, slots, target_values, top))
+
+        processes = processes if processes is not None else min(len(tasks), os.cpu_count() or 1)
+        if processes > 1 and len(tasks) > 1:
+            # spawn : un fork du processus Qt (threads en cours, verrous tenus) peut se bloquer
+            with ProcessPoolExecutor(max_workers=processes,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                outcomes = list(executor.map(_search_task, tasks))
+        else:
+            outcomes = [_search_task(task) for task in tasks]
+
+        results = []
+        for choice_index, found in outcomes:
+            choice = choices[choice_index]
+            for score, indices, totals in found:
+                items = []
+                for slot_index, slot in enumerate(ARMOR_BUCKETS):
+                    if choice is not None and choice[0] == slot_index:
+                        items.append(choice[1])
+                    else:
+                        items.append(legendary[slot][0][indices[slot_index]])
+                stats = tuple(totals)
+                tiers = tuple(min(value // 10, MAX_TIER) for value in stats)
+                results.append(LoadoutResult(tuple(items), stats, tiers, score))
+        results.sort(key=lambda result: result.score, reverse=True)
+        logging.info(f"Optimiseur : {len(results[:top])} combinaison(s), {len(choices)} choix d'exotique, "
+                     f"{sum(len(legendary[slot][1]) for slot in ARMOR_BUCKETS)} pièces légendaires non dominées, "
+                     f"{time.perf_counter() - start:.2f} s")
+        return results[:top]
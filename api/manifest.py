@@ -0,0 +1,137 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from utils.config import OAUTH_CONFIG
+from api.rate_limiter import bungie_rate_limiter
+
+MANIFEST_URL = 'https://www.bungie.net/Platform/Destiny2/Manifest/{table}/{hash}/'
+SAVE_DELAY = 2.0  # Secondes : une écriture de table pour une rafale de téléchargements
+
+class ManifestCache:
+    """Cache mémoire + disque des définitions du Manifest Bungie."""
+
+    def __init__(self, cache_dir='cache/manifest'):
+        self.cache_dir = cache_dir
+        self.tables = {}
+        self.lock = threading.RLock()
+        self.dirty = set()
+        self.save_timer = None
+        self.save_lock = threading.Lock()
+
+    def _table_path(self, table):
+        return os.path.join(self.cache_dir, f'{table}.json')
+
+    def _load_table(self, table):
+        """Charge (une seule fois) la table depuis le disque."""
+        with self.lock:
+            if table not in self.tables:
+                definitions = {}
+                path = self._table_path(table)
+                if os.path.exists(path):
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            definitions = json.load(f)
+                    except Exception as e:
+                        logging.error(f"Erreur lecture cache manifest {table}: {str(e)}")
+                self.tables[table] = definitions
+            return self.tables[table]
+
+    def _save_table(self, table, definitions):
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        path = self._table_path(table)
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(definitions, f, separators=(',', ':'))
+        os.replace(f'{path}.tmp', path)
+
+    def flush(self):
+        """Écrit les tables modifiées ; la sérialisation se fait hors du verrou des lectures."""
+        with self.lock:
+            tables = {table: dict(self.tables[table]) for table in self.dirty}
+            self.dirty.clear()
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+        with self.save_lock:
+            for table, definitions in tables.items():
+                try:
+                    self._save_table(table, definitions)
+                except Exception as e:
+                    logging.error(f"Erreur écriture cache manifest {table}: {str(e)}")
+
+    def _fetch(self, table, item_hash):
+        """Télécharge une définition depuis l'API (None en cas d'erreur)."""
+        try:
+            bungie_rate_limiter.acquire()
+            response = requests.get(
+                MANIFEST_URL.format(table=table, hash=item_hash),
+                headers={'X-API-Key': OAUTH_CONFIG['api_key']},
+                timeout=10
+            )
+            if response.status_code != 200:
+                logging.error(f"Erreur manifest {table}/{item_hash}: {response.status_code}")
+                return None
+            return response.json()['Response']
+        except Exception as e:
+            logging.error(f"Erreur manifest {table}/{item_hash}: {str(e)}")
+            return None
+
+    def _store(self, table, fetched):
+        """Ajoute des définitions téléchargées ; l'écriture de la table est différée de SAVE_DELAY."""
+        if not fetched:
+            return
+        with self.lock:
+            self._load_table(table).update(fetched)
+            self.dirty.add(table)
+            if self.save_timer is None:
+                self.save_timer = threading.Timer(SAVE_DELAY, self.flush)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    def get_definition(self, table, item_hash, fetch=True):
+        """Retourne une définition; interroge l'API seulement si elle n'est pas en cache."""
+        item_hash = str(item_hash)
+        definition = self._load_table(table).get(item_hash)
+        if definition is not None or not fetch:
+            return definition
+        definition = self._fetch(table, item_hash)
+        if definition is not None:
+            self._store(table, {item_hash: definition})
+        return definition
+
+    def get_definitions(self, table, item_hashes, fetch=True, max_workers=8):
+        """Définitions d'un lot de hashes : les manquantes sont téléchargées en parallèle
+        et ajoutées au cache en une seule fois."""
+        definitions = self._load_table(table)
+        result = {}
+        missing = []
+        for item_hash in {str(h) for h in item_hashes}:
+            definition = definitions.get(item_hash)
+            if definition is not None:
+                result[item_hash] = definition
+            else:
+                missing.append(item_hash)
+        if missing and fetch:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = {item_hash: definition
+                           for item_hash, definition in zip(missing, executor.map(lambda h: self._fetch(table, h), missing))
+                           if definition is not None}
+            self._store(table, fetched)
+            result.update(fetched)
+        return result
+
+    def get_item_definition(self, item_hash, fetch=True):
+        return self.get_definition('DestinyInventoryItemDefinition', item_hash, fetch)
+
+    def get_item_definitions(self, item_hashes, fetch=True):
+        return self.get_definitions('DestinyInventoryItemDefinition', item_hashes, fetch)
+
+    def get_stat_definition(self, stat_hash, fetch=True):
+        return self.get_definition('DestinyStatDefinition', stat_hash, fetch)
+
+manifest = ManifestCache()
+atexit.register(manifest.flush)
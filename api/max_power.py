@@ -0,0 +1,157 @@
+import logging
+import time
+from api.models import WEAPON_BUCKETS, ARMOR_BUCKETS
+from api.search_index import item_key
+
+POWER_BUCKETS = WEAPON_BUCKETS + ARMOR_BUCKETS
+
+class PowerSlot:
+    """Meilleur item d'un slot, avec ou sans exotique."""
+    __slots__ = ('legendary', 'exotic')
+
+    def __init__(self, legendary=None, exotic=None):
+        self.legendary = legendary
+        self.exotic = exotic
+
+class MaxPowerResult:
+    __slots__ = ('class_type', 'power', 'exact', 'items')
+
+    def __init__(self, class_type, power, exact, items):
+        self.class_type = class_type
+        self.power = power      # Puissance arrondie à l'inférieur (affichée en jeu)
+        self.exact = exact      # Moyenne exacte des 8 slots
+        self.items = items      # slot -> ItemInstance retenu
+
+    def __repr__(self):
+        return f"MaxPowerResult({self.class_type}, {self.exact:.2f})"
+
+class MaxPowerCalculator:
+    """Puissance maximale atteignable par classe, en prenant le meilleur item de chaque slot
+    dans tout le compte (coffre compris), avec au plus une arme et une armure exotiques.
+
+    Les items sont suivis par slot : une mise à jour ne recalcule que les
+    slots dont un item a été ajouté, modifié ou retiré.
+    """
+
+    def __init__(self):
+        self.slots = {bucket: {} for bucket in POWER_BUCKETS}   # slot -> clé -> item
+        self._best = {}                                          # (slot, classe) -> PowerSlot
+        self._results = {}
+
+    @staticmethod
+    def _slot_of(item):
+        if not item.light or item.definition is None:
+            return None
+        bucket = item.bucket_type
+        return bucket if bucket in POWER_BUCKETS else None
+
+    def update(self, items):
+        """Synchronise avec l'inventaire complet ; retourne les slots modifiés."""
+        start = time.perf_counter()
+        seen = {bucket: set() for bucket in POWER_BUCKETS}
+        changed = set()
+        keys = set()
+        for item in items:
+            key = item_key(item, keys)
+            keys.add(key)
+            bucket = self._slot_of(item)
+            if bucket is None:
+                continue
+            seen[bucket].add(key)
+            previous = self.slots[bucket].get(key)
+            if previous is None or previous.light != item.light or previous.is_exotic != item.is_exotic:
+                changed.add(bucket)
+            self.slots[bucket][key] = item
+        for bucket, entries in self.slots.items():
+            removed = [key for key in entries if key not in seen[bucket]]
+            for key in removed:
+                del entries[key]
+            if removed:
+                changed.add(bucket)
+        self._invalidate(changed)
+        logging.debug(f"Puissance max : {len(changed)} slot(s) modifié(s) en {(time.perf_counter() - start) * 1000:.2f} ms")
+        return changed
+
+    def add_items(self, items):
+        """Chemin incrémental (items dont la définition vient d'être résolue) : compare seulement
+        au meilleur de chaque slot."""
+        changed = set()
+        for item in items:
+            bucket = self._slot_of(item)
+            if bucket is None:
+                continue
+            self.slots[bucket][item_key(item)] = item
+            for (slot, class_type), best in list(self._best.items()):
+                if slot != bucket or not self._usable(item, class_type):
+                    continue
+                current = best.exotic if item.is_exotic else best.legendary
+                if current is None or item.light > current.light:
+                    if item.is_exotic:
+                        best.exotic = item
+                    else:
+                        best.legendary = item
+                    changed.add(bucket)
+        if changed:
+            self._results.clear()
+        return changed
+
+    def _invalidate(self, buckets):
+        if not buckets:
+            return
+        for key in [key for key in self._best if key[0] in buckets]:
+            del self._best[key]
+        self._results.clear()
+
+    @staticmethod
+    def _usable(item, class_type):
+        item_class = item.definition.class_type
+        return item.bucket_type in WEAPON_BUCKETS or item_class == class_type or item_class == 3
+
+    def best_for(self, bucket, class_type):
+        key = (bucket, class_type)
+        best = self._best.get(key)
+        if best is None:
+            best = PowerSlot()
+            for item in self.slots[bucket].values():
+                if not self._usable(item, class_type):
+                    continue
+                if item.is_exotic:
+                    if best.exotic is None or item.light > best.exotic.light:
+                        best.exotic = item
+                elif best.legendary is None or item.light > best.legendary.light:
+                    best.legendary = item
+            self._best[key] = best
+        return best
+
+    def _group(self, buckets, class_type):
+        """Meilleur choix pour un groupe (armes ou armure) avec au plus une exotique."""
+        chosen = {}
+        for bucket in buckets:
+            best = self.best_for(bucket, class_type)
+            chosen[bucket] = best.legendary
+        gain = 0
+        swap = None
+        for bucket in buckets:
+            best = self.best_for(bucket, class_type)
+            if best.exotic is None:
+                continue
+            base = chosen[bucket].light if chosen[bucket] else 0
+            if best.exotic.light - base > gain:
+                gain = best.exotic.light - base
+                swap = (bucket, best.exotic)
+        if swap:
+            chosen[swap[0]] = swap[1]
+        return chosen
+
+    def calculate(self, class_type):
+        """Puissance maximale d'une classe ; None si un slot n'a aucun item."""
+        result = self._results.get(class_type)
+        if result is not None:
+            return result
+        items = self._group(WEAPON_BUCKETS, class_type)
+        items.update(self._group(ARMOR_BUCKETS, class_type))
+        if any(item is None for item in items.values()):
+            return None
+        exact = sum(item.light for item in items.values()) / len(items)
+        result = self._results[class_type] = MaxPowerResult(class_type, int(exact), exact, items)
+        return result
@@ -0,0 +1,204 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from lxml import etree
+from api.scraper_session import scraper_sessions, is_challenge_url, CHALLENGE_TIMEOUT, CAPTCHA_TIMEOUT
+
+LIGHT_GG_URL = "https://www.light.gg"
+GOD_ROLL_URL = "https://www.light.gg/god-roll/"
+DESTINYTRACKER_URL = "https://destinytracker.com/destiny-2/db/insights"
+TOP_WEAPONS = 10
+CHUNK_SIZE = 16 * 1024
+CHALLENGE_MARKERS = (b'cf-challenge', b'challenge-platform', b'Just a moment...', b'cf_chl_opt')
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Sélecteurs compilés une seule fois (XPath lxml)
+LIGHT_GG_ROWS = etree.XPath(f"//*[{_has_class('weapon-name')}]")
+LIGHT_GG_IMAGE = etree.XPath(".//img/@src")
+LIGHT_GG_USAGE = etree.XPath(f"ancestor::tr[1]//*[{_has_class('usage-percent')}]")
+TRACKER_SECTIONS = etree.XPath(f"//div[{_has_class('weapon-meta-section')}]")
+TRACKER_ITEMS = etree.XPath(f".//div[{_has_class('weapon-item')}]")
+TRACKER_NAME = etree.XPath(f".//div[{_has_class('name')}]")
+TRACKER_TYPE = etree.XPath(f".//div[{_has_class('type')}]")
+TRACKER_USAGE = etree.XPath(f".//div[{_has_class('usage')}]")
+TRACKER_IMAGE = etree.XPath(".//img/@src")
+
+def _node_text(node):
+    return ' '.join(''.join(node.itertext()).split())
+
+def _text(nodes, default=''):
+    return _node_text(nodes[0]) if nodes else default
+
+def _image_url(images, source):
+    """Premier `src` trouvé, rendu absolu (les pages utilisent des chemins relatifs)."""
+    return urljoin(source.url, images[0]) if images else ''
+
+def extract_light_gg(root, source):
+    weapons = []
+    for row in LIGHT_GG_ROWS(root)[:TOP_WEAPONS]:
+        images = LIGHT_GG_IMAGE(row)
+        weapons.append({
+            'name': _node_text(row),
+            'type': source.weapon_type or 'Weapon',
+            'image_url': _image_url(images, source),
+            'usage_rate': _text(LIGHT_GG_USAGE(row), 'N/A'),
+            'activity': source.activity,
+        })
+    return weapons
+
+def extract_destinytracker(root, source):
+    weapons = []
+    for section in TRACKER_SECTIONS(root):
+        activity = 'PvP' if 'pvp' in (section.get('class') or '').split() else 'PvE'
+        if source.activity and activity != source.activity:
+            continue
+        for item in TRACKER_ITEMS(section)[:TOP_WEAPONS]:
+            name = _text(TRACKER_NAME(item))
+            if not name:
+                continue
+            images = TRACKER_IMAGE(item)
+            weapons.append({
+                'name': name,
+                'type': _text(TRACKER_TYPE(item), source.weapon_type or 'Unknown'),
+                'image_url': _image_url(images, source),
+                'usage_rate': _text(TRACKER_USAGE(item), 'N/A'),
+                'activity': activity,
+            })
+    return weapons
+
+class MetaSource:
+    """Page meta à récupérer : URL, activité et type d'arme attendus, extracteur."""
+    __slots__ = ('name', 'url', 'activity', 'weapon_type', 'extractor')
+
+    def __init__(self, name, url, activity, extractor, weapon_type=None):
+        self.name = name
+        self.url = url
+        self.activity = activity
+        self.weapon_type = weapon_type
+        self.extractor = extractor
+
+    def __repr__(self):
+        return f"MetaSource({self.name})"
+
+META_SOURCES = (
+    MetaSource('light.gg', GOD_ROLL_URL, 'PvE', extract_light_gg),
+    MetaSource('destinytracker PvE', DESTINYTRACKER_URL + '?mode=pve', 'PvE', extract_destinytracker),
+    MetaSource('destinytracker PvP', DESTINYTRACKER_URL + '?mode=pvp', 'PvP', extract_destinytracker),
+)
+
+class ChallengeDetected(Exception):
+    """Page anti-bot renvoyée à la place du contenu."""
+
+def parse_stream(chunks):
+    """Analyse le HTML au fil des morceaux reçus ; lève ChallengeDetected sur une page de challenge."""
+    parser = etree.HTMLPullParser(events=())
+    head = b''
+    for chunk in chunks:
+        if len(head) < CHUNK_SIZE:
+            head += chunk[:CHUNK_SIZE]
+            if any(marker in head for marker in CHALLENGE_MARKERS):
+                raise ChallengeDetected()
+        parser.feed(chunk)
+    return parser.close()
+
+class MetaScraper:
+    """Récupération HTTP concurrente des pages meta, navigateur en dernier recours.
+
+    Chaque source est téléchargée par la session HTTP partagée et analysée en
+    flux ; seules les sources bloquées par un challenge repassent par le
+    navigateur, dont les cookies servent ensuite aux requêtes HTTP suivantes.
+    """
+
+    def __init__(self, sources=META_SOURCES, max_workers=4):
+        self.sources = sources
+        self.max_workers = max_workers
+
+    def fetch_http(self, source):
+        session = scraper_sessions.http()
+        with session.get(source.url, timeout=10, stream=True) as response:
+            if is_challenge_url(response.url) or response.status_code in (403, 429, 503):
+                raise ChallengeDetected()
+            response.raise_for_status()
+            root = parse_stream(response.iter_content(CHUNK_SIZE))
+        return source.extractor(root, source)
+
+    def fetch_browser(self, sources, progress=None, interactive=False, should_stop=None):
+        """Sources bloquées : challenge passé dans le navigateur partagé puis analyse du DOM.
+
+        Le navigateur visible (captcha à la main) n'est proposé qu'avec `interactive`
+        (interface graphique) ; `should_stop()` interrompt l'attente.
+        """
+        weapons = []
+        attempts = [(True, CHALLENGE_TIMEOUT)] + ([(False, CAPTCHA_TIMEOUT)] if interactive else [])
+        for headless, timeout in attempts:
+            if should_stop is not None and should_stop():
+                break
+            if not headless and progress:
+                progress("Accès à light.gg - Veuillez compléter le captcha...")
+            with scraper_sessions.browser(headless=headless) as driver:
+                if not self.pass_challenge(driver, timeout, should_stop):
+                    continue
+                for source in sources:
+                    scraper_sessions.open_page(driver, source.url)
+                    if not scraper_sessions.wait_challenge(driver, timeout, should_stop):
+                        continue
+                    root = etree.fromstring(driver.page_source, etree.HTMLParser())
+                    weapons += source.extractor(root, source)
+                scraper_sessions.save_cookies(driver.get_cookies())
+                return weapons
+        raise Exception("Challenge anti-bot non résolu")
+
+    @staticmethod
+    def pass_challenge(driver, timeout, should_stop=None):
+        """Ouvre light.gg avec les cookies sauvegardés et attend la fin du challenge éventuel."""
+        if scraper_sessions.restore_cookies(driver, LIGHT_GG_URL):
+            driver.refresh()  # Recharge avec les cookies injectés
+        else:
+            driver.get(LIGHT_GG_URL)
+        scraper_sessions.wait_ready(driver)
+        return scraper_sessions.wait_challenge(driver, timeout, should_stop)
+
+    def fetch_all(self, sources=None, progress=None, interactive=False, should_stop=None):
+        """Armes meta de toutes les sources (dédoublonnées par nom et activité)."""
+        sources = sources or self.sources
+        start = time.perf_counter()
+        results = {}
+        blocked = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources))) as executor:
+            futures = {source: executor.submit(self.fetch_http, source) for source in sources}
+            for source, future in futures.items():
+                try:
+                    weapons = future.result()
+                    if weapons:
+                        results[source] = weapons
+                    else:
+                        # Liste rendue en JavaScript (ou balisage modifié) : le DOM du navigateur est complet
+                        logging.info(f"Aucune arme extraite de {source.name}, passage par le navigateur")
+                        blocked.append(source)
+                except ChallengeDetected:
+                    logging.info(f"Challenge détecté sur {source.name}, passage par le navigateur")
+                    blocked.append(source)
+                except Exception as e:
+                    logging.error(f"Erreur de récupération {source.name}: {str(e)}")
+        if blocked:
+            try:
+                results['browser'] = self.fetch_browser(blocked, progress, interactive, should_stop)
+            except Exception as e:
+                logging.error(f"Erreur de récupération via le navigateur: {str(e)}")
+
+        weapons = []
+        seen = set()
+        for source_weapons in results.values():
+            for weapon in source_weapons:
+                key = (weapon['name'].lower(), weapon['activity'])
+                if key not in seen:
+                    seen.add(key)
+                    weapons.append(weapon)
+        logging.info(f"✓ {len(weapons)} armes meta récupérées ({len(sources)} pages, "
+                     f"{len(blocked)} via le navigateur) en {time.perf_counter() - start:.2f} s")
+        return weapons
+
+meta_scraper = MetaScraper()
@@ -0,0 +1,289 @@
+import sys
+from utils.config import BUCKET_TYPES
+
+BUCKETS_BY_HASH = {int(bucket_hash): name for bucket_hash, name in BUCKET_TYPES.items()}
+WEAPON_BUCKETS = ('kinetic', 'energy', 'power')
+ARMOR_BUCKETS = ('helmet', 'gauntlets', 'chest', 'legs', 'class_item')
+
+CLASS_NAMES = {0: "Titan", 1: "Chasseur", 2: "Arcaniste"}
+AMMO_TYPES = {1: "Primaire", 2: "Spéciale", 3: "Lourde"}
+AMMO_TYPE_ICONS = {1: "icons/ammo_primary.png", 2: "icons/ammo_special.png", 3: "icons/ammo_heavy.png"}
+ENERGY_TYPES = {0: "Aucune", 1: "Arc", 2: "Solaire", 3: "Cryo-électrique", 4: "Stasique", 6: "Strand"}
+ENERGY_TYPE_ICONS = {
+    1: "icons/energy_arc.png",
+    2: "icons/energy_solar.png",
+    3: "icons/energy_void.png",
+    4: "icons/energy_stasis.png",
+    6: "icons/energy_strand.png"
+}
+TIER_EXOTIC = 6
+VAULT_BUCKET_HASH = 138197802
+
+_hashes = {}
+
+def intern_hash(value):
+    """Retourne une instance unique de l'entier pour un hash donné (partagée entre items)."""
+    if value is None:
+        return None
+    value = int(value)
+    return _hashes.setdefault(value, value)
+
+def intern_id(value):
+    return sys.intern(str(value)) if value is not None else None
+
+
+class StatValue:
+    __slots__ = ('hash', 'value', 'name', 'icon')
+
+    def __init__(self, stat_hash, value, name=None, icon=None):
+        self.hash = intern_hash(stat_hash)
+        self.value = value
+        self.name = name
+        self.icon = icon
+
+    def __eq__(self, other):
+        return isinstance(other, StatValue) and self.hash == other.hash and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.hash, self.value))
+
+    def __repr__(self):
+        return f"StatValue({self.hash}, {self.value})"
+
+
+class ItemDefinitionRef:
+    """Vue compacte d'une DestinyInventoryItemDefinition, partagée par toutes les instances."""
+    __slots__ = ('hash', 'name', 'icon', 'item_type', 'item_sub_type', 'tier_type', 'tier_type_name',
+                 'ammo_type', 'energy_type', 'default_damage_type', 'bucket_hash', 'class_type',
+                 'stats', 'perks', 'sockets')
+
+    _cache = {}
+
+    def __init__(self, item_hash, name='', icon='', item_type=0, item_sub_type=0, tier_type=0,
+                 tier_type_name='', ammo_type=0, energy_type=None, default_damage_type=0,
+                 bucket_hash=None, class_type=3, stats=(), perks=(), sockets=()):
+        self.hash = intern_hash(item_hash)
+        self.name = sys.intern(name) if name else name
+        self.icon = icon
+        self.item_type = item_type
+        self.item_sub_type = item_sub_type
+        self.tier_type = tier_type
+        self.tier_type_name = tier_type_name
+        self.ammo_type = ammo_type
+        self.energy_type = energy_type
+        self.default_damage_type = default_damage_type
+        self.bucket_hash = intern_hash(bucket_hash)
+        self.class_type = class_type
+        self.stats = stats
+        self.perks = perks
+        self.sockets = sockets
+
+    @classmethod
+    def from_definition(cls, definition):
+        """Convertit la définition brute du Manifest."""
+        display = definition.get('displayProperties', {})
+        inventory = definition.get('inventory', {})
+        energy = definition.get('energy')
+        return cls(
+            definition.get('hash'),
+            name=display.get('name', ''),
+            icon=display.get('icon', ''),
+            item_type=definition.get('itemType', 0),
+            item_sub_type=definition.get('itemSubType', 0),
+            tier_type=inventory.get('tierType', 0),
+            tier_type_name=inventory.get('tierTypeName', ''),
+            ammo_type=definition.get('equippingBlock', {}).get('ammoType', 0),
+            energy_type=energy.get('energyType', 0) if energy else None,
+            default_damage_type=definition.get('defaultDamageType', 0),
+            bucket_hash=inventory.get('bucketTypeHash'),
+            class_type=definition.get('classType', 3),
+            stats=tuple(StatValue(stat_hash, stat.get('value', 0))
+                        for stat_hash, stat in definition.get('stats', {}).get('stats', {}).items()),
+            perks=tuple(intern_hash(perk) for perk in definition.get('perks', {}).get('perkHashes', [])),
+            sockets=tuple(intern_hash(socket.get('singleInitialItemHash', 0))
+                          for socket in definition.get('sockets', {}).get('socketEntries', [])),
+        )
+
+    @classmethod
+    def resolve(cls, item_hash, manifest, fetch=True):
+        """Retourne la référence partagée pour un hash (construite une seule fois)."""
+        item_hash = intern_hash(item_hash)
+        ref = cls._cache.get(item_hash)
+        if ref is None:
+            definition = manifest.get_item_definition(item_hash, fetch=fetch)
+            if definition is None:
+                return None
+            definition.setdefault('hash', item_hash)
+            ref = cls._cache[item_hash] = cls.from_definition(definition)
+        return ref
+
+    @property
+    def is_exotic(self):
+        return self.tier_type == TIER_EXOTIC or self.tier_type_name.lower() == 'exotique'
+
+    @property
+    def ammo_type_name(self):
+        return AMMO_TYPES.get(self.ammo_type, "Inconnu")
+
+    @property
+    def ammo_type_icon(self):
+        return AMMO_TYPE_ICONS.get(self.ammo_type, "")
+
+    @property
+    def energy_name(self):
+        if self.energy_type is None:
+            return "Cinétique"
+        return ENERGY_TYPES.get(self.energy_type, "Aucune")
+
+    @property
+    def energy_icon(self):
+        if self.energy_type is None:
+            return "icons/energy_kinetic.png"
+        return ENERGY_TYPE_ICONS.get(self.energy_type, "")
+
+
+class ItemInstance:
+    """Item possédé (équipé, inventaire ou coffre) avec ses valeurs d'instance."""
+    __slots__ = ('item_hash', 'instance_id', 'bucket_hash', 'location', 'owner_id', 'quantity',
+                 'state', 'light', 'damage_type', 'stats', 'plugs', 'definition')
+
+    def __init__(self, item_hash, instance_id=None, bucket_hash=None, location=None, owner_id=None,
+                 quantity=1, state=0, light=0, damage_type=0, stats=(), plugs=(), definition=None):
+        self.item_hash = intern_hash(item_hash)
+        self.instance_id = intern_id(instance_id)
+        self.bucket_hash = intern_hash(bucket_hash)
+        self.location = location
+        self.owner_id = owner_id
+        self.quantity = quantity
+        self.state = state
+        self.light = light
+        self.damage_type = damage_type
+        self.stats = stats
+        self.plugs = plugs
+        self.definition = definition
+
+    @classmethod
+    def from_bungie(cls, item, instances=None, stats=None, sockets=None, location=None, owner_id=None):
+        """Convertit un item d'inventaire Bungie et ses composants d'instance (300, 304, 305)."""
+        instance_id = item.get('itemInstanceId')
+        light = 0
+        damage_type = 0
+        item_stats = ()
+        plugs = ()
+        if instance_id:
+            instance = instances.get(instance_id) if instances else None
+            if instance:
+                light = instance.get('primaryStat', {}).get('value', 0)
+                damage_type = instance.get('damageType', 0)
+            stats_entry = stats.get(instance_id) if stats else None
+            if stats_entry:
+                item_stats = tuple(StatValue(stat_hash, stat['value'])
+                                   for stat_hash, stat in stats_entry.get('stats', {}).items())
+            sockets_entry = sockets.get(instance_id) if sockets else None
+            if sockets_entry:
+                plugs = tuple(intern_hash(socket['plugHash']) for socket in sockets_entry.get('sockets', [])
+                              if socket.get('plugHash'))
+        return cls(item.get('itemHash'), instance_id, item.get('bucketHash'), location, owner_id,
+                   item.get('quantity', 1), item.get('state', 0), light, damage_type, item_stats, plugs)
+
+    @property
+    def bucket_type(self):
+        bucket_type = BUCKETS_BY_HASH.get(self.bucket_hash)
+        if bucket_type is None and self.definition is not None:
+            # Items du coffre : le slot réel vient de la définition
+            bucket_type = BUCKETS_BY_HASH.get(self.definition.bucket_hash)
+        return bucket_type or 'unknown'
+
+    @property
+    def in_vault(self):
+        return self.bucket_hash == VAULT_BUCKET_HASH
+
+    @property
+    def name(self):
+        return self.definition.name if self.definition else str(self.item_hash)
+
+    @property
+    def is_exotic(self):
+        return self.definition.is_exotic if self.definition else False
+
+    def stat(self, stat_hash, default=0):
+        stat_hash = int(stat_hash)
+        for stat in self.stats:
+            if stat.hash == stat_hash:
+                return stat.value
+        return default
+
+    @property
+    def signature(self):
+        """Empreinte comparable d'une instance (identité, puissance, stats)."""
+        return (self.instance_id, self.item_hash, self.light, tuple(sorted((s.hash, s.value) for s in self.stats)))
+
+    def __repr__(self):
+        return f"ItemInstance({self.item_hash}, {self.instance_id}, light={self.light})"
+
+
+class Character:
+    __slots__ = ('character_id', 'membership_id', 'class_type', 'race_type', 'gender_type', 'light',
+                 'emblem_path', 'date_last_played', 'stats')
+
+    def __init__(self, character_id, membership_id=None, class_type=3, race_type=None, gender_type=None,
+                 light=0, emblem_path='', date_last_played='', stats=()):
+        self.character_id = intern_id(character_id)
+        self.membership_id = intern_id(membership_id)
+        self.class_type = class_type
+        self.race_type = race_type
+        self.gender_type = gender_type
+        self.light = light
+        self.emblem_path = emblem_path
+        self.date_last_played = date_last_played
+        self.stats = stats
+
+    @classmethod
+    def from_bungie(cls, character_id, data):
+        return cls(
+            character_id,
+            data.get('membershipId'),
+            data.get('classType', 3),
+            data.get('raceType'),
+            data.get('genderType'),
+            data.get('light', 0),
+            data.get('emblemPath', ''),
+            data.get('dateLastPlayed', ''),
+            tuple(StatValue(stat_hash, value) for stat_hash, value in data.get('stats', {}).items()),
+        )
+
+    @property
+    def class_name(self):
+        return CLASS_NAMES.get(self.class_type, "Inconnu")
+
+    def __repr__(self):
+        return f"Character({self.character_id}, {self.class_name}, light={self.light})"
+
+
+def characters_from_profile(response):
+    """Personnages d'une réponse de profil (composant 200)."""
+    return [Character.from_bungie(char_id, data)
+            for char_id, data in response.get('characters', {}).get('data', {}).items()]
+
+def items_from_component(items, item_components=None, location=None, owner_id=None):
+    """Convertit une liste d'items Bungie en ItemInstance, avec les composants d'instance."""
+    item_components = item_components or {}
+    instances = item_components.get('instances', {}).get('data', {})
+    stats = item_components.get('stats', {}).get('data', {})
+    sockets = item_components.get('sockets', {}).get('data', {})
+    return [ItemInstance.from_bungie(item, instances, stats, sockets, location, owner_id) for item in items]
+
+def private_components_missing(response):
+    """Vrai si le coffre (102) manque : profil récupéré sans jeton OAuth valide."""
+    return 'data' not in response.get('profileInventory', {})
+
+def inventory_from_profile(response):
+    """Tous les items d'un profil : équipés (205), inventaires des personnages (201) et profil/coffre (102)."""
+    item_components = response.get('itemComponents', {})
+    items = []
+    for location, component in (('equipped', 'characterEquipment'), ('inventory', 'characterInventories')):
+        for character_id, data in response.get(component, {}).get('data', {}).items():
+            items += items_from_component(data.get('items', []), item_components, location, character_id)
+    profile_items = response.get('profileInventory', {}).get('data', {}).get('items', [])
+    items += items_from_component(profile_items, item_components, 'profile')
+    return items
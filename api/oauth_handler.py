@@ -5,6 +5,7 @@ import os
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 import threading
+import time
 from utils.config import OAUTH_CONFIG
 
 class OAuthCallbackHandler(BaseHTTPRequestHandler):
@@ -48,31 +49,102 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
         """Désactive les logs HTTP."""
         pass
 
+TOKENS_PATH = 'auth_tokens.json'
+REFRESHED_TOKENS_PATH = 'bungie_tokens.json'  # Écrit par refresh_token.py
+EXPIRY_MARGIN = 60  # Renouvellement une minute avant l'expiration
+
 class OAuthManager:
+    """Jeton OAuth Bungie du compte : requis pour les composants privés (coffre 102, inventaires 201)."""
+
     def __init__(self):
         self.access_token = None
         self.refresh_token = None
+        self.expires_at = None
         self.oauth_server = None
         self.server_thread = None
+        self.lock = threading.RLock()
     
     def save_tokens(self, token_data):
         try:
-            with open('auth_tokens.json', 'w') as f:
+            token_data = dict(token_data, obtained_at=token_data.get('obtained_at') or time.time())
+            with open(TOKENS_PATH, 'w') as f:
                 json.dump(token_data, f)
+            self._apply(token_data)
             logging.info("Tokens d'authentification sauvegardés")
             return True
         except Exception as e:
             logging.error(f"Erreur lors de la sauvegarde des tokens: {str(e)}")
             return False
+
+    def _apply(self, token_data):
+        self.access_token = token_data.get('access_token')
+        self.refresh_token = token_data.get('refresh_token') or self.refresh_token
+        expires_in = token_data.get('expires_in')
+        obtained_at = token_data.get('obtained_at')
+        self.expires_at = obtained_at + expires_in if expires_in and obtained_at else None
     
     def load_tokens(self):
         try:
-            if os.path.exists('auth_tokens.json'):
-                with open('auth_tokens.json', 'r') as f:
+            if os.path.exists(TOKENS_PATH):
+                with open(TOKENS_PATH, 'r') as f:
                     token_data = json.load(f)
-                self.access_token = token_data.get('access_token')
-                self.refresh_token = token_data.get('refresh_token')
+                # Anciens fichiers sans date d'obtention : date de modification du fichier
+                token_data.setdefault('obtained_at', os.path.getmtime(TOKENS_PATH))
+                self._apply(token_data)
                 return True
         except Exception as e:
             logging.error(f"Erreur lors du chargement des tokens: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+    @property
+    def is_expired(self):
+        return self.expires_at is not None and time.time() >= self.expires_at - EXPIRY_MARGIN
+
+    def refresh(self):
+        """Renouvelle le jeton : grant refresh_token si le secret client est configuré,
+        sinon script refresh_token.py (identifiants en base) qui écrit bungie_tokens.json."""
+        with self.lock:
+            if self.refresh_token and OAUTH_CONFIG.get('client_secret'):
+                try:
+                    response = requests.post(
+                        OAUTH_CONFIG['token_url'],
+                        data={
+                            'grant_type': 'refresh_token',
+                            'refresh_token': self.refresh_token,
+                            'client_id': OAUTH_CONFIG['client_id'],
+                            'client_secret': OAUTH_CONFIG['client_secret'],
+                        },
+                        headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                        timeout=15
+                    )
+                    token_data = response.json()
+                    if 'access_token' in token_data:
+                        logging.info("✓ Jeton OAuth renouvelé")
+                        return self.save_tokens(token_data)
+                    logging.error(f"Renouvellement du jeton refusé: {token_data.get('error_description', response.status_code)}")
+                except (requests.RequestException, ValueError) as e:
+                    logging.error(f"Erreur lors du renouvellement du jeton: {str(e)}")
+            try:
+                from refresh_token import refresh_bungie_token
+            except ImportError as e:
+                logging.warning(f"Renouvellement du jeton impossible (refresh_token.py): {str(e)}")
+                return False
+            before = os.path.getmtime(REFRESHED_TOKENS_PATH) if os.path.exists(REFRESHED_TOKENS_PATH) else None
+            refresh_bungie_token()
+            if not os.path.exists(REFRESHED_TOKENS_PATH) or os.path.getmtime(REFRESHED_TOKENS_PATH) == before:
+                return False
+            with open(REFRESHED_TOKENS_PATH, 'r') as f:
+                return self.save_tokens(json.load(f))
+
+    def valid_access_token(self):
+        """Jeton utilisable (relu sur disque, renouvelé s'il a expiré) ou None : connexion requise."""
+        with self.lock:
+            self.load_tokens()
+            if self.access_token and not self.is_expired:
+                return self.access_token
+            if self.access_token or self.refresh_token:
+                if self.refresh() and self.access_token:
+                    return self.access_token
+            return None
+
+oauth_manager = OAuthManager()
@@ -0,0 +1,217 @@
+import logging
+import os
+import time
+import numpy as np
+from api.activity_crawler import decode_pgcr
+from api.manifest import manifest
+from api.pgcr_meta import MODE_ALL_PVP, MODE_ALL_PVE
+from utils.local_store import local_store
+
+ANALYTICS_DIR = 'cache/analytics'
+WEEK = 7 * 86400
+# Semaines alignées sur le reset hebdomadaire (mardi 17h UTC ; le 01/01/1970 était un jeudi)
+WEEK_OFFSET = 5 * 86400 + 17 * 3600
+ACTIVITY_CODES = {'PvP': 1, 'PvE': 2}
+
+PLAYER_COLUMNS = {
+    'instance_id': np.int64, 'period': np.float64, 'mode': np.int32, 'activity': np.int8,
+    'kills': np.int32, 'deaths': np.int32, 'assists': np.int32, 'seconds': np.int32,
+    'completed': np.int8, 'standing': np.int8,
+}
+WEAPON_COLUMNS = {
+    'instance_id': np.int64, 'period': np.float64, 'mode': np.int32, 'activity': np.int8,
+    'weapon_hash': np.int64, 'kills': np.int32, 'precision_kills': np.int32,
+}
+
+def _value(values, key, default=0):
+    return values.get(key, {}).get('basic', {}).get('value', default)
+
+def week_of(periods):
+    """Numéro de semaine (reset du mardi) pour un tableau de timestamps."""
+    return np.floor_divide(np.asarray(periods) - WEEK_OFFSET, WEEK).astype(np.int64)
+
+def week_start(weeks):
+    return np.asarray(weeks) * WEEK + WEEK_OFFSET
+
+def group_by(keys, values):
+    """Group-by vectorisé : `keys` liste de tableaux entiers, `values` {nom: tableau}.
+
+    Retourne (clés uniques par colonne, {nom: sommes}, effectifs), trié par clés.
+    """
+    if len(keys[0]) == 0:
+        return [np.array([], dtype=np.int64) for _ in keys], {name: np.array([]) for name in values}, np.array([], dtype=np.int64)
+    stacked = np.stack([np.asarray(key, dtype=np.int64) for key in keys], axis=1)
+    unique, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    sums = {name: np.bincount(inverse, weights=value, minlength=len(unique)) for name, value in values.items()}
+    counts = np.bincount(inverse, minlength=len(unique))
+    return [unique[:, column] for column in range(unique.shape[1])], sums, counts
+
+class ColumnTable:
+    """Table colonnaire : un fichier .npy par colonne, relu en mémoire mappée."""
+
+    def __init__(self, directory, schema):
+        self.directory = directory
+        self.schema = schema
+        self.columns = {name: np.array([], dtype=dtype) for name, dtype in schema.items()}
+
+    def __len__(self):
+        return len(self.columns['instance_id'])
+
+    def _path(self, name):
+        return os.path.join(self.directory, f'{name}.npy')
+
+    def load(self):
+        try:
+            self.columns = {name: np.load(self._path(name), mmap_mode='r') for name in self.schema}
+        except (OSError, ValueError):
+            self.columns = {name: np.array([], dtype=dtype) for name, dtype in self.schema.items()}
+        return self
+
+    def append(self, rows):
+        """Ajoute des lignes (liste de tuples dans l'ordre du schéma) et réécrit les colonnes."""
+        if not rows:
+            return
+        fresh = list(zip(*rows))
+        for (name, dtype), values in zip(self.schema.items(), fresh):
+            self.columns[name] = np.concatenate([np.asarray(self.columns[name]), np.array(values, dtype=dtype)])
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # Colonnes encore mappées : copiées en mémoire, un fichier mappé ne peut pas être remplacé sous Windows
+        self.columns = {name: np.array(values) if isinstance(values, np.memmap) else values
+                        for name, values in self.columns.items()}
+        for name, values in self.columns.items():
+            path = self._path(name)
+            with open(f'{path}.tmp', 'wb') as f:
+                np.save(f, np.asarray(values))
+        for name in self.columns:
+            os.replace(f'{self._path(name)}.tmp', self._path(name))
+
+    def mask(self, activity=None, since=None):
+        selected = np.ones(len(self), dtype=bool)
+        if activity is not None:
+            selected &= self.columns['activity'] == ACTIVITY_CODES[activity]
+        if since is not None:
+            selected &= self.columns['period'] >= since
+        return selected
+
+class PgcrAnalytics:
+    """Lignes joueur et arme des PGCR stockés, matérialisées en colonnes NumPy.
+
+    La matérialisation est incrémentale : seuls les PGCR postérieurs au
+    dernier matérialisé sont décodés ; les requêtes sont des group-by
+    vectorisés (np.unique + np.bincount), sans boucle sur le JSON.
+    """
+
+    def __init__(self, membership_id, store=local_store, directory=ANALYTICS_DIR):
+        self.membership_id = str(membership_id)
+        self.store = store
+        self.directory = os.path.join(directory, self.membership_id)
+        self.players = ColumnTable(os.path.join(self.directory, 'players'), PLAYER_COLUMNS).load()
+        self.weapons = ColumnTable(os.path.join(self.directory, 'weapons'), WEAPON_COLUMNS).load()
+        self.materialized_path = os.path.join(self.directory, 'materialized.npy')
+        self.materialized = self._load_materialized()
+
+    def _load_materialized(self):
+        """Identifiants des PGCR déjà matérialisés (triés)."""
+        try:
+            return np.load(self.materialized_path)
+        except (OSError, ValueError):
+            return np.array([], dtype=np.int64)
+
+    def _rows(self, instance_id, period, mode, pgcr):
+        modes = pgcr.get('activityDetails', {}).get('modes', [])
+        activity = 1 if MODE_ALL_PVP in modes else 2 if MODE_ALL_PVE in modes else 0
+        players, weapons = [], []
+        for entry in pgcr.get('entries', []):
+            if entry.get('player', {}).get('destinyUserInfo', {}).get('membershipId') != self.membership_id:
+                continue
+            values = entry.get('values', {})
+            players.append((instance_id, period, mode, activity,
+                            _value(values, 'kills'), _value(values, 'deaths'), _value(values, 'assists'),
+                            _value(values, 'timePlayedSeconds'), int(_value(values, 'completed') == 1),
+                            int(_value(values, 'standing', -1)) if activity == 1 else -1))
+            for weapon in entry.get('extended', {}).get('weapons', []):
+                weapon_values = weapon.get('values', {})
+                weapons.append((instance_id, period, mode, activity, weapon['referenceId'],
+                                _value(weapon_values, 'uniqueWeaponKills'),
+                                _value(weapon_values, 'uniqueWeaponPrecisionKills')))
+        return players, weapons
+
+    def refresh(self):
+        """Matérialise les PGCR stockés qui ne l'ont pas encore été ; retourne le nombre décodé.
+
+        Le suivi se fait par identifiant et non par date : le rattrapage de
+        l'historique ajoute des PGCR plus anciens que les derniers matérialisés.
+        """
+        start = time.perf_counter()
+        stored = np.array(self.store.pgcr_ids(self.membership_id), dtype=np.int64)
+        missing = np.setdiff1d(stored, self.materialized, assume_unique=True)
+        player_rows, weapon_rows = [], []
+        for instance_id, period, mode, payload in self.store.get_pgcr_payloads(missing.tolist()):
+            players, weapons = self._rows(instance_id, period, mode, decode_pgcr(payload))
+            player_rows += players
+            weapon_rows += weapons
+        if len(missing):
+            self.players.append(player_rows)
+            self.weapons.append(weapon_rows)
+            self.players.save()
+            self.weapons.save()
+            self.materialized = np.union1d(self.materialized, missing)
+            with open(f'{self.materialized_path}.tmp', 'wb') as f:
+                np.save(f, self.materialized)
+            os.replace(f'{self.materialized_path}.tmp', self.materialized_path)
+            self.players.load()
+            self.weapons.load()
+        logging.info(f"Analyse PGCR : {len(missing)} nouveau(x) PGCR, {len(self.players)} lignes joueur, "
+                     f"{len(self.weapons)} lignes arme en {(time.perf_counter() - start) * 1000:.0f} ms")
+        return len(missing)
+
+    # --- Requêtes ---
+
+    def kd_by_week(self, activity=None, weeks=12):
+        columns = self.players.columns
+        selected = self.players.mask(activity)
+        (week,), sums, counts = group_by([week_of(columns['period'][selected])],
+                                         {'kills': columns['kills'][selected], 'deaths': columns['deaths'][selected]})
+        week, counts = week[-weeks:], counts[-weeks:]
+        kills, deaths = sums['kills'][-weeks:], sums['deaths'][-weeks:]
+        return {'week_start': week_start(week), 'matches': counts, 'kills': kills, 'deaths': deaths,
+                'kd': np.divide(kills, np.maximum(deaths, 1))}
+
+    def weapon_types(self, weapon_hashes):
+        """Code de type (index dans la liste retournée) pour chaque hash, via le manifest."""
+        unique, inverse = np.unique(weapon_hashes, return_inverse=True)
+        if len(unique) == 0:
+            return np.array([], dtype=np.int64), []
+        definitions = manifest.get_item_definitions(unique.tolist())
+        names = [definitions.get(str(weapon_hash), {}).get('itemTypeDisplayName') or 'Inconnu'
+                 for weapon_hash in unique.tolist()]
+        labels = sorted(set(names))
+        positions = {label: index for index, label in enumerate(labels)}
+        codes = np.array([positions[name] for name in names], dtype=np.int64)
+        return codes[inverse.ravel()], labels
+
+    def kills_by_weapon_type(self, activity=None, weeks=12):
+        """Kills par type d'arme et par semaine : (semaines, types, matrice types x semaines)."""
+        columns = self.weapons.columns
+        selected = self.weapons.mask(activity)
+        codes, labels = self.weapon_types(columns['weapon_hash'][selected])
+        week = week_of(columns['period'][selected])
+        (type_keys, week_keys), sums, _ = group_by([codes, week], {'kills': columns['kills'][selected]})
+        all_weeks = np.unique(week_keys)[-weeks:]
+        matrix = np.zeros((len(labels), len(all_weeks)))
+        in_range = np.isin(week_keys, all_weeks)
+        matrix[type_keys[in_range], np.searchsorted(all_weeks, week_keys[in_range])] = sums['kills'][in_range]
+        return week_start(all_weeks), labels, matrix
+
+    def top_weapons(self, activity=None, limit=10):
+        columns = self.weapons.columns
+        selected = self.weapons.mask(activity)
+        (hashes,), sums, matches = group_by([columns['weapon_hash'][selected]],
+                                            {'kills': columns['kills'][selected],
+                                             'precision': columns['precision_kills'][selected]})
+        order = np.argsort(-sums['kills'], kind='stable')[:limit]
+        return {'weapon_hash': hashes[order], 'kills': sums['kills'][order], 'matches': matches[order],
+                'precision': np.divide(sums['precision'][order], np.maximum(sums['kills'][order], 1))}
@@ -0,0 +1,161 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from api.bungie_client import bungie_client, BungieAPIError
+from api.account_session import account_session
+from api.manifest import manifest
+from utils.local_store import local_store
+
+# DestinyActivityModeType
+MODE_ALL_PVP = 5
+MODE_ALL_PVE = 7
+# Identifiants voisins essayés avant de conclure qu'un identifiant est au-delà du plus récent
+NEIGHBOR_PROBES = 3
+
+def activity_of(modes):
+    """'PvP', 'PvE' ou None selon les modes de l'activité."""
+    if MODE_ALL_PVP in modes:
+        return 'PvP'
+    if MODE_ALL_PVE in modes:
+        return 'PvE'
+    return None
+
+def parse_period(period):
+    try:
+        return datetime.fromisoformat(period.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return time.time()
+
+def _stat(values, key):
+    return int(values.get(key, {}).get('basic', {}).get('value', 0))
+
+def extract_weapon_usage(pgcr):
+    """PGCR -> (instance_id, période, mode, activité, joueurs, {hash: (joueurs, kills)}) ; None si hors PvE/PvP."""
+    details = pgcr.get('activityDetails', {})
+    activity = activity_of(details.get('modes', []))
+    if activity is None:
+        return None
+    weapons = {}
+    entries = pgcr.get('entries', [])
+    for entry in entries:
+        for weapon in entry.get('extended', {}).get('weapons', []):
+            weapon_hash = weapon['referenceId']
+            players, kills = weapons.get(weapon_hash, (0, 0))
+            weapons[weapon_hash] = (players + 1, kills + _stat(weapon.get('values', {}), 'uniqueWeaponKills'))
+    return (int(details['instanceId']), parse_period(pgcr.get('period')), details.get('mode', 0),
+            activity, len(entries), weapons)
+
+class PgcrMetaPipeline:
+    """Meta calculée à partir de PGCR récents échantillonnés.
+
+    Les identifiants d'instance étant croissants, on localise le plus récent
+    (dernière activité du compte puis recherche exponentielle), on tire des
+    identifiants au hasard dans la fenêtre qui précède et on télécharge les
+    PGCR en parallèle sous le limiteur de débit partagé. L'usage des armes
+    (`extended.weapons`) est agrégé en SQL dans le stockage local.
+    """
+
+    def __init__(self, client=bungie_client, store=local_store, sample_size=200, span=1_000_000,
+                 max_workers=16, window_days=14):
+        self.client = client
+        self.store = store
+        self.sample_size = sample_size
+        self.span = span
+        self.max_workers = max_workers
+        self.window_days = window_days
+
+    def _exists(self, instance_id):
+        try:
+            return self.client.get_pgcr(instance_id) is not None
+        except BungieAPIError:
+            return False
+
+    def _exists_near(self, instance_id):
+        """Un PGCR manquant, privé ou en erreur est un trou de la séquence : les voisins tranchent."""
+        return any(self._exists(instance_id + offset) for offset in range(NEIGHBOR_PROBES + 1))
+
+    def seed_instance_id(self):
+        """Activité récente connue : échantillons déjà stockés ou historique du compte."""
+        seed = self.store.latest_meta_sample() or 0
+        if account_session.is_registered:
+            membership_type, membership_id = account_session.membership()
+            for character in self.store.get_characters(membership_id):
+                try:
+                    activities = self.client.get_activity_history(membership_type, membership_id,
+                                                                  character['character_id'], count=1)
+                except BungieAPIError as e:
+                    logging.warning(f"Historique indisponible pour {character['character_id']}: {str(e)}")
+                    continue
+                if activities:
+                    seed = max(seed, int(activities[0]['activityDetails']['instanceId']))
+        return seed or None
+
+    def latest_instance_id(self, seed, max_probes=30):
+        """Recherche exponentielle puis dichotomique du PGCR le plus récent au-delà de `seed`."""
+        low, step, probes = seed, 100_000, 0
+        while probes < max_probes and self._exists_near(low + step):
+            low += step
+            step *= 2
+            probes += 1
+        high = low + step
+        while high - low > 1000 and probes < max_probes:
+            middle = (low + high) // 2
+            if self._exists_near(middle):
+                low = middle
+            else:
+                high = middle
+            probes += 1
+        return low
+
+    def _fetch(self, instance_id):
+        try:
+            return extract_weapon_usage(self.client.get_pgcr(instance_id) or {})
+        except (BungieAPIError, KeyError, ValueError) as e:
+            logging.debug(f"PGCR {instance_id} ignoré: {str(e)}")
+            return None
+
+    def refresh(self):
+        """Échantillonne de nouveaux PGCR ; retourne le nombre de PGCR enregistrés."""
+        start = time.perf_counter()
+        seed = self.seed_instance_id()
+        if seed is None:
+            logging.warning("Aucune activité de référence pour échantillonner les PGCR")
+            return 0
+        latest = self.latest_instance_id(seed)
+        candidates = random.sample(range(max(1, latest - self.span), latest + 1), self.sample_size)
+        known = self.store.known_meta_samples(candidates)
+        candidates = [instance_id for instance_id in candidates if instance_id not in known]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            samples = [sample for sample in executor.map(self._fetch, candidates) if sample]
+        self.store.add_meta_samples(samples)
+        self.store.prune_meta_samples(time.time() - self.window_days * 86400)
+        logging.info(f"✓ {len(samples)}/{len(candidates)} PGCR échantillonnés autour de {latest} "
+                     f"en {time.perf_counter() - start:.1f} s")
+        return len(samples)
+
+    def top_weapons(self, limit=10):
+        """Armes les plus utilisées en PvE et en PvP, au format de la page Meta."""
+        since = time.time() - self.window_days * 86400
+        usages = {activity: self.store.get_meta_usage(activity, since, limit) for activity in ('PvE', 'PvP')}
+        definitions = manifest.get_item_definitions(
+            {weapon['weapon_hash'] for usage in usages.values() for weapon in usage['weapons']})
+        weapons = []
+        for activity, usage in usages.items():
+            for weapon in usage['weapons']:
+                definition = definitions.get(str(weapon['weapon_hash']), {})
+                display = definition.get('displayProperties', {})
+                weapons.append({
+                    'name': display.get('name', f"Arme {weapon['weapon_hash']}"),
+                    'type': definition.get('itemTypeDisplayName', 'Weapon'),
+                    'image_url': f"https://www.bungie.net{display['icon']}" if display.get('icon') else '',
+                    'usage_rate': f"{weapon['usage'] * 100:.1f}%",
+                    'kill_share': f"{weapon['kill_share'] * 100:.1f}%",
+                    'activity': activity,
+                    'item_hash': weapon['weapon_hash'],
+                    'matches': usage['matches'],
+                })
+        return weapons
+
+pgcr_meta = PgcrMetaPipeline()
@@ -0,0 +1,206 @@
+import json
+import logging
+import re
+import threading
+from utils.snapshot import read_snapshot_bytes
+
+# Propriétés de DestinyProfileResponse / DestinyCharacterResponse
+PROFILE_COMPONENT_KEYS = [
+    'responseMintedTimestamp', 'secondaryComponentsMintedTimestamp', 'vendorReceipts',
+    'profileInventory', 'profileCurrencies', 'profile', 'platformSilver', 'profileKiosks',
+    'profilePlugSets', 'profileProgression', 'profilePresentationNodes', 'profileRecords',
+    'profileCollectibles', 'profileTransitoryData', 'metrics', 'profileStringVariables',
+    'profileCommendations', 'characters', 'characterInventories', 'characterLoadouts',
+    'characterProgressions', 'characterRenderData', 'characterActivities', 'characterEquipment',
+    'characterKiosks', 'characterPlugSets', 'characterUninstancedItemComponents',
+    'characterPresentationNodes', 'characterRecords', 'characterCollectibles',
+    'characterStringVariables', 'characterCraftables', 'characterCurrencyLookups',
+    'itemComponents',
+]
+ENVELOPE_KEYS = ['Response', 'ErrorCode', 'ThrottleSeconds', 'ErrorStatus', 'Message', 'MessageData']
+
+def _key_alternation(words):
+    """Alternative regex factorisée par préfixe (bien plus rapide qu'une liste à plat)."""
+    branches = {}
+    optional = False
+    for word in words:
+        if not word:
+            optional = True
+            continue
+        branches.setdefault(word[0], []).append(word[1:])
+    parts = [re.escape(first) + _key_alternation(rest) for first, rest in sorted(branches.items())]
+    if not parts:
+        return ''
+    pattern = parts[0] if len(parts) == 1 else '(?:' + '|'.join(parts) + ')'
+    return f'(?:{pattern})?' if optional else pattern
+
+_KEY_PATTERN = re.compile(
+    ('"(' + _key_alternation(PROFILE_COMPONENT_KEYS + ENVELOPE_KEYS) + ')"\\s*:\\s*').encode()
+)
+_MISSING = object()
+_BLANK_BRACKETS = bytes.maketrans(b'{}[]', b'    ')
+_NOT_DELIMITER = bytes(byte for byte in range(256) if byte not in b'"{}[]')
+
+def _structure(raw):
+    """Copie de même longueur où seuls les délimiteurs JSON réels restent visibles.
+
+    Les échappements (\\\\ et \\") sont masqués, puis les accolades et crochets
+    contenus dans des chaînes sont remplacés par des espaces : positions et
+    guillemets restants coïncident avec le document d'origine. None si les
+    guillemets ne sont pas appariés (document invalide).
+    """
+    masked = raw.replace(b'\\\\', b'  ').replace(b'\\"', b'  ') if b'\\' in raw else raw
+    delimiters = masked.translate(None, _NOT_DELIMITER)
+    if delimiters.count(b'"') % 2:
+        return None
+    # Chaînes sans accolade ni crochet : leurs guillemets sont adjacents une fois le reste retiré
+    if b'"' not in delimiters.replace(b'""', b''):
+        return masked
+    parts = masked.split(b'"')
+    parts[1::2] = [part.translate(_BLANK_BRACKETS) for part in parts[1::2]]
+    return b'"'.join(parts)
+
+class ProfileContainer:
+    """Réponse de profil dont chaque composant reste en octets bruts jusqu'au premier accès.
+
+    Le découpage repose sur la recherche des clés de composants connues et sur
+    un comptage d'accolades pour écarter celles qui sont imbriquées, sans
+    décoder le document. Le comptage porte sur une copie où les chaînes ne
+    contiennent plus ni accolade ni crochet : le découpage est exact, et une
+    clé absente de l'index est absente du document. Seul un composant
+    illisible (document invalide) provoque un décodage complet.
+    """
+
+    def __init__(self, raw_components=None, parsed=None, source=None):
+        self.raw_components = raw_components or {}
+        self.parsed = dict(parsed or {})
+        self.source = source
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_response(cls, response):
+        """Conteneur déjà décodé (réponse réseau)."""
+        return cls(parsed=response)
+
+    @classmethod
+    def from_file(cls, path):
+        """Charge un snapshot (compact, compressé ou historique) sans le décoder."""
+        return cls.from_bytes(read_snapshot_bytes(path))
+
+    @classmethod
+    def from_bytes(cls, raw):
+        raw = bytes(raw)
+        view = memoryview(raw)
+        structure = _structure(raw)
+        if structure is None or structure.count(b'{') != structure.count(b'}'):
+            # Document invalide : json.loads signalera l'erreur
+            container = cls(source=raw)
+            container._parse_all()
+            return container
+        # Ne garder que les clés de premier niveau : profondeur calculée par comptage des
+        # accolades/crochets entre deux correspondances (C, sans décoder les valeurs)
+        matches = []
+        depth = 0
+        position = 0
+        component_depth = 1
+        for match in _KEY_PATTERN.finditer(structure):
+            start = match.start()
+            depth += (structure.count(b'{', position, start) - structure.count(b'}', position, start)
+                      + structure.count(b'[', position, start) - structure.count(b']', position, start))
+            position = start
+            name = match.group(1).decode()
+            if name == 'Response' and depth == 1:
+                component_depth = 2
+            if (name in ENVELOPE_KEYS and depth == 1) or (name not in ENVELOPE_KEYS and depth == component_depth):
+                matches.append((name, match))
+
+        raw_components = {}
+        for index, (name, match) in enumerate(matches):
+            if name in ENVELOPE_KEYS:
+                continue
+            is_last = index + 1 == len(matches)
+            end = len(raw) if is_last else matches[index + 1][1].start()
+            # Objets parents refermés après la valeur : Response (et l'enveloppe si elle finit le document)
+            closing = component_depth if is_last else int(matches[index + 1][0] in ENVELOPE_KEYS)
+            raw_components[name] = cls._trim(view, match.end(), end, closing)
+        container = cls(raw_components, source=raw)
+        if not raw_components:
+            container._parse_all()
+        return container
+
+    @staticmethod
+    def _trim(raw, start, end, closing):
+        """Retire la virgule (et les `closing` accolades fermantes des parents) après la valeur, sans copie."""
+        def strip(end):
+            while end > start and raw[end - 1] in b' \t\r\n':
+                end -= 1
+            return end
+        end = strip(end)
+        if end > start and raw[end - 1] == ord(','):
+            end = strip(end - 1)
+        for _ in range(closing):
+            if end > start and raw[end - 1] == ord('}'):
+                end = strip(end - 1)
+        return raw[start:end]
+
+    def _parse_all(self):
+        """Décodage complet de secours."""
+        logging.debug("Découpage du profil invalide, décodage complet")
+        data = json.loads(self.source)
+        response = data.get('Response', data) if isinstance(data, dict) else {}
+        self.parsed = dict(response)
+        self.raw_components = {}
+        self.source = None
+
+    def component(self, name, default=_MISSING):
+        """Retourne le composant décodé (décodé une seule fois puis mis en cache)."""
+        if name in self.parsed:
+            return self.parsed[name]
+        with self.lock:
+            if name in self.parsed:
+                return self.parsed[name]
+            raw = self.raw_components.get(name)
+            if raw is None:
+                # Découpage exact : une clé absente de l'index est absente du document
+                if default is _MISSING:
+                    raise KeyError(name)
+                return default
+            try:
+                value = json.loads(raw.tobytes())
+            except ValueError:
+                self._parse_all()
+                if name not in self.parsed:
+                    if default is _MISSING:
+                        raise KeyError(name)
+                    return default
+                return self.parsed[name]
+            self.parsed[name] = value
+            del self.raw_components[name]
+            return value
+
+    def __getitem__(self, name):
+        return self.component(name)
+
+    def get(self, name, default=None):
+        return self.component(name, default)
+
+    def __contains__(self, name):
+        return name in self.parsed or name in self.raw_components
+
+    def keys(self):
+        return list(self.parsed) + [name for name in self.raw_components if name not in self.parsed]
+
+    def is_parsed(self, name):
+        return name in self.parsed
+
+    def raw_size(self, name):
+        """Taille en octets d'un composant encore non décodé (0 s'il est décodé)."""
+        raw = self.raw_components.get(name)
+        return len(raw) if raw is not None else 0
+
+    def to_dict(self):
+        """Décode tous les composants (pour sérialisation complète)."""
+        for name in self.keys():
+            # Un composant illisible remplace le découpage par le décodage complet
+            self.component(name, None)
+        return {name: self.component(name) for name in self.keys()}
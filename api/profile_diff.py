@@ -0,0 +1,56 @@
+from api.models import items_from_component
+
+# Types d'événements
+ITEM_EQUIPPED = 'item_equipped'   # Le slot contient une autre instance (ou plus rien)
+ITEM_LIGHT = 'item_light'         # Même instance, puissance différente
+ITEM_STATS = 'item_stats'         # Même instance, valeurs de stats différentes
+
+class ChangeEvent:
+    """Changement élémentaire entre deux snapshots de profil."""
+    __slots__ = ('kind', 'character_id', 'slot', 'old', 'new')
+
+    def __init__(self, kind, character_id, slot=None, old=None, new=None):
+        self.kind = kind
+        self.character_id = character_id
+        self.slot = slot
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind}, {self.character_id}, {self.slot}, {self.old!r} -> {self.new!r})"
+
+
+def _by_slot(items):
+    if isinstance(items, dict):
+        return items
+    # Slot hors de BUCKET_TYPES : clé par bucketHash, deux slots inconnus ne se remplacent pas
+    return {item.bucket_hash if item.bucket_type == 'unknown' else item.bucket_type: item for item in items}
+
+def _stat_values(item):
+    return {stat.hash: stat.value for stat in item.stats}
+
+def diff_equipment(character_id, old_items, new_items):
+    """Compare deux équipements (listes ou dicts slot -> ItemInstance) par itemInstanceId, puissance et stats."""
+    old_items = _by_slot(old_items)
+    new_items = _by_slot(new_items)
+    events = []
+    for slot in list(old_items) + [slot for slot in new_items if slot not in old_items]:
+        old = old_items.get(slot)
+        new = new_items.get(slot)
+        if old is None or new is None or old.instance_id != new.instance_id or old.item_hash != new.item_hash:
+            if old is not None or new is not None:
+                events.append(ChangeEvent(ITEM_EQUIPPED, character_id, slot, old, new))
+            continue
+        if old.light != new.light:
+            events.append(ChangeEvent(ITEM_LIGHT, character_id, slot, old, new))
+        if old.stats != new.stats and _stat_values(old) != _stat_values(new):
+            events.append(ChangeEvent(ITEM_STATS, character_id, slot, old, new))
+    return events
+
+def character_equipment(response, character_id):
+    """Équipement d'un personnage d'une réponse de profil (composants 205 et 300/304)."""
+    equipment = response.get('characterEquipment', {}).get('data', {}).get(character_id)
+    if not equipment:
+        return []
+    return items_from_component(equipment.get('items', []), response.get('itemComponents', {}),
+                                'equipped', character_id)
@@ -0,0 +1,48 @@
+import logging
+import threading
+import time
+
+class RateLimiter:
+    """Seau à jetons partagé entre threads.
+
+    `rate` requêtes par seconde en régime établi, avec des rafales jusqu'à
+    `burst`. `penalize` suspend tous les appelants (ThrottleSeconds, 429).
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Bloque jusqu'à ce qu'un jeton soit disponible ; retourne le temps d'attente."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = max(self.blocked_until - now, (tokens - self.tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds):
+        """Suspend toutes les requêtes pendant `seconds` (demande explicite du serveur)."""
+        if seconds <= 0:
+            return
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+        logging.warning(f"⏳ Limite de requêtes atteinte, pause de {seconds:.1f} s")
+
+# Bungie tolère ~25 requêtes/s par clé : marge de sécurité
+bungie_rate_limiter = RateLimiter(rate=20, burst=20)
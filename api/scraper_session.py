@@ -0,0 +1,187 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+
+COOKIES_PATH = 'cache/light_gg_cookies.json'
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/124.0 Safari/537.36')
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'fr,fr-FR;q=0.8,en-US;q=0.5,en;q=0.3',
+}
+PAGE_TIMEOUT = 20
+CHALLENGE_TIMEOUT = 15      # Délai laissé au challenge en mode headless
+CAPTCHA_TIMEOUT = 180       # Délai laissé à l'utilisateur dans le navigateur visible
+
+def is_challenge_url(url):
+    return 'challenge' in (url or '')
+
+class ScraperSessions:
+    """Sessions de scraping réutilisées entre les récupérations.
+
+    - une session HTTP (pool de connexions) qui rejoue les cookies sauvegardés ;
+    - un Chrome headless unique, créé à la demande et partagé sous verrou,
+      relancé en mode visible seulement si un captcha doit être résolu à la main.
+    """
+
+    def __init__(self, cookies_path=COOKIES_PATH):
+        self.cookies_path = cookies_path
+        self._http = None
+        self._http_lock = threading.Lock()
+        self._driver = None
+        self._driver_headless = None
+        self._browser_lock = threading.Lock()
+
+    # --- Cookies ---
+
+    def load_cookies(self):
+        """Cookies au format Selenium (liste de dicts) ; [] si absents ou illisibles."""
+        if not os.path.exists(self.cookies_path):
+            return []
+        try:
+            with open(self.cookies_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Cookies de scraping illisibles: {str(e)}")
+            return []
+
+    def save_cookies(self, cookies):
+        directory = os.path.dirname(self.cookies_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.cookies_path, 'w') as f:
+            json.dump(cookies, f)
+        # La session HTTP reprend immédiatement les nouveaux cookies
+        if self._http is not None:
+            self._apply_cookies(self._http, cookies)
+
+    @staticmethod
+    def _apply_cookies(session, cookies):
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'],
+                                domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+    # --- HTTP ---
+
+    def http(self):
+        """Session HTTP partagée (thread-safe pour des requêtes GET concurrentes)."""
+        with self._http_lock:
+            if self._http is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._apply_cookies(session, self.load_cookies())
+                self._http = session
+            return self._http
+
+    # --- Navigateur ---
+
+    def _create_driver(self, headless):
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument('--headless=new')
+            options.add_argument('--window-size=1920,1080')
+        else:
+            options.add_argument('--start-maximized')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument(f'--user-agent={USER_AGENT}')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        # Le DOM suffit : on n'attend pas les images ni les scripts tiers
+        options.page_load_strategy = 'eager'
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(PAGE_TIMEOUT)
+        logging.info(f"✓ Navigateur de scraping démarré ({'headless' if headless else 'visible'})")
+        return driver
+
+    def _quit_driver(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logging.debug(f"Fermeture du navigateur: {str(e)}")
+            self._driver = None
+            self._driver_headless = None
+
+    @contextmanager
+    def browser(self, headless=True):
+        """Accès exclusif au navigateur partagé (créé ou relancé si le mode change)."""
+        with self._browser_lock:
+            if self._driver is not None and self._driver_headless != headless:
+                self._quit_driver()
+            if self._driver is None:
+                self._driver = self._create_driver(headless)
+                self._driver_headless = headless
+            try:
+                yield self._driver
+            except Exception:
+                # Navigateur dans un état inconnu : il sera recréé au prochain usage
+                self._quit_driver()
+                raise
+
+    def restore_cookies(self, driver, origin):
+        """Injecte les cookies sauvegardés (le navigateur doit être sur le domaine)."""
+        cookies = self.load_cookies()
+        if not cookies:
+            return False
+        driver.get(origin)
+        for cookie in cookies:
+            cookie = {key: value for key, value in cookie.items() if key != 'sameSite'}
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                continue
+        return True
+
+    @staticmethod
+    def wait_ready(driver, timeout=PAGE_TIMEOUT):
+        """Attend que le document soit chargé (remplace les time.sleep fixes)."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script('return document.readyState') in ('interactive', 'complete'))
+
+    @staticmethod
+    def wait_for(driver, css_selector, timeout=PAGE_TIMEOUT):
+        """Attend qu'un élément CSS soit présent dans le DOM."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, css_selector)))
+
+    @staticmethod
+    def wait_challenge(driver, timeout, should_stop=None):
+        """Attend la fin d'un challenge anti-bot ; False s'il est toujours là (ou si `should_stop()` devient vrai)."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.5).until(
+                lambda d: not is_challenge_url(d.current_url) or (should_stop is not None and should_stop()))
+        except TimeoutException:
+            return False
+        return not is_challenge_url(driver.current_url)
+
+    def open_page(self, driver, url, ready_selector=None):
+        driver.get(url)
+        self.wait_ready(driver)
+        if ready_selector:
+            self.wait_for(driver, ready_selector)
+
+    def close(self):
+        with self._browser_lock:
+            self._quit_driver()
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+scraper_sessions = ScraperSessions()
+atexit.register(scraper_sessions.close)
@@ -0,0 +1,226 @@
+import bisect
+import logging
+import re
+import time
+import unicodedata
+from api.manifest import manifest
+
+_WORD = re.compile(r'\w+')
+
+def normalize(text):
+    """Minuscules sans accents ("Spéciale" -> "speciale")."""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+def tokenize(text):
+    return _WORD.findall(normalize(text)) if text else []
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+def item_key(item, seen=None):
+    """Clé stable d'un item : id d'instance, sinon propriétaire + hash (+ suffixe si plusieurs piles)."""
+    if item.instance_id:
+        return item.instance_id
+    base = f"{item.owner_id or 'profile'}:{item.location}:{item.item_hash}"
+    if seen is None:
+        return base
+    key = base
+    suffix = 1
+    while key in seen:
+        suffix += 1
+        key = f"{base}:{suffix}"
+    return key
+
+def plug_names(item):
+    """Noms des perks/plugs d'une instance (définitions déjà en cache uniquement)."""
+    names = []
+    for plug_hash in item.plugs:
+        definition = manifest.get_item_definition(plug_hash, fetch=False)
+        if definition:
+            name = definition.get('displayProperties', {}).get('name')
+            if name:
+                names.append(name)
+    return names
+
+class InventoryIndex:
+    """Index inversé des items (nom, perks, élément, munitions, slot, stats).
+
+    Chaque champ associe ses termes aux clés d'items. Le vocabulaire est
+    trié pour la recherche par préfixe (bisect) et indexé par trigrammes
+    pour la recherche de sous-chaîne ; les stats sont gardées en listes
+    triées pour les requêtes d'intervalle.
+    """
+
+    FIELDS = ('name', 'perk', 'element', 'ammo', 'slot')
+
+    def __init__(self, plug_name_resolver=plug_names):
+        self.plug_name_resolver = plug_name_resolver
+        self.items = {}
+        self.postings = {field: {} for field in self.FIELDS}
+        self.vocabulary = []          # Termes triés, tous champs confondus
+        self.term_counts = {}         # Terme -> nombre de (champ, item) qui l'utilisent
+        self.trigram_terms = {}       # Trigramme -> termes
+        self.stat_values = {}         # stat_hash -> liste triée de (valeur, clé)
+        self._documents = {}          # Clé -> {champ: termes}, stats ; pour la suppression
+        self._fingerprints = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def fingerprint(item):
+        return (item.signature, item.plugs, item.definition is not None, item.location, item.owner_id)
+
+    def document(self, item):
+        definition = item.definition
+        fields = {
+            'name': tokenize(item.name),
+            'perk': [token for name in self.plug_name_resolver(item) for token in tokenize(name)],
+            'element': tokenize(definition.energy_name) if definition else [],
+            'ammo': tokenize(definition.ammo_type_name) if definition and definition.ammo_type else [],
+            'slot': [item.bucket_type] if item.bucket_type != 'unknown' else [],
+        }
+        return {field: set(terms) for field, terms in fields.items()}
+
+    # --- Mise à jour ---
+
+    def _add_term(self, field, term, key):
+        keys = self.postings[field].setdefault(term, set())
+        keys.add(key)
+        count = self.term_counts.get(term, 0)
+        if count == 0:
+            bisect.insort(self.vocabulary, term)
+            for trigram in trigrams(term):
+                self.trigram_terms.setdefault(trigram, set()).add(term)
+        self.term_counts[term] = count + 1
+
+    def _remove_term(self, field, term, key):
+        keys = self.postings[field].get(term)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self.postings[field][term]
+        count = self.term_counts.get(term, 0) - 1
+        if count <= 0:
+            self.term_counts.pop(term, None)
+            index = bisect.bisect_left(self.vocabulary, term)
+            if index < len(self.vocabulary) and self.vocabulary[index] == term:
+                del self.vocabulary[index]
+            for trigram in trigrams(term):
+                terms = self.trigram_terms.get(trigram)
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del self.trigram_terms[trigram]
+        else:
+            self.term_counts[term] = count
+
+    def add(self, key, item):
+        if key in self.items:
+            self.remove(key)
+        document = self.document(item)
+        stats = tuple((stat.hash, stat.value) for stat in item.stats)
+        for field, terms in document.items():
+            for term in terms:
+                self._add_term(field, term, key)
+        for stat_hash, value in stats:
+            bisect.insort(self.stat_values.setdefault(stat_hash, []), (value, key))
+        self.items[key] = item
+        self._documents[key] = (document, stats)
+        self._fingerprints[key] = self.fingerprint(item)
+
+    def remove(self, key):
+        if key not in self.items:
+            return
+        document, stats = self._documents.pop(key)
+        for field, terms in document.items():
+            for term in terms:
+                self._remove_term(field, term, key)
+        for stat_hash, value in stats:
+            values = self.stat_values.get(stat_hash, [])
+            index = bisect.bisect_left(values, (value, key))
+            if index < len(values) and values[index] == (value, key):
+                del values[index]
+        del self.items[key]
+        self._fingerprints.pop(key, None)
+
+    def update(self, items):
+        """Met l'index en phase avec `items` : seuls les items nouveaux ou modifiés sont réindexés.
+
+        Retourne (ajoutés ou modifiés, supprimés).
+        """
+        start = time.perf_counter()
+        seen = set()
+        changed = 0
+        for item in items:
+            key = item_key(item, seen)
+            seen.add(key)
+            if self._fingerprints.get(key) != self.fingerprint(item):
+                self.add(key, item)
+                changed += 1
+            else:
+                self.items[key] = item
+        removed = [key for key in self.items if key not in seen]
+        for key in removed:
+            self.remove(key)
+        logging.debug(f"Index d'inventaire: {changed} item(s) indexé(s), {len(removed)} supprimé(s) "
+                      f"en {(time.perf_counter() - start) * 1000:.1f} ms")
+        return changed, len(removed)
+
+    def reindex(self, keys):
+        """Réindexe les items déjà présents dont les définitions (ou perks) viennent d'être résolues."""
+        for key in keys:
+            item = self.items.get(key)
+            if item is not None:
+                self.add(key, item)
+
+    # --- Requêtes ---
+
+    def matching_terms(self, fragment):
+        """Termes du vocabulaire qui commencent par `fragment` ou le contiennent."""
+        start = bisect.bisect_left(self.vocabulary, fragment)
+        end = bisect.bisect_left(self.vocabulary, fragment + '￿')
+        terms = set(self.vocabulary[start:end])
+        if len(fragment) >= 3:
+            candidates = None
+            for trigram in trigrams(fragment):
+                found = self.trigram_terms.get(trigram)
+                if not found:
+                    candidates = set()
+                    break
+                candidates = set(found) if candidates is None else candidates & found
+            terms.update(term for term in candidates if fragment in term)
+        return terms
+
+    def term_keys(self, fragment, fields=None):
+        """Clés des items dont un champ contient un terme correspondant à `fragment`."""
+        fields = fields or self.FIELDS
+        keys = set()
+        for term in self.matching_terms(normalize(fragment)):
+            for field in fields:
+                found = self.postings[field].get(term)
+                if found:
+                    keys |= found
+        return keys
+
+    def stat_keys(self, stat_hash, low=None, high=None):
+        """Clés des items dont la stat est dans [low, high] (bornes optionnelles)."""
+        values = self.stat_values.get(int(stat_hash), [])
+        start = 0 if low is None else bisect.bisect_left(values, (low,))
+        end = len(values) if high is None else bisect.bisect_left(values, (high + 1,))
+        return {key for _, key in values[start:end]}
+
+    def search_keys(self, query):
+        """Recherche au fil de la frappe : chaque mot doit correspondre (préfixe ou sous-chaîne)."""
+        result = None
+        for fragment in tokenize(query):
+            keys = self.term_keys(fragment)
+            result = keys if result is None else result & keys
+            if not result:
+                return set()
+        return set(self.items) if result is None else result
+
+    def search(self, query):
+        return [self.items[key] for key in self.search_keys(query)]
@@ -0,0 +1,159 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
+WISHLIST_PATH = 'data/wishlist.txt'
+WILDCARD_ITEM = -69420  # item=-69420 : s'applique à toutes les armes
+PREFIX = 'dimwishlist:'
+
+class WishlistMatch:
+    __slots__ = ('trash', 'notes', 'perks')
+
+    def __init__(self, trash, notes, perks):
+        self.trash = trash      # True : roll à jeter (item=-hash dans la liste)
+        self.notes = notes
+        self.perks = perks
+
+    def __repr__(self):
+        return f"WishlistMatch({'trash' if self.trash else 'wish'}, {sorted(self.perks)})"
+
+def parse_line(line):
+    """'dimwishlist:item=123&perks=1,2,3#notes:...' -> (item_hash, frozenset(perks), notes) ou None."""
+    if not line.startswith(PREFIX):
+        return None
+    body, _, notes = line[len(PREFIX):].partition('#notes:')
+    item_hash = None
+    perks = frozenset()
+    for part in body.split('&'):
+        key, _, value = part.partition('=')
+        if key == 'item':
+            try:
+                item_hash = int(value)
+            except ValueError:
+                return None
+        elif key == 'perks' and value:
+            try:
+                perks = frozenset(map(int, filter(None, value.split(','))))
+            except ValueError:
+                return None
+    if item_hash is None:
+        return None
+    return item_hash, perks, notes.strip()
+
+class WishlistIndex:
+    """Wishlist au format DIM indexée par hash d'item puis par ensemble de perks.
+
+    Un item correspond à un roll si toutes les perks du roll figurent parmi
+    ses plugs. Les résultats sont mémorisés par (hash, plugs). L'indexation
+    se fait sur un thread de travail (`ensure_loaded`) ; tant qu'elle n'est
+    pas terminée, `match` ne bloque pas et ne trouve rien.
+    """
+
+    def __init__(self, path=WISHLIST_PATH):
+        self.path = path
+        self.rolls = {}      # item_hash -> {frozenset(perks): notes}
+        self.trash = {}
+        self.title = ''
+        self.loaded = False
+        self.lock = threading.RLock()
+        self._matches = {}
+
+    def __len__(self):
+        return sum(len(rolls) for rolls in self.rolls.values()) + sum(len(rolls) for rolls in self.trash.values())
+
+    def parse(self, lines):
+        rolls = {}
+        trash = {}
+        title = ''
+        pending_notes = ''
+        for line in lines:
+            line = line.strip()
+            if not line:
+                pending_notes = ''
+                continue
+            if line.startswith('title:'):
+                title = line[len('title:'):].strip()
+                continue
+            if line.startswith('//notes:'):
+                # Notes de bloc : s'appliquent aux lignes suivantes sans note propre
+                pending_notes = line[len('//notes:'):].strip()
+                continue
+            parsed = parse_line(line)
+            if parsed is None:
+                continue
+            item_hash, perks, notes = parsed
+            target = trash if item_hash < 0 and item_hash != WILDCARD_ITEM else rolls
+            target.setdefault(abs(item_hash) if item_hash != WILDCARD_ITEM else WILDCARD_ITEM, {}) \
+                  .setdefault(perks, notes or pending_notes)
+        return rolls, trash, title
+
+    def load(self, path=None):
+        """Charge (ou recharge) la wishlist ; retourne le nombre de rolls."""
+        path = path or self.path
+        start = time.perf_counter()
+        with self.lock:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    rolls, trash, title = self.parse(f)
+            else:
+                rolls, trash, title = {}, {}, ''
+            # Index remplacé avant le cache : un match concurrent n'écrit que dans l'ancien cache
+            self.rolls, self.trash, self.title = rolls, trash, title
+            self._matches = {}
+            self.loaded = True
+        if not rolls and not trash:
+            return 0
+        logging.info(f"✓ Wishlist chargée : {len(self)} rolls pour {len(rolls)} items "
+                     f"en {(time.perf_counter() - start) * 1000:.0f} ms")
+        return len(self)
+
+    def import_file(self, source):
+        """Importe un fichier DIM : copié dans data/ puis indexé."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if os.path.abspath(source) != os.path.abspath(self.path):
+            shutil.copyfile(source, self.path)
+        return self.load()
+
+    def ensure_loaded(self):
+        """Indexe la wishlist si ce n'est pas déjà fait (bloquant : à appeler hors thread GUI)."""
+        if self.loaded:
+            return
+        with self.lock:
+            if not self.loaded:
+                self.load()
+
+    @staticmethod
+    def _find(rolls_by_item, item_hash, plugs):
+        for rolls in (rolls_by_item.get(item_hash), rolls_by_item.get(WILDCARD_ITEM)):
+            if not rolls:
+                continue
+            for perks, notes in rolls.items():
+                if perks <= plugs:
+                    return perks, notes
+        return None
+
+    def match(self, item):
+        """WishlistMatch de l'item (trash prioritaire), ou None."""
+        if not item.plugs or not self.loaded:
+            return None
+        matches = self._matches
+        key = (item.item_hash, item.plugs)
+        if key in matches:
+            return matches[key]
+        plugs = frozenset(item.plugs)
+        result = None
+        found = self._find(self.trash, item.item_hash, plugs)
+        if found:
+            result = WishlistMatch(True, found[1], found[0])
+        else:
+            found = self._find(self.rolls, item.item_hash, plugs)
+            if found:
+                result = WishlistMatch(False, found[1], found[0])
+        matches[key] = result
+        return result
+
+wishlist = WishlistIndex()
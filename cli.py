@@ -0,0 +1,182 @@
+"""Synchronisation sans interface graphique (cron, timer systemd).
+
+Réutilise le client API, le manifest et le stockage local de l'application
+sans importer Qt : les données restent chaudes pour la prochaine ouverture.
+
+    python cli.py                          # profil + historique, une fois
+    python cli.py --profile --clan 123456  # profil + roster du clan
+    python cli.py --all --interval 3600    # démon : tout, toutes les heures
+"""
+import sys
+import os
+import argparse
+import logging
+import signal
+import threading
+import time
+
+TASKS = ('profile', 'history', 'clan')
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Destiny 2 Hub - synchronisation sans interface")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profil, personnages, inventaires et définitions du manifest")
+    parser.add_argument('--history', action='store_true',
+                        help="Historique d'activités et PGCR manquants")
+    parser.add_argument('--clan', metavar='GROUP_ID',
+                        help="Roster et profils des membres du clan")
+    parser.add_argument('--all', action='store_true',
+                        help="Toutes les synchronisations (clan : dernier clan ouvert si --clan est absent)")
+    parser.add_argument('--account', metavar='TYPE:ID',
+                        help="Compte à synchroniser (par défaut : data/account.json)")
+    parser.add_argument('--pgcr-limit', type=int, metavar='N',
+                        help="Nombre maximal de PGCR téléchargés par passage")
+    parser.add_argument('--interval', type=float, metavar='SECONDES',
+                        help="Mode démon : relance la synchronisation à cet intervalle")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Journalisation détaillée")
+    args = parser.parse_args(argv)
+    if args.pgcr_limit is not None and args.pgcr_limit <= 0:
+        parser.error("--pgcr-limit doit être positif")
+    if args.interval is not None and args.interval <= 0:
+        parser.error("--interval doit être positif")
+    if args.account and not _parse_account(args.account):
+        parser.error("--account attend TYPE:ID (ex. 3:4611686018467890123)")
+    return args
+
+def _parse_account(value):
+    membership_type, _, membership_id = value.partition(':')
+    if not (membership_type.isdigit() and membership_id.isdigit()):
+        return None
+    return int(membership_type), membership_id
+
+def setup_cli_logging(verbose):
+    """Journal console uniquement (utils.logger vérifie aussi PyQt6, inutile ici)."""
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stdout
+    )
+
+class SyncRunner:
+    """Exécute les synchronisations demandées et chronomètre chaque étape."""
+
+    def __init__(self, args):
+        self.args = args
+        self.stop_event = threading.Event()
+        self.clan_id = args.clan
+        self.tasks = [task for task in TASKS if args.all or getattr(args, task)]
+        if not self.tasks:
+            self.tasks = ['profile', 'history']
+
+    def account(self):
+        from api.account_session import account_session
+        if self.args.account:
+            return _parse_account(self.args.account)
+        return account_session.membership()
+
+    def sync_profile(self):
+        from api.bungie_client import bungie_client
+        from api.manifest import manifest
+        from api.models import private_components_missing
+        from api.oauth_handler import oauth_manager
+        from utils.config import PROFILE_COMPONENTS, PROFILE_SNAPSHOT_PATH, SNAPSHOT_COMPRESSION
+        from utils.local_store import local_store
+        from utils.profile_history import profile_history
+        from utils.snapshot import write_snapshot
+
+        membership_type, membership_id = self.account()
+        # Le jeton OAuth est celui du compte enregistré : inutile pour un autre compte
+        access_token = None if self.args.account else oauth_manager.valid_access_token()
+        response = bungie_client.get_profile(membership_type, membership_id, PROFILE_COMPONENTS, access_token)
+        if not response or 'characters' not in response:
+            raise ValueError("Structure de données inattendue dans la réponse")
+        if not self.args.account:
+            # Même snapshot que la page Équipement : lu directement au prochain lancement
+            write_snapshot(PROFILE_SNAPSHOT_PATH, {'Response': response, 'ErrorCode': 1}, SNAPSHOT_COMPRESSION)
+        counts = local_store.upsert_profile(membership_type, membership_id, response)
+        profile_history.record(membership_id, response)
+        item_hashes = {item['item_hash'] for item in local_store.get_items(membership_id)}
+        definitions = manifest.get_item_definitions(item_hashes)
+        detail = (f"{sum(counts.values())} ligne(s) modifiée(s), "
+                  f"{len(definitions)}/{len(item_hashes)} définition(s) en cache")
+        if private_components_missing(response):
+            detail += " (connexion requise : coffre et inventaires absents)"
+        return detail
+
+    def sync_history(self):
+        from api.activity_crawler import activity_crawler
+        membership_type, membership_id = self.account()
+        report = activity_crawler.crawl(membership_type, membership_id, pgcr_limit=self.args.pgcr_limit)
+        return repr(report)
+
+    def sync_clan(self):
+        from api.clan_roster import clan_roster
+        from utils.local_store import local_store
+        group_id = self.clan_id or local_store.get_document('clan_group_id')
+        if not group_id:
+            raise LookupError("Aucun clan : utiliser --clan GROUP_ID")
+        return repr(clan_roster.sync(group_id))
+
+    def run_once(self):
+        """Un passage complet ; retourne True si toutes les étapes ont réussi."""
+        start = time.perf_counter()
+        timings = []
+        for task in self.tasks:
+            if self.stop_event.is_set():
+                break
+            task_start = time.perf_counter()
+            try:
+                detail = getattr(self, f'sync_{task}')()
+                ok = True
+            except Exception as e:
+                logging.error(f"❌ Synchronisation {task} en échec: {str(e)}")
+                logging.debug("Détails de l'erreur:", exc_info=True)
+                detail, ok = str(e), False
+            timings.append((task, ok, (time.perf_counter() - task_start) * 1000, detail))
+        print(self.report(timings, (time.perf_counter() - start) * 1000), flush=True)
+        return all(ok for _, ok, _, _ in timings)
+
+    @staticmethod
+    def report(timings, total_ms):
+        lines = ["=== Synchronisation ==="]
+        for task, ok, elapsed_ms, detail in timings:
+            lines.append(f"{'✓' if ok else '✗'} {task:<8} {elapsed_ms:>9.0f} ms  {detail}")
+        lines.append(f"  {'total':<8} {total_ms:>9.0f} ms")
+        return "\n".join(lines)
+
+    def run_forever(self, interval):
+        """Mode démon : un passage toutes les `interval` secondes jusqu'à SIGINT/SIGTERM."""
+        logging.info(f"Mode démon : synchronisation toutes les {interval:.0f} s ({', '.join(self.tasks)})")
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            self.run_once()
+            # Intervalle mesuré entre deux débuts de passage, sans rattrapage des passages manqués
+            self.stop_event.wait(max(0.0, interval - (time.monotonic() - started)))
+        logging.info("Arrêt du mode démon")
+
+    def stop(self, *_):
+        self.stop_event.set()
+        from api.activity_crawler import activity_crawler
+        activity_crawler.stop()
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    setup_cli_logging(args.verbose)
+    # Les chemins relatifs (data/, cache/) sont ceux de l'application
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    from utils.config import create_directories
+    from utils.local_store import local_store
+    create_directories()
+    local_store.import_legacy_files()
+
+    runner = SyncRunner(args)
+    signal.signal(signal.SIGTERM, runner.stop)
+    signal.signal(signal.SIGINT, runner.stop)
+    if args.interval:
+        runner.run_forever(args.interval)
+        return 0
+    return 0 if runner.run_once() else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,6 +20,8 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 import threading
 import socket
 import psutil
+from api.account_session import account_session
+from utils.snapshot import read_snapshot, snapshot_writer
 
 # Load environment variables
 load_dotenv()
@@ -1217,18 +1219,12 @@ class DestinyHub(QMainWindow):
         try:
             self.logger.info("=== Chargement des personnages ===")
             
-            if not os.path.exists('data/account.json'):
+            # Compte partagé, chargé une seule fois
+            player_info = account_session.player_info
+            if player_info is None:
                 self.logger.error("❌ Aucun compte trouvé dans data/account.json")
                 return
 
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-                
-            if not account_data.get('Response'):
-                self.logger.error("❌ Données de compte invalides")
-                return
-            
-            player_info = account_data['Response'][0]
             membership_id = player_info['membershipId']
             membership_type = player_info['membershipType']
             
@@ -1288,14 +1284,12 @@ class DestinyHub(QMainWindow):
         try:
             self.logger.info(f"=== Chargement de l'équipement pour le personnage {character_id} ===")
             
-            if not os.path.exists('data/account.json'):
+            # Compte partagé, chargé une seule fois
+            player_info = account_session.player_info
+            if player_info is None:
                 self.logger.error("❌ Aucun compte trouvé")
                 return
 
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-                
-            player_info = account_data['Response'][0]
             membership_id = player_info['membershipId']
             membership_type = player_info['membershipType']
             
@@ -1334,19 +1328,12 @@ class DestinyHub(QMainWindow):
         try:
             self.logger.info("=== Actualisation des données du personnage ===")
             
-            # Charger les données du compte
-            if not os.path.exists('data/account.json'):
+            # Compte partagé, chargé une seule fois
+            player_info = account_session.player_info
+            if player_info is None:
                 QMessageBox.warning(self, "Erreur", "Veuillez d'abord enregistrer votre compte")
                 return
 
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-                
-            if not account_data.get('Response'):
-                QMessageBox.warning(self, "Erreur", "Données de compte invalides")
-                return
-            
-            player_info = account_data['Response'][0]
             membership_id = player_info['membershipId']
             membership_type = player_info['membershipType']
             
@@ -1363,9 +1350,8 @@ class DestinyHub(QMainWindow):
             )
             
             if character_response.status_code == 200:
-                # Sauvegarder les nouvelles données
-                with open('data/full_account.json', 'w') as f:
-                    json.dump(character_response.json()['Response'], f, indent=4)
+                # Sauvegarder les nouvelles données (écriture atomique en arrière-plan)
+                snapshot_writer.submit('data/full_account.json', character_response.json()['Response'])
                 
                 # Recharger l'équipement
                 self.load_active_character()
@@ -1485,14 +1471,12 @@ class DestinyHub(QMainWindow):
             
             # Récupérer la lumière du personnage actuel
             character_id = self.character_selector.currentData()
-            if not os.path.exists('data/account.json'):
+            # Compte partagé, chargé une seule fois
+            player_info = account_session.player_info
+            if player_info is None:
                 self.logger.error("❌ Aucun compte trouvé dans data/account.json")
                 return
 
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-                
-            player_info = account_data['Response'][0]
             membership_id = player_info['membershipId']
             membership_type = player_info['membershipType']
             
@@ -1654,11 +1638,7 @@ class DestinyHub(QMainWindow):
                 response_data = response.json()
                 if response_data.get('Response'):
                     # Sauvegarder les données
-                    if not os.path.exists('data'):
-                        os.makedirs('data')
-                    
-                    with open('data/account.json', 'w') as f:
-                        json.dump(response_data, f, indent=4)
+                    account_session.save(response_data)
                     self.logger.info("Données du compte sauvegardées")
                     
                     # Mettre à jour l'interface
@@ -1847,8 +1827,7 @@ class DestinyHub(QMainWindow):
                 
                 # Charger les données complètes si disponibles
                 if os.path.exists('data/full_account.json'):
-                    with open('data/full_account.json', 'r') as f:
-                        full_data = json.load(f)
+                    full_data = read_snapshot('data/full_account.json')
                     self.display_profile_info(full_data)
                     
                 self.logger.info("Compte chargé avec succès")
@@ -1879,19 +1858,12 @@ class DestinyHub(QMainWindow):
         try:
             self.logger.info("=== Début du chargement du personnage actif ===")
             
-            # Charger les données du compte depuis le fichier local
-            if not os.path.exists('data/account.json'):
+            # Compte partagé, chargé une seule fois
+            player_info = account_session.player_info
+            if player_info is None:
                 self.logger.error("❌ Aucun compte trouvé dans data/account.json")
                 return
 
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-                
-            if not account_data.get('Response'):
-                self.logger.error("❌ Données de compte invalides")
-                return
-            
-            player_info = account_data['Response'][0]
             membership_id = player_info['membershipId']
             membership_type = player_info['membershipType']
             
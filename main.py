@@ -1,22 +1,90 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import DestinyHub
-from utils.logger import setup_logging
-from utils.config import create_directories
+import argparse
+import time
+from utils.profiler import startup_profiler
+
+def parse_arguments():
+    """Analyse les options de lancement (les arguments Qt sont conservés)."""
+    parser = argparse.ArgumentParser(description="Destiny 2 Hub")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Affiche la chronologie du démarrage")
+    parser.add_argument('--startup-trace', metavar='FICHIER',
+                        help="Écrit la chronologie du démarrage au format Chrome trace")
+    parser.add_argument('--startup-budget', type=float, metavar='MS',
+                        help="Échoue (code 1) si le démarrage dépasse ce budget")
+    parser.add_argument('--exit-after-startup', action='store_true',
+                        help="Quitte dès que la fenêtre est affichée (benchmark)")
+    parser.add_argument('--network-timeout', type=float, default=15.0, metavar='S',
+                        help="Attente maximale du premier appel réseau avant le rapport (défaut : 15 s)")
+    return parser.parse_known_args()
+
+def wait_first_network(args, app, timer):
+    """Le premier appel réseau part d'un QThread après la fenêtre : le rapport l'attend
+    (hook réseau conservé) jusqu'à sa fin ou jusqu'au délai maximal."""
+    startup_profiler.mark('event_loop')
+    deadline = time.perf_counter() + args.network_timeout
+
+    def poll():
+        if startup_profiler.first_network is None and time.perf_counter() < deadline:
+            return
+        timer.stop()
+        finish_startup_profile(args, app)
+
+    timer.timeout.connect(poll)
+    timer.start(50)
+
+def finish_startup_profile(args, app):
+    """Émet le rapport de démarrage et applique le budget éventuel."""
+    print(startup_profiler.report())
+    if args.startup_trace:
+        startup_profiler.write_chrome_trace(args.startup_trace)
+    startup_profiler.disable()
+    if args.startup_budget is not None and not startup_profiler.check_budget(args.startup_budget):
+        app.exit(1)
+    elif args.exit_after_startup:
+        app.exit(0)
 
 def main():
+    args, qt_args = parse_arguments()
+    profiling = args.profile_startup or args.startup_trace or args.startup_budget is not None
+    if profiling:
+        startup_profiler.enable()
+
+    # Imports lourds après l'activation du profileur pour mesurer leur coût
+    with startup_profiler.span('imports'):
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+        from ui.main_window import DestinyHub
+        from utils.logger import setup_logging
+        from utils.config import create_directories
+        from utils.local_store import local_store
+    startup_profiler.mark('imports_done')
+
     # Configurer le logging
-    setup_logging()
-    
+    with startup_profiler.span('setup_logging'):
+        setup_logging()
+
     # Créer les répertoires nécessaires
     create_directories()
-    
+
+    # Importer les anciens fichiers JSON dans le stockage local (première exécution)
+    with startup_profiler.span('local_store'):
+        local_store.import_legacy_files()
+
     # Lancer l'application
-    app = QApplication(sys.argv)
-    window = DestinyHub()
+    app = QApplication([sys.argv[0]] + qt_args)
+    startup_profiler.mark('qapplication')
+    with startup_profiler.span('DestinyHub'):
+        window = DestinyHub()
     window.show()
+    startup_profiler.mark('window_shown')
+    if profiling:
+        network_timer = QTimer()
+        QTimer.singleShot(0, lambda: wait_first_network(args, app, network_timer))
+    elif args.exit_after_startup:
+        QTimer.singleShot(0, app.quit)
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
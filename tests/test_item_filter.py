@@ -0,0 +1,26 @@
+import pytest
+from api.item_filter import compile_filter, FilterSyntaxError, Not, Or
+
+@pytest.mark.parametrize('query', [
+    'not', 'ace not', '(not', 'ace or not',   # 'not' en fin de saisie
+    '-', 'ace -', '-(', '-()',                # négation sans terme
+    '"', '"abc', 'ace "not forg',             # guillemet non fermé
+    '()', '(ace', 'ace)', 'ace or', 'or ace',
+])
+def test_incomplete_queries_raise_syntax_error(query):
+    with pytest.raises(FilterSyntaxError):
+        compile_filter(query)
+
+@pytest.mark.parametrize('query', [
+    'n', 'no', 'not forgotten', '"not forgotten"', 'not ace', '-ace',
+    'ace or -is:weapon', '(ace or "not forgotten") power:>=1800',
+])
+def test_valid_queries_compile(query):
+    assert compile_filter(query) is not None
+
+def test_empty_query_compiles_to_none():
+    assert compile_filter('   ') is None
+
+def test_negated_group_compiles_to_not():
+    root = compile_filter('-(is:weapon or is:armor)').root
+    assert isinstance(root, Not) and isinstance(root.child, Or)
@@ -0,0 +1,35 @@
+import json
+from api.profile_container import ProfileContainer
+
+def _container(document):
+    return ProfileContainer.from_bytes(json.dumps(document, separators=(',', ':')).encode())
+
+def test_components_are_split_lazily():
+    container = _container({'Response': {'profile': {'data': {'a': 1}}, 'characters': {'data': {'1': {}}}},
+                            'ErrorCode': 1})
+    assert 'characters' in container
+    assert not container.is_parsed('characters')
+    assert container['profile'] == {'data': {'a': 1}}
+    assert container.is_parsed('profile') and not container.is_parsed('characters')
+
+def test_braces_inside_strings_do_not_break_the_split():
+    # Accolades équilibrées globalement mais réparties dans des chaînes : ignorées par le comptage
+    document = {'profile': {'name': 'a{b'}, 'characters': {'name': 'c}d'}}
+    container = _container(document)
+    assert 'characters' in container
+    assert container.get('characters') == {'name': 'c}d'}
+    assert not container.is_parsed('profile')
+    assert container.get('profile') == {'name': 'a{b'}
+
+def test_escaped_quotes_and_unbalanced_brackets_in_strings():
+    document = {'Response': {'profile': {'x': '[[\\"', 'y': '"}'}, 'characters': {'y': ']]\\'}}}
+    container = _container(document)
+    assert container.get('characters') == {'y': ']]\\'}
+    assert not container.is_parsed('profile')
+    assert container.to_dict() == document['Response']
+
+def test_missing_component_returns_default_without_parsing():
+    container = _container({'Response': {'characters': {'data': {}}, 'profile': {'data': {}}}})
+    assert 'profileInventory' not in container
+    assert container.get('profileInventory', {}) == {}
+    assert not container.is_parsed('characters') and not container.is_parsed('profile')
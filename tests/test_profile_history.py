@@ -0,0 +1,36 @@
+import copy
+from utils.profile_history import flatten_profile, unflatten_profile, compute_delta, apply_delta
+
+def _item(item_hash, instance_id=None, **extra):
+    item = {'itemHash': item_hash, 'bucketHash': 138197802, **extra}
+    if instance_id:
+        item['itemInstanceId'] = instance_id
+    return item
+
+PROFILE = {
+    'profileInventory': {'data': {'items': [_item(1, '100'), _item(2, '101'), _item(7), _item(7, quantity=3)]}},
+    'characterInventories': {'data': {'2305': {'items': [_item(3, '102')]}}},
+    'characters': {'data': {'2305': {'light': 1810, 'emblemColor': [1, 2, 3]}}},
+    'profile': {'data': {'characterIds': ['2305']}},
+    'responseMintedTimestamp': '2026-10-19T10:00:00Z',
+}
+
+def test_round_trip_keeps_item_order_and_plain_lists():
+    assert unflatten_profile(flatten_profile(PROFILE)) == PROFILE
+
+def test_changed_item_only_rewrites_that_item():
+    current = copy.deepcopy(PROFILE)
+    current['profileInventory']['data']['items'][1]['state'] = 1
+    delta = compute_delta(flatten_profile(PROFILE), flatten_profile(current))
+    assert len(delta['set']) == 1 and not delta['del']
+    assert '"itemInstanceId":"101"' in next(iter(delta['set'].values()))
+
+def test_added_and_removed_items_update_order():
+    current = copy.deepcopy(PROFILE)
+    items = current['profileInventory']['data']['items']
+    del items[0]
+    items.insert(1, _item(5, '103'))
+    previous = flatten_profile(PROFILE)
+    delta = compute_delta(previous, flatten_profile(current))
+    assert len(delta['del']) == 1 and len(delta['set']) == 2
+    assert unflatten_profile(apply_delta(previous, delta)) == current
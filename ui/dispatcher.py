@@ -0,0 +1,19 @@
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+class GuiDispatcher(QObject):
+    """Exécute des fonctions sur le thread qui a créé le dispatcher (le thread GUI).
+
+    Appelable depuis n'importe quel thread : la fonction passe par une
+    connexion en file d'attente et s'exécute dans la boucle d'événements.
+    """
+    invoke = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.invoke.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+    def _run(self, function):
+        function()
+
+    def __call__(self, function):
+        self.invoke.emit(function)
@@ -7,7 +7,13 @@ from ui.pages.account_page import AccountPage
 from ui.pages.equipment_page import EquipmentPage
 from ui.pages.missions_page import MissionsPage
 from ui.pages.meta_page import MetaPage
+from ui.pages.inventory_page import InventoryPage
+from ui.pages.stats_page import StatsPage
+from ui.pages.clan_page import ClanPage
 from ui.styles import setup_dark_theme, GLOBAL_STYLE
+from ui.dispatcher import GuiDispatcher
+from api.account_session import account_session
+from utils.profiler import startup_profiler
 import logging
 import os
 
@@ -19,6 +25,11 @@ class DestinyHub(QMainWindow):
         self.setWindowTitle("Destiny 2 Hub")
         self.setMinimumSize(1000, 600)
         self.meta_page = None  # Ajouté : page meta non créée au départ
+        self.stats_page = None  # Page statistiques créée à la première ouverture
+        self.clan_page = None
+        # Changements de compte détectés par un thread de travail : abonnés notifiés sur le thread GUI
+        self.dispatcher = GuiDispatcher(self)
+        account_session.set_dispatcher(self.dispatcher)
         
         try:
             self.setup_ui()
@@ -89,7 +100,10 @@ class DestinyHub(QMainWindow):
             ("Compte", "icons/account.png"),
             ("Équipement", "icons/equipment.png"),
             ("Missions", "icons/missions.png"),
-            ("Meta", "icons/meta.png")
+            ("Meta", "icons/meta.png"),
+            ("Inventaire", "icons/inventory.png"),
+            ("Stats", "icons/stats.png"),
+            ("Clan", "icons/clan.png")
         ]):
             btn = QPushButton(text)
             btn.setCheckable(True)
@@ -126,19 +140,32 @@ class DestinyHub(QMainWindow):
             
             # Créer les pages
             logging.debug("Création des pages...")
-            self.account_page = AccountPage(self)
+            with startup_profiler.span('page:AccountPage'):
+                self.account_page = AccountPage(self)
             logging.debug("✓ Page compte créée")
             
-            self.equipment_page = EquipmentPage(self)
+            with startup_profiler.span('page:EquipmentPage'):
+                self.equipment_page = EquipmentPage(self)
             logging.debug("✓ Page équipement créée")
             
-            self.missions_page = MissionsPage(self)
+            with startup_profiler.span('page:MissionsPage'):
+                self.missions_page = MissionsPage(self)
             logging.debug("✓ Page missions créée")
             
+            with startup_profiler.span('page:InventoryPage'):
+                self.inventory_page = InventoryPage(self)
+                # L'inventaire suit les profils chargés par la page équipement
+                self.equipment_page.profile_loaded.connect(self.inventory_page.set_profile)
+                self.equipment_page.wishlist_changed.connect(self.inventory_page.on_wishlist_changed)
+                if self.equipment_page.profile_snapshot:
+                    self.inventory_page.set_profile(self.equipment_page.profile_snapshot)
+            logging.debug("✓ Page inventaire créée")
+            
             # Ajouter les pages
             self.stacked_widget.addWidget(self.account_page)
             self.stacked_widget.addWidget(self.equipment_page)
             self.stacked_widget.addWidget(self.missions_page)
+            self.stacked_widget.addWidget(self.inventory_page)
             
             # Sélectionner la première page par défaut
             self.nav_buttons[0].setChecked(True)
@@ -187,9 +214,24 @@ class DestinyHub(QMainWindow):
             # Si on clique sur l'onglet Meta (dernier index)
             if index == 3:
                 if self.meta_page is None:
-                    self.meta_page = MetaPage(self)
+                    with startup_profiler.span('page:MetaPage'):
+                        self.meta_page = MetaPage(self)
                     self.stacked_widget.addWidget(self.meta_page)
                 self.stacked_widget.setCurrentWidget(self.meta_page)
+            elif index == 4:
+                self.stacked_widget.setCurrentWidget(self.inventory_page)
+            elif index == 5:
+                if self.stats_page is None:
+                    with startup_profiler.span('page:StatsPage'):
+                        self.stats_page = StatsPage(self)
+                    self.stacked_widget.addWidget(self.stats_page)
+                self.stacked_widget.setCurrentWidget(self.stats_page)
+            elif index == 6:
+                if self.clan_page is None:
+                    with startup_profiler.span('page:ClanPage'):
+                        self.clan_page = ClanPage(self)
+                    self.stacked_widget.addWidget(self.clan_page)
+                self.stacked_widget.setCurrentWidget(self.clan_page)
             else:
                 self.stacked_widget.setCurrentIndex(index)
             for i, btn in enumerate(self.nav_buttons):
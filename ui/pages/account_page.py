@@ -2,10 +2,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QLabel,
                            QLineEdit, QPushButton, QTextEdit, QMessageBox)
 from PyQt6.QtCore import Qt
 import logging
-import json
 import requests
-import os
 from api.bungie_client import BungieClient
+from api.account_session import account_session
 from utils.config import OAUTH_CONFIG
 
 class AccountPage(QWidget):
@@ -124,12 +123,8 @@ class AccountPage(QWidget):
             if response.status_code == 200:
                 response_data = response.json()
                 if response_data.get('Response'):
-                    # Sauvegarder les données
-                    if not os.path.exists('data'):
-                        os.makedirs('data')
-                    
-                    with open('data/account.json', 'w') as f:
-                        json.dump(response_data, f, indent=4)
+                    # Sauvegarder les données (partagées avec les autres pages)
+                    account_session.save(response_data)
                     self.logger.info("Données du compte sauvegardées")
                     
                     # Mettre à jour l'interface
@@ -163,8 +158,7 @@ class AccountPage(QWidget):
     def save_account_data(self, data):
         """Sauvegarde les données du compte."""
         try:
-            with open('data/account.json', 'w') as f:
-                json.dump(data, f, indent=4)
+            account_session.save(data)
             logging.info("Données du compte sauvegardées")
         except Exception as e:
             logging.error(f"Erreur lors de la sauvegarde des données: {str(e)}")
@@ -173,13 +167,11 @@ class AccountPage(QWidget):
     def load_saved_account(self):
         """Charge les informations du compte sauvegardé."""
         try:
-            if os.path.exists('data/account.json'):
-                with open('data/account.json', 'r') as f:
-                    data = json.load(f)
-                if data.get('Response'):
-                    self.update_account_status("Compte connecté", True)
-                    self.display_account_info(data['Response'][0])
-                    return True
+            player_info = account_session.player_info
+            if player_info:
+                self.update_account_status("Compte connecté", True)
+                self.display_account_info(player_info)
+                return True
         except Exception as e:
             logging.error(f"Erreur lors du chargement du compte: {str(e)}")
         return False
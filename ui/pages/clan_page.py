@@ -0,0 +1,155 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox, QAbstractItemView)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+import logging
+from api.clan_roster import clan_roster
+from utils.local_store import local_store
+
+CLAN_DOCUMENT = 'clan_group_id'
+
+class RosterSyncThread(QThread):
+    """Synchronise le roster et les profils du clan, puis calcule les vues agrégées."""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(str)
+
+    def __init__(self, group_id, sync=True, parent=None):
+        super().__init__(parent)
+        self.group_id = group_id
+        self.sync = sync
+
+    def run(self):
+        try:
+            report = clan_roster.sync(self.group_id, progress=self.progress.emit) if self.sync else None
+            self.finished.emit((report, clan_roster.roster(self.group_id), clan_roster.weapon_holders(self.group_id)))
+        except Exception as e:
+            logging.error(f"Erreur de synchronisation du clan: {str(e)}")
+            self.error.emit(str(e))
+
+def _table(headers):
+    table = QTableWidget(0, len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.verticalHeader().setVisible(False)
+    table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    return table
+
+def _number_item(value):
+    item = QTableWidgetItem()
+    item.setData(Qt.ItemDataRole.DisplayRole, value if value is not None else 0)
+    return item
+
+class ClanPage(QWidget):
+    """Roster d'un clan : puissance des membres et détenteurs de chaque arme."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sync_thread = None
+        self.weapons = []
+        self.setup_ui()
+        group_id = local_store.get_document(CLAN_DOCUMENT)
+        if group_id:
+            self.group_input.setText(str(group_id))
+            self.load(sync=False)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        title = QLabel("Clan")
+        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #4d7aff; padding: 10px;")
+        header.addWidget(title)
+
+        self.group_input = QLineEdit()
+        self.group_input.setPlaceholderText("Identifiant du clan (groupId)")
+        self.group_input.setMaximumWidth(220)
+        self.group_input.returnPressed.connect(self.sync)
+        header.addWidget(self.group_input)
+
+        self.sync_button = QPushButton("Synchroniser le clan")
+        self.sync_button.clicked.connect(lambda: self.sync())  # clicked(checked) ne doit pas arriver en argument
+        header.addWidget(self.sync_button)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #888; font-size: 12px;")
+        header.addWidget(self.status_label)
+        header.addStretch()
+        layout.addLayout(header)
+
+        content = QHBoxLayout()
+        roster_group = QGroupBox("Membres")
+        roster_layout = QVBoxLayout(roster_group)
+        self.roster_table = _table(["Membre", "Puissance", "Personnages", "En ligne"])
+        self.roster_table.setSortingEnabled(True)
+        roster_layout.addWidget(self.roster_table)
+        content.addWidget(roster_group, 1)
+
+        weapons_group = QGroupBox("Armes du clan")
+        weapons_layout = QVBoxLayout(weapons_group)
+        self.weapon_search = QLineEdit()
+        self.weapon_search.setPlaceholderText("Rechercher une arme...")
+        self.weapon_search.textChanged.connect(self.show_weapons)
+        weapons_layout.addWidget(self.weapon_search)
+        self.weapons_table = _table(["Arme", "Type", "Détenteurs", "Membres"])
+        self.weapons_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        weapons_layout.addWidget(self.weapons_table)
+        content.addWidget(weapons_group, 2)
+        layout.addLayout(content)
+
+    def sync(self):
+        """Synchronise le roster et les profils depuis l'API (bouton, Entrée)."""
+        self.load(sync=True)
+
+    def load(self, sync=False):
+        """Affiche le roster stocké ; avec `sync`, le met d'abord à jour depuis l'API."""
+        group_id = self.group_input.text().strip()
+        if not group_id.isdigit():
+            self.status_label.setText("Identifiant de clan invalide")
+            return
+        if self.sync_thread is not None and self.sync_thread.isRunning():
+            return
+        local_store.put_document(CLAN_DOCUMENT, group_id)
+        self.sync_button.setEnabled(False)
+        self.status_label.setText("Synchronisation du clan..." if sync else "")
+        self.sync_thread = RosterSyncThread(group_id, sync, self)
+        self.sync_thread.progress.connect(self.status_label.setText)
+        self.sync_thread.finished.connect(self.on_loaded)
+        self.sync_thread.error.connect(self.on_error)
+        self.sync_thread.start()
+
+    def on_loaded(self, result):
+        report, roster, weapons = result
+        self.sync_button.setEnabled(True)
+        if report is not None:
+            self.status_label.setText(f"{report.profiles}/{report.members} profil(s) en {report.elapsed:.0f} s"
+                                      + (f", {report.errors} erreur(s)" if report.errors else ""))
+        self.show_roster(roster)
+        self.weapons = weapons
+        self.show_weapons()
+
+    def on_error(self, message):
+        self.sync_button.setEnabled(True)
+        self.status_label.setText(f"Erreur : {message}")
+
+    def show_roster(self, roster):
+        self.roster_table.setSortingEnabled(False)
+        self.roster_table.setRowCount(len(roster))
+        for row, member in enumerate(roster):
+            self.roster_table.setItem(row, 0, QTableWidgetItem(member['display_name'] or member['membership_id']))
+            self.roster_table.setItem(row, 1, _number_item(member['power']))
+            self.roster_table.setItem(row, 2, _number_item(member['characters']))
+            self.roster_table.setItem(row, 3, QTableWidgetItem("Oui" if member['is_online'] else ""))
+        self.roster_table.setSortingEnabled(True)
+
+    def show_weapons(self):
+        search = self.weapon_search.text().strip().lower()
+        weapons = [weapon for weapon in self.weapons if search in weapon['name'].lower()] if search else self.weapons
+        self.weapons_table.setRowCount(len(weapons))
+        for row, weapon in enumerate(weapons):
+            self.weapons_table.setItem(row, 0, QTableWidgetItem(weapon['name']))
+            self.weapons_table.setItem(row, 1, QTableWidgetItem(weapon['type']))
+            self.weapons_table.setItem(row, 2, _number_item(len(weapon['holders'])))
+            holders = ", ".join(f"{name} ({power})" if power else name for name, power in weapon['holders'])
+            item = QTableWidgetItem(holders)
+            item.setToolTip(holders)
+            self.weapons_table.setItem(row, 3, item)
@@ -1,16 +1,120 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QComboBox, QPushButton, QGroupBox, QMessageBox, QDialog, QFrame,
-                           QApplication, QProgressBar, QStackedLayout, QGridLayout)
-from PyQt6.QtCore import Qt, QTimer, QSize
+                           QApplication, QProgressBar, QStackedLayout, QGridLayout, QFileDialog)
+from PyQt6.QtCore import Qt, QTimer, QSize, QThread, pyqtSignal
 from PyQt6.QtGui import QPixmap, QIcon, QMovie
 import logging
 import os
-import json
 import requests
+from datetime import datetime, timezone
 from functools import partial
-from utils.config import OAUTH_CONFIG, BUCKET_TYPES
+from utils.config import OAUTH_CONFIG, BUCKET_TYPES, SNAPSHOT_COMPRESSION, PROFILE_COMPONENTS, PROFILE_SNAPSHOT_PATH
+from api.manifest import manifest
+from api.account_session import account_session
+from api.profile_container import ProfileContainer
+from api.models import (ItemDefinitionRef, characters_from_profile, items_from_component,
+                        inventory_from_profile, private_components_missing, WEAPON_BUCKETS, ARMOR_BUCKETS)
+from api.bungie_client import bungie_client, BungieAPIError
+from api.oauth_handler import oauth_manager
+from api.max_power import MaxPowerCalculator
+from api.wishlist import wishlist
+from ui.pages.optimizer_dialog import LoadoutOptimizerDialog
+from ui.pages.inventory_page import DefinitionResolver, icon_path
+from api.profile_diff import diff_equipment, character_equipment, ITEM_EQUIPPED, ITEM_LIGHT, ITEM_STATS
+from utils.local_store import local_store
+from utils.profile_history import profile_history
+from utils.snapshot import snapshot_writer
 from urllib.parse import urlparse, parse_qs
 
+SNAPSHOT_PATH = PROFILE_SNAPSHOT_PATH
+
+class ProfileRefreshThread(QThread):
+    """Récupère le profil en arrière-plan et persiste le snapshot."""
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, membership_type, membership_id, parent=None):
+        super().__init__(parent)
+        self.membership_type = membership_type
+        self.membership_id = membership_id
+
+    def fetch(self, access_token):
+        """Profil via le client partagé (session et limiteur de débit) ; lève BungieAPIError."""
+        return bungie_client.get_profile(self.membership_type, self.membership_id, PROFILE_COMPONENTS, access_token)
+
+    def fetch_authorized(self):
+        access_token = oauth_manager.valid_access_token()
+        try:
+            return self.fetch(access_token)
+        except BungieAPIError as e:
+            if e.status != 401 or not access_token:
+                raise
+        if oauth_manager.refresh():
+            # Jeton révoqué avant son expiration : un renouvellement puis un seul nouvel essai
+            try:
+                return self.fetch(oauth_manager.access_token)
+            except BungieAPIError as e:
+                if e.status != 401:
+                    raise
+        # Jeton refusé : les composants publics restent disponibles
+        return self.fetch(None)
+
+    def run(self):
+        try:
+            response = self.fetch_authorized()
+            if not response or 'characters' not in response:
+                self.error.emit("Structure de données inattendue dans la réponse")
+                return
+            data = {'Response': response, 'ErrorCode': 1}
+            if private_components_missing(data['Response']):
+                logging.warning("Aucun jeton OAuth valide : coffre et inventaires indisponibles")
+
+            # Sauvegarder les données complètes (écriture atomique en arrière-plan)
+            snapshot_writer.submit(SNAPSHOT_PATH, data, SNAPSHOT_COMPRESSION)
+            self.finished.emit(data)
+
+            # Stockage local : seules les lignes modifiées sont réécrites
+            local_store.upsert_profile(self.membership_type, self.membership_id, data['Response'])
+            # Historique : image complète périodique puis deltas
+            profile_history.record(self.membership_id, data['Response'])
+        except Exception as e:
+            logging.error(f"Erreur lors de l'actualisation du profil: {str(e)}")
+            self.error.emit(str(e))
+
+class WishlistThread(QThread):
+    """Indexe la wishlist (chargement initial ou import d'un fichier DIM) hors du thread GUI."""
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, source=None, parent=None):
+        super().__init__(parent)
+        self.source = source
+
+    def run(self):
+        try:
+            if self.source:
+                self.finished.emit(wishlist.import_file(self.source))
+            else:
+                wishlist.ensure_loaded()
+                self.finished.emit(len(wishlist))
+        except OSError as e:
+            logging.error(f"Erreur lors du chargement de la wishlist: {str(e)}")
+            self.error.emit(str(e))
+
+class PowerDefinitionsThread(QThread):
+    """Résout hors du thread GUI les définitions absentes du cache, pour la puissance maximale."""
+    resolved = pyqtSignal(int)
+
+    def __init__(self, item_hashes, parent=None):
+        super().__init__(parent)
+        self.item_hashes = list(item_hashes)
+
+    def run(self):
+        try:
+            self.resolved.emit(len(manifest.get_item_definitions(self.item_hashes)))
+        except Exception as e:
+            logging.error(f"Erreur lors de la résolution des définitions: {str(e)}")
+
 class EquipmentSlot(QPushButton):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -37,18 +141,21 @@ class EquipmentSlot(QPushButton):
         """)
         self.setFlat(False)
         self.item = None
+        # Badge wishlist (coin supérieur droit)
+        self.wishlist_badge = QLabel(self)
+        self.wishlist_badge.setFixedSize(22, 22)
+        self.wishlist_badge.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.wishlist_badge.hide()
         self.clicked.connect(lambda: print("Clic sur le slot !"))  # Debug visuel
 
     def set_item(self, item):
         self.item = item
         if item:
             # Compose le texte du bouton (nom, lumière, etc.) SANS HTML
-            name = item.get('name', str(item.get('itemHash', '')))
-            light = item.get('light', '')
-            text = f"{light}\n{name}"
+            text = f"{item.light or ''}\n{item.name}"
             self.setText(text)
             # Ajoute l'icône à gauche
-            icon_path = f'icons/{item.get("itemHash")}.png'
+            icon_path = f'icons/{item.item_hash}.png'
             if os.path.exists(icon_path):
                 pixmap = QPixmap(icon_path)
                 self.setIcon(QIcon(pixmap))
@@ -56,8 +163,32 @@ class EquipmentSlot(QPushButton):
         else:
             self.setText("")
             self.setIcon(QIcon())
+        self.update_wishlist_badge()
+
+    def update_wishlist_badge(self):
+        """Affiche 👍 (roll de la wishlist) ou 👎 (roll à jeter) sur le slot."""
+        match = wishlist.match(self.item) if self.item else None
+        if match is None:
+            self.wishlist_badge.hide()
+            self.setToolTip("")
+            return
+        color = '#c0392b' if match.trash else '#27ae60'
+        self.wishlist_badge.setText("👎" if match.trash else "👍")
+        self.wishlist_badge.setStyleSheet(f"background: {color}; border-radius: 11px; font-size: 12px;")
+        self.setToolTip(match.notes or ("Roll à jeter" if match.trash else "Roll de la wishlist"))
+        self.wishlist_badge.show()
+        self.wishlist_badge.raise_()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.wishlist_badge.move(self.width() - self.wishlist_badge.width() - 6, 10)
 
 class EquipmentPage(QWidget):
+    # Réponse de profil appliquée (snapshot local ou actualisation réseau)
+    profile_loaded = pyqtSignal(object)
+    # Wishlist DIM (ré)importée
+    wishlist_changed = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.logger = logging.getLogger(__name__)
@@ -78,10 +209,27 @@ class EquipmentPage(QWidget):
         self.setup_ui(self.main_widget)
         self.stacked_layout.addWidget(self.main_widget)
         self.init_loading_bar()
+        self.profile_snapshot = None
+        self.displayed_items = {}  # slot -> ItemInstance affiché
+        self.slot_resolver = None
+        self.pending_slot_hashes = set()  # Définitions ou icônes manquantes des slots affichés
+        self.max_power = MaxPowerCalculator()
+        self.power_definitions_thread = None
+        self.requested_power_hashes = set()  # Définitions déjà demandées : pas de nouvel essai
+        self.unresolved_power_items = (None, [])  # (profil, items sans définition en cache)
+        # Wishlist indexée en arrière-plan : les badges apparaissent à la fin de l'indexation
+        self.wishlist_thread = WishlistThread(parent=self)
+        self.wishlist_thread.finished.connect(self.on_wishlist_loaded)
+        self.wishlist_thread.start()
+        self.refresh_thread = None
+        self.membership_id = account_session.membership_id
+        account_session.add_listener(self.on_account_changed)
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_character_data)
         self.refresh_timer.start(300000)
-        self.load_characters()
+        # Affichage immédiat depuis le dernier snapshot, puis revalidation en arrière-plan
+        self.load_cached_snapshot()
+        self.refresh_character_data()
 
     def init_loading_bar(self):
         self.loading_bar = QProgressBar(self)
@@ -95,7 +243,7 @@ class EquipmentPage(QWidget):
         layout = QVBoxLayout(parent_widget)
 
         # Si aucun compte n'est enregistré, afficher un message d'aide
-        if not os.path.exists('data/account.json'):
+        if not account_session.is_registered:
             empty_label = QLabel("Aucun compte Destiny 2 enregistré.\nEnregistrez un compte dans l'onglet Compte.")
             empty_label.setStyleSheet("color: #ff4444; font-size: 18px;")
             empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -112,6 +260,18 @@ class EquipmentPage(QWidget):
         refresh_button = QPushButton("Actualiser")
         refresh_button.clicked.connect(self.refresh_character_data)
         header_layout.addWidget(refresh_button)
+
+        optimizer_button = QPushButton("Optimiser l'armure")
+        optimizer_button.clicked.connect(self.open_loadout_optimizer)
+        header_layout.addWidget(optimizer_button)
+
+        wishlist_button = QPushButton("Importer une wishlist")
+        wishlist_button.clicked.connect(self.import_wishlist)
+        header_layout.addWidget(wishlist_button)
+
+        self.last_updated_label = QLabel("Jamais mis à jour")
+        self.last_updated_label.setStyleSheet("color: #888; font-size: 12px;")
+        header_layout.addWidget(self.last_updated_label)
         
         layout.addLayout(header_layout)
         
@@ -148,6 +308,12 @@ class EquipmentPage(QWidget):
             }
         """)
         character_layout.addWidget(self.character_light)
+
+        # Puissance maximale atteignable (tout le compte, une exotique par groupe)
+        self.max_power_label = QLabel("")
+        self.max_power_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.max_power_label.setStyleSheet("color: #ffd700; font-size: 14px;")
+        character_layout.addWidget(self.max_power_label)
         
         character_group.setLayout(character_layout)
         equipment_layout.addWidget(character_group)
@@ -183,73 +349,212 @@ class EquipmentPage(QWidget):
         return slots
 
     def load_characters(self):
-        """Charge la liste des personnages disponibles."""
+        """Lance l'actualisation des personnages en arrière-plan."""
         try:
             self.logger.info("=== Chargement des personnages ===")
             
-            if not os.path.exists('data/account.json'):
-                self.logger.error("❌ Fichier account.json non trouvé")
+            if not account_session.is_registered:
+                self.logger.error("❌ Aucun compte enregistré")
+                return
+
+            if self.refresh_thread is not None and self.refresh_thread.isRunning():
+                self.logger.debug("Actualisation déjà en cours")
                 return
             
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-            
-            player_info = account_data['Response'][0]
-            membership_id = player_info['membershipId']
-            membership_type = player_info['membershipType']
-            
-            headers = {
-                'X-API-Key': OAUTH_CONFIG['api_key']
-            }
-            
-            profile_url = f'https://www.bungie.net/Platform/Destiny2/{membership_type}/Profile/{membership_id}/'
-            
-            response = requests.get(
-                profile_url,
-                headers=headers,
-                params={'components': '200,205'}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'Response' in data and 'characters' in data['Response']:
-                    characters = data['Response']['characters']['data']
-                    
-                    # Sauvegarder les données complètes
-                    with open('data/full_account.json', 'w') as f:
-                        json.dump(data, f, indent=4)
-                    
-                    # Mettre à jour le sélecteur de personnage
-                    self.character_selector.clear()
-                    for char_id, char_data in characters.items():
-                        class_type = self.get_class_type(char_data['classType'])
-                        light_level = char_data['light']
-                        self.character_selector.addItem(f"{class_type} - {light_level}", char_id)
-                
-                # Charger le premier personnage
-                if self.character_selector.count() > 0:
-                    self.load_character_equipment(self.character_selector.currentData())
-                
-            else:
-                self.logger.error(f"Erreur API: {response.status_code}")
+            membership_type, membership_id = account_session.membership()
+
+            self.last_updated_label.setText(self.last_updated_label.text().split(' · ')[0] + " · actualisation...")
+            self.refresh_thread = ProfileRefreshThread(membership_type, membership_id, self)
+            self.refresh_thread.finished.connect(lambda data: self.apply_profile(data, stale=False))
+            self.refresh_thread.error.connect(self.on_refresh_error)
+            self.refresh_thread.start()
                 
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement des personnages: {str(e)}")
             self.logger.exception("Détails de l'erreur:")
 
+    def on_account_changed(self, session):
+        """Recharge les personnages si le compte enregistré a changé."""
+        if session.membership_id == self.membership_id:
+            return
+        self.logger.info("Changement de compte détecté")
+        self.membership_id = session.membership_id
+        self.profile_snapshot = None
+        if hasattr(self, 'character_selector'):
+            QTimer.singleShot(0, self.refresh_character_data)
+
+    def load_cached_snapshot(self):
+        """Affiche immédiatement les personnages depuis le dernier snapshot persisté."""
+        if not hasattr(self, 'character_selector') or not os.path.exists(SNAPSHOT_PATH):
+            return False
+        try:
+            # Seuls les composants utiles à la page sont décodés
+            profile = ProfileContainer.from_file(SNAPSHOT_PATH)
+            if 'characters' not in profile:
+                return False
+            self.logger.info("Affichage depuis le snapshot local")
+            self.apply_profile({'Response': profile}, stale=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la lecture du snapshot: {str(e)}")
+            return False
+
+    def apply_profile(self, data, stale=False):
+        """Applique un profil en ne mettant à jour que ce qui a changé."""
+        try:
+            response = data['Response']
+            self.profile_snapshot = response
+
+            # Sélecteur de personnage : libellés modifiés seulement
+            entries = [(character.character_id, f"{character.class_name} - {character.light}")
+                       for character in characters_from_profile(response)]
+            current_ids = [self.character_selector.itemData(i) for i in range(self.character_selector.count())]
+            if current_ids == [char_id for char_id, _ in entries]:
+                for index, (char_id, label) in enumerate(entries):
+                    if self.character_selector.itemText(index) != label:
+                        self.character_selector.setItemText(index, label)
+            else:
+                selected = self.character_selector.currentData()
+                self.character_selector.blockSignals(True)
+                self.character_selector.clear()
+                for char_id, label in entries:
+                    self.character_selector.addItem(label, char_id)
+                index = self.character_selector.findData(selected)
+                self.character_selector.setCurrentIndex(index if index >= 0 else 0)
+                self.character_selector.blockSignals(False)
+
+            if self.character_selector.count() > 0:
+                self.show_character_from_snapshot(self.character_selector.currentData())
+            self.update_last_updated(response, stale)
+            self.profile_loaded.emit(response)
+            # Inventaire complet : après le premier affichage
+            QTimer.singleShot(0, self.update_max_power)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'application du profil: {str(e)}")
+            self.logger.exception("Détails de l'erreur:")
+
+    def show_character_from_snapshot(self, character_id):
+        """Affiche l'équipement d'un personnage depuis le snapshot, si quelque chose a changé."""
+        response = self.profile_snapshot
+        if not response or character_id not in response.get('characterEquipment', {}).get('data', {}):
+            return False
+        self.current_official_light = response['characters']['data'].get(character_id, {}).get('light', 0)
+        self.display_equipment(character_equipment(response, character_id), character_id)
+        self.show_max_power(character_id)
+        return True
+
+    def update_max_power(self):
+        """Met à jour la puissance maximale depuis l'inventaire complet du dernier profil."""
+        response = self.profile_snapshot
+        if not response:
+            return
+        try:
+            items = inventory_from_profile(response)
+            for item in items:
+                item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+            if self.max_power.update(items):
+                self.show_max_power(self.character_selector.currentData())
+            # Définitions hors cache : résolues en arrière-plan, puis ajoutées sans recalcul complet
+            self.unresolved_power_items = (response, [item for item in items if item.definition is None and item.light])
+            self.resolve_power_definitions()
+        except Exception as e:
+            self.logger.error(f"Erreur lors du calcul de la puissance maximale: {str(e)}")
+
+    def on_power_definitions_resolved(self):
+        response, items = self.unresolved_power_items
+        if response is not self.profile_snapshot:
+            self.update_max_power()
+            return
+        for item in items:
+            item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+        self.unresolved_power_items = (response, [item for item in items if item.definition is None])
+        if self.max_power.add_items([item for item in items if item.definition is not None]):
+            self.show_max_power(self.character_selector.currentData())
+
+    def resolve_power_definitions(self):
+        item_hashes = {item.item_hash for item in self.unresolved_power_items[1]} - self.requested_power_hashes
+        if not item_hashes or (self.power_definitions_thread is not None
+                               and self.power_definitions_thread.isRunning()):
+            return
+        self.requested_power_hashes |= item_hashes
+        self.power_definitions_thread = PowerDefinitionsThread(item_hashes, self)
+        self.power_definitions_thread.resolved.connect(lambda _: self.on_power_definitions_resolved())
+        # Items sans définition apparus pendant la résolution : lot suivant
+        self.power_definitions_thread.finished.connect(self.resolve_power_definitions)
+        self.power_definitions_thread.start()
+
+    def show_max_power(self, character_id):
+        response = self.profile_snapshot
+        character = response['characters']['data'].get(character_id) if response and character_id else None
+        result = self.max_power.calculate(character.get('classType', 3)) if character else None
+        text = f"Puissance max : {result.power} ({result.exact:.2f})" if result else ""
+        if self.max_power_label.text() != text:
+            self.max_power_label.setText(text)
+
+    def update_last_updated(self, response, stale):
+        """Met à jour l'indicateur de fraîcheur des données."""
+        try:
+            minted = datetime.fromisoformat(response['responseMintedTimestamp'].rstrip('Z').split('.')[0])
+            updated = minted.replace(tzinfo=timezone.utc).astimezone()
+        except (KeyError, ValueError):
+            updated = datetime.fromtimestamp(os.path.getmtime(SNAPSHOT_PATH)) if os.path.exists(SNAPSHOT_PATH) else None
+        text = f"Dernière mise à jour : {updated.strftime('%d/%m %H:%M')}" if updated else "Jamais mis à jour"
+        if stale:
+            text += " (cache)"
+        if private_components_missing(response):
+            # Profil public seulement : l'équipement porté est affiché, pas le coffre
+            text += " · connexion requise"
+            self.last_updated_label.setToolTip("Connexion Bungie requise (auth_tokens.json) : "
+                                               "le coffre et les inventaires ne sont pas accessibles")
+        else:
+            self.last_updated_label.setToolTip("")
+        self.last_updated_label.setText(text)
+
+    def open_loadout_optimizer(self):
+        """Ouvre l'optimiseur d'armure pour la classe du personnage sélectionné."""
+        character_id = self.character_selector.currentData()
+        if not self.profile_snapshot or character_id is None:
+            QMessageBox.information(self, "Optimiseur", "Aucun profil chargé pour l'instant.")
+            return
+        class_type = self.profile_snapshot['characters']['data'][character_id].get('classType', 3)
+        LoadoutOptimizerDialog(self.profile_snapshot, class_type, self).exec()
+
+    def import_wishlist(self):
+        """Importe une wishlist DIM puis met à jour les badges des slots."""
+        path, _ = QFileDialog.getOpenFileName(self, "Importer une wishlist DIM", "",
+                                              "Wishlist DIM (*.txt);;Tous les fichiers (*)")
+        if not path or self.wishlist_thread.isRunning():
+            return
+        self.wishlist_thread = WishlistThread(path, self)
+        self.wishlist_thread.finished.connect(self.on_wishlist_imported)
+        self.wishlist_thread.error.connect(
+            lambda message: QMessageBox.warning(self, "Wishlist", f"Import impossible : {message}"))
+        self.wishlist_thread.start()
+
+    def on_wishlist_loaded(self, count):
+        """Wishlist indexée : badges des slots repeints et pages dépendantes prévenues."""
+        for slot in self.weapon_slots + self.armor_slots:
+            slot.update_wishlist_badge()
+        self.wishlist_changed.emit()
+
+    def on_wishlist_imported(self, count):
+        self.on_wishlist_loaded(count)
+        QMessageBox.information(self, "Wishlist", f"{count} roll(s) importé(s){' : ' + wishlist.title if wishlist.title else ''}")
+
+    def on_refresh_error(self, message):
+        """Conserve l'affichage en cache si l'actualisation échoue."""
+        self.logger.error(f"Actualisation impossible: {message}")
+        self.last_updated_label.setText(self.last_updated_label.text().split(' · ')[0] + " · hors ligne")
+
     def load_character_equipment(self, character_id):
         """Charge l'équipement pour un personnage spécifique."""
         try:
             self.logger.info(f"=== Chargement de l'équipement pour le personnage {character_id} ===")
             # Charger les données du compte
-            if not os.path.exists('data/account.json'):
+            if not account_session.is_registered:
                 self.logger.error("❌ Données du compte non trouvées")
                 return
-            with open('data/account.json', 'r') as f:
-                account_data = json.load(f)
-            player_info = account_data['Response'][0]
-            membership_id = player_info['membershipId']
-            membership_type = player_info['membershipType']
+            membership_type, membership_id = account_session.membership()
             headers = {
                 'X-API-Key': OAUTH_CONFIG['api_key']
             }
@@ -263,22 +568,11 @@ class EquipmentPage(QWidget):
             if response.status_code == 200:
                 data = response.json()
                 if 'Response' in data:
-                    equipment = data['Response']['equipment']['data']['items']
-                    instances = data['Response']['itemComponents']['instances']['data']
-                    stats_data = data['Response']['itemComponents'].get('stats', {}).get('data', {})
-                    # Mettre à jour les niveaux de lumière et les stats réelles
-                    for item in equipment:
-                        instance_id = item.get('itemInstanceId')
-                        if instance_id and instance_id in instances:
-                            instance_data = instances[instance_id]
-                            item['light'] = instance_data.get('primaryStat', {}).get('value', 0)
-                        # Ajout : stats réelles de l'arme du joueur
-                        if instance_id and instance_id in stats_data:
-                            item['stats'] = {stat_hash: stat_obj['value'] for stat_hash, stat_obj in stats_data[instance_id]['stats'].items()}
-                        else:
-                            item['stats'] = {}
+                    # Items avec niveaux de lumière et stats réelles
+                    equipment = items_from_component(data['Response']['equipment']['data']['items'],
+                                                     data['Response']['itemComponents'], 'equipped', character_id)
                     # Mettre à jour l'affichage
-                    self.display_equipment(equipment)
+                    self.display_equipment(equipment, character_id)
                 else:
                     self.logger.error("Structure de données inattendue dans la réponse")
             elif response.status_code == 503:
@@ -290,58 +584,46 @@ class EquipmentPage(QWidget):
             self.logger.exception("Détails de l'erreur:")
             raise
 
-    def display_equipment(self, equipment):
-        """Affiche l'équipement dans l'interface."""
+    def display_equipment(self, equipment, character_id=None):
+        """Affiche l'équipement en ne redessinant que les slots et libellés modifiés."""
         try:
-            self.logger.info("=== Affichage de l'équipement ===")
-            
-            weapons = []
-            armor = []
-            power_values = []
+            events = diff_equipment(character_id, self.displayed_items, equipment)
+            self.logger.info(f"=== Affichage de l'équipement ({len(events)} changement(s)) ===")
+            slots = self.slot_widgets()
 
-            for item in equipment:
-                bucket_hash = str(item.get('bucketHash'))
-                bucket_type = self.get_bucket_type(bucket_hash)
-                
-                if bucket_type in ['kinetic', 'energy', 'power']:
-                    weapons.append(item)
-                elif bucket_type in ['helmet', 'gauntlets', 'chest', 'legs', 'class_item']:
-                    armor.append(item)
-                
-                # Ajout pour calculer la lumière réelle
-                if 'light' in item and item['light']:
-                    power_values.append(item['light'])
-            
-            # Mettre à jour les armes
-            weapon_types = ['kinetic', 'energy', 'power']
-            for idx, wtype in enumerate(weapon_types):
-                weapon = next((item for item in weapons if self.get_bucket_type(str(item.get('bucketHash'))) == wtype), None)
-                if idx < len(self.weapon_slots):
-                    slot = self.weapon_slots[idx]
-                    self.update_equipment_slot(slot, weapon)
-            
-            # Mettre à jour l'armure
-            armor_types = ['helmet', 'gauntlets', 'chest', 'legs', 'class_item']
-            for idx, atype in enumerate(armor_types):
-                armor_piece = next((item for item in armor if self.get_bucket_type(str(item.get('bucketHash'))) == atype), None)
-                if idx < len(self.armor_slots):
-                    slot = self.armor_slots[idx]
-                    self.update_equipment_slot(slot, armor_piece)           
-            # === NOUVEAU : Calcul et affichage de la lumière réelle ===
-            if power_values:
-                real_light = int(sum(power_values) / len(power_values))
-                self.character_light.setText(str(real_light))
-            else:
-                self.character_light.setText("???")
-            
-            # À la fin, afficher la lumière officielle si elle existe
+            for event in events:
+                slot = slots.get(event.slot)
+                new = event.new
+                if event.kind == ITEM_EQUIPPED:
+                    if new is None:
+                        self.displayed_items.pop(event.slot, None)
+                    else:
+                        self.displayed_items[event.slot] = new
+                    if slot is not None:
+                        self.update_equipment_slot(slot, new)
+                    continue
+                # Même instance : la définition déjà résolue est conservée
+                new.definition = event.old.definition
+                self.displayed_items[event.slot] = new
+                if slot is not None:
+                    if event.kind == ITEM_LIGHT:
+                        slot.set_item(new)
+                    elif event.kind == ITEM_STATS:
+                        slot.item = new  # Les stats ne sont visibles que dans la vue détail
+
+            # Lumière officielle si elle existe, sinon moyenne des items affichés
             if hasattr(self, 'current_official_light'):
-                self.character_light.setText(str(self.current_official_light))
+                light_text = str(self.current_official_light)
             else:
-                self.character_light.setText("???")
-            
-            self.logger.info(f"Affichage terminé - {len(weapons)} armes, {len(armor)} pièces d'armure")
-            
+                power_values = [item.light for item in self.displayed_items.values() if item.light]
+                light_text = str(int(sum(power_values) / len(power_values))) if power_values else "???"
+            if self.character_light.text() != light_text:
+                self.character_light.setText(light_text)
+
+            if not events:
+                self.logger.debug("Équipement inchangé, pas de rafraîchissement de l'affichage")
+            self.start_slot_resolver()
+
         except Exception as e:
             self.logger.error(f"Erreur lors de l'affichage de l'équipement: {str(e)}")
 
@@ -363,16 +645,15 @@ class EquipmentPage(QWidget):
     def change_character(self, index):
         """Appelé lorsqu'un nouveau personnage est sélectionné."""
         if index >= 0:
-            self.show_loading("Chargement du personnage...")
             character_id = self.character_selector.currentData()
             self.logger.info(f"Changement de personnage vers ID: {character_id}")
+            # Les données du snapshot suffisent : pas d'aller-retour réseau
+            if self.show_character_from_snapshot(character_id):
+                return
+            self.show_loading("Chargement du personnage...")
             try:
                 # Mettre à jour la lumière du nouveau personnage sélectionné
-                with open('data/account.json', 'r') as f:
-                    account_data = json.load(f)
-                player_info = account_data['Response'][0]
-                membership_id = player_info['membershipId']
-                membership_type = player_info['membershipType']
+                membership_type, membership_id = account_session.membership()
                 headers = {
                     'X-API-Key': OAUTH_CONFIG['api_key']
                 }
@@ -436,7 +717,7 @@ class EquipmentPage(QWidget):
         if not item:
             self.logger.warning("open_equipment_details appelé sans item !")
             return
-        self.logger.info(f"Ouverture des détails pour l'item : {item.get('name', item.get('itemHash'))}")
+        self.logger.info(f"Ouverture des détails pour l'item : {item.name}")
         # Nettoyage de l'ancienne page de détail
         if self.detail_widget:
             self.logger.debug("Suppression de l'ancien widget de détail.")
@@ -444,7 +725,7 @@ class EquipmentPage(QWidget):
             self.detail_widget.deleteLater()
         # Choix du template
         try:
-            if item.get('inventory', {}).get('tierTypeName', '').lower() == 'exotique' or item.get('inventory', {}).get('tierType') == 6:
+            if item.is_exotic:
                 self.logger.info("Affichage du template exotique.")
                 self.detail_widget = self.create_exotic_weapon_detail(item)
             else:
@@ -463,105 +744,72 @@ class EquipmentPage(QWidget):
             self.detail_widget.deleteLater()
             self.detail_widget = None
 
+    def slot_widgets(self):
+        slots = dict(zip(WEAPON_BUCKETS, self.weapon_slots))
+        slots.update(zip(ARMOR_BUCKETS, self.armor_slots))
+        return slots
+
     def update_equipment_slot(self, slot, item):
-        """Met à jour le slot d'équipement avec les infos de l'API Manifest."""
+        """Met à jour le slot depuis le cache local ; définition et icône manquantes sont résolues en arrière-plan."""
         try:
             if not item:
                 slot.set_item(None)
                 return
-            item_hash = str(item.get('itemHash', ''))
-            # Récupérer les infos de l'API Manifest
-            headers = {
-                'X-API-Key': OAUTH_CONFIG['api_key'],
-                'Content-Type': 'application/json'
-            }
-            manifest_url = f"https://www.bungie.net/Platform/Destiny2/Manifest/DestinyInventoryItemDefinition/{item_hash}/"
-            response = requests.get(manifest_url, headers=headers)
-            if response.status_code == 200:
-                item_def = response.json()['Response']
-                item_name = item_def['displayProperties']['name']
-                icon_path = item_def['displayProperties']['icon']
-                icon_url = f"https://www.bungie.net{icon_path}"
-                # Télécharger l'icône si besoin
-                icon_filename = f"icons/{item_hash}.png"
-                if not os.path.exists(icon_filename) or os.path.getsize(icon_filename) == 0:
-                    icon_response = requests.get(icon_url)
-                    if icon_response.status_code == 200:
-                        with open(icon_filename, 'wb') as f:
-                            f.write(icon_response.content)
-                # Mettre à jour l'item avec le nom
-                item['name'] = item_name
-                slot.set_item(item)
-
-                # Type de munition
-                ammo_type_map = {1: "Primaire", 2: "Spéciale", 3: "Lourde"}
-                ammo_type_icon_map = {
-                    1: "icons/ammo_primary.png",
-                    2: "icons/ammo_special.png",
-                    3: "icons/ammo_heavy.png"
-                }
-                ammo_type = item_def.get("equippingBlock", {}).get("ammoType", 0)
-                item["ammoType"] = ammo_type_map.get(ammo_type, "Inconnu")
-                item["ammoTypeIcon"] = ammo_type_icon_map.get(ammo_type, "")
-
-                # Énergie
-                energy_type_map = {0: "Aucune", 1: "Arc", 2: "Solaire", 3: "Cryo-électrique", 4: "Stasique", 6: "Strand"}
-                energy_type_icon_map = {
-                    1: "icons/energy_arc.png",
-                    2: "icons/energy_solar.png",
-                    3: "icons/energy_void.png",
-                    4: "icons/energy_stasis.png",
-                    6: "icons/energy_strand.png"
-                }
-                energy = item_def.get("energy", {})
-                if energy:
-                    energy_type = energy.get("energyType", 0)
-                    item["energy"] = energy_type_map.get(energy_type, "Aucune")
-                    item["energyIcon"] = energy_type_icon_map.get(energy_type, "")
-                else:
-                    item["energy"] = "Cinétique"
-                    item["energyIcon"] = "icons/energy_kinetic.png"
-
-                # Statistiques (récupère aussi l'icône)
-                item['stats'] = {}
-                if 'stats' in item_def and 'stats' in item_def['stats']:
-                    for stat_hash, stat_obj in item_def['stats']['stats'].items():
-                        # Récupère le nom et l'icône du stat via DestinyStatDefinition
-                        stat_info = self.get_stat_info(stat_hash)
-                        item['stats'][stat_hash] = {
-                            "value": stat_obj.get('value', 0),
-                            "name": stat_info.get("name", str(stat_hash)),
-                            "icon": stat_info.get("icon", "")
-                        }
-
-                # Pour les perks
-                item['perks'] = []
-                if 'perks' in item_def:
-                    for perk in item_def['perks'].get('perkHashes', []):
-                        item['perks'].append(str(perk))
-
-                # Pour les sockets
-                item['sockets'] = []
-                if 'sockets' in item_def:
-                    for socket in item_def['sockets'].get('socketEntries', []):
-                        item['sockets'].append(str(socket.get('singleInitialItemHash', '')))
-            else:
-                slot.set_item(item)  # Affiche au moins la lumière et le hash
+            if item.definition is None:
+                item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+            definition = item.definition
+            path = icon_path(item.item_hash)
+            if definition is None or (definition.icon and not (os.path.exists(path) and os.path.getsize(path) > 0)):
+                self.pending_slot_hashes.add(item.item_hash)
+            slot.set_item(item)  # Affiche au moins la lumière et le hash
         except Exception as e:
             logging.error(f"Erreur update_equipment_slot: {str(e)}")
             slot.set_item(item)
 
+    def start_slot_resolver(self):
+        if not self.pending_slot_hashes or (self.slot_resolver is not None and self.slot_resolver.isRunning()):
+            return
+        item_hashes, self.pending_slot_hashes = self.pending_slot_hashes, set()
+        self.slot_resolver = DefinitionResolver(item_hashes, parent=self)
+        self.slot_resolver.resolved.connect(self.on_slot_definitions_resolved)
+        self.slot_resolver.finished.connect(self.on_slot_resolver_finished)
+        self.slot_resolver.start()
+
+    def on_slot_resolver_finished(self):
+        self.slot_resolver.deleteLater()
+        self.slot_resolver = None
+        # Hashes arrivés pendant la résolution : lot suivant
+        self.start_slot_resolver()
+
+    def on_slot_definitions_resolved(self, item_hashes):
+        resolved = set(item_hashes)
+        slots = self.slot_widgets()
+        for bucket, item in self.displayed_items.items():
+            if item.item_hash not in resolved:
+                continue
+            if item.definition is None:
+                item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+            slot = slots.get(bucket)
+            if slot is not None:
+                slot.set_item(item)
+
+    def get_display_stats(self, item):
+        """Stats affichables (nom, valeur) triées par valeur, celles de l'instance en priorité."""
+        stats = item.stats or (item.definition.stats if item.definition else ())
+        display_stats = []
+        for stat in sorted((s for s in stats if s.value), key=lambda s: s.value, reverse=True):
+            if stat.name is None:
+                stat_info = self.get_stat_info(stat.hash)
+                stat.name = stat_info.get("name", str(stat.hash))
+                stat.icon = stat_info.get("icon", "")
+            display_stats.append((stat.name, stat.value))
+        return display_stats
+
     def get_stat_info(self, stat_hash, lang="fr"):
         try:
-            headers = {
-                'X-API-Key': OAUTH_CONFIG['api_key'],
-                'Content-Type': 'application/json'
-            }
-            url = f"https://www.bungie.net/Platform/Destiny2/Manifest/DestinyStatDefinition/{stat_hash}/"
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                display = data['Response']['displayProperties']
+            stat_def = manifest.get_stat_definition(stat_hash)
+            if stat_def:
+                display = stat_def['displayProperties']
                 icon_path = display.get("icon", "")
                 if icon_path:
                     # Télécharger et sauvegarder l'icône localement
@@ -581,7 +829,7 @@ class EquipmentPage(QWidget):
         return {"name": str(stat_hash), "icon": ""}
 
     def create_non_exotic_weapon_detail(self, item):
-        self.logger.debug(f"Création du widget détail non-exotique pour : {item.get('name', item.get('itemHash'))}")
+        self.logger.debug(f"Création du widget détail non-exotique pour : {item.name}")
         widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setSpacing(20)
@@ -612,7 +860,8 @@ class EquipmentPage(QWidget):
 
         # Colonne gauche : image + type de munition + énergie
         left_col = QVBoxLayout()
-        icon_path = f"icons/{item.get('itemHash')}.png"
+        icon_path = f"icons/{item.item_hash}.png"
+        definition = item.definition
         img = QLabel()
         if os.path.exists(icon_path):
             pixmap = QPixmap(icon_path)
@@ -620,12 +869,12 @@ class EquipmentPage(QWidget):
         img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         left_col.addWidget(img)
         # Type de munition (gras)
-        ammo = item.get('ammoType', '')
+        ammo = definition.ammo_type_name if definition else ''
         ammo_label = QLabel(f"{ammo}")
         ammo_label.setStyleSheet("font-weight: bold; font-size: 16px;")
         left_col.addWidget(ammo_label, alignment=Qt.AlignmentFlag.AlignLeft)
         # Énergie (normal)
-        energy = item.get('energy', '')
+        energy = definition.energy_name if definition else ''
         energy_label = QLabel(f"{energy}")
         energy_label.setStyleSheet("font-size: 14px;")
         left_col.addWidget(energy_label, alignment=Qt.AlignmentFlag.AlignLeft)
@@ -635,20 +884,17 @@ class EquipmentPage(QWidget):
         # Colonne droite : nom, perk, stats
         right_col = QVBoxLayout()
         # Nom de l'arme
-        name_label = QLabel(item.get('name', ''))
+        name_label = QLabel(item.name)
         name_label.setStyleSheet("color: #4d7aff; font-size: 28px; font-weight: bold;")
         right_col.addWidget(name_label)
         # Perk de base (gros, encadré)
-        perks = item.get('perks', [])
+        perks = definition.perks if definition else ()
         if perks:
-            perk_label = QLabel(perks[0])
+            perk_label = QLabel(str(perks[0]))
             perk_label.setStyleSheet("border: 2px solid #4d7aff; border-radius: 6px; padding: 10px; font-size: 18px; font-weight: bold; background: #232a3a;")
             right_col.addWidget(perk_label)
         # Statistiques (encadré)
-        stats = item.get('stats', {})
-        # Filtrer et trier les stats
-        filtered_stats = {k: v for k, v in stats.items() if v != 0 and isinstance(v, dict) and "value" in v}
-        sorted_stats = dict(sorted(filtered_stats.items(), key=lambda x: x[1]["value"], reverse=True))
+        sorted_stats = self.get_display_stats(item)
         if sorted_stats:
             stats_group = QGroupBox("Statistiques")
             stats_group.setStyleSheet("""
@@ -670,9 +916,7 @@ class EquipmentPage(QWidget):
             """)
             stats_layout = QVBoxLayout()
             stats_layout.setSpacing(8)
-            for stat_hash, stat_data in sorted_stats.items():
-                stat_name = stat_data["name"]
-                stat_value = stat_data["value"]
+            for stat_name, stat_value in sorted_stats:
                 stat_row = QHBoxLayout()
                 stat_row.setSpacing(10)
                 
@@ -721,7 +965,7 @@ class EquipmentPage(QWidget):
 
     def create_exotic_weapon_detail(self, item):
         # Même structure que non-exotique, mais nom en doré et perk exotique si dispo
-        self.logger.debug(f"Création du widget détail exotique pour : {item.get('name', item.get('itemHash'))}")
+        self.logger.debug(f"Création du widget détail exotique pour : {item.name}")
         widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setSpacing(20)
@@ -752,7 +996,8 @@ class EquipmentPage(QWidget):
 
         # Colonne gauche : image + type de munition + énergie
         left_col = QVBoxLayout()
-        icon_path = f"icons/{item.get('itemHash')}.png"
+        icon_path = f"icons/{item.item_hash}.png"
+        definition = item.definition
         img = QLabel()
         if os.path.exists(icon_path):
             pixmap = QPixmap(icon_path)
@@ -760,12 +1005,12 @@ class EquipmentPage(QWidget):
         img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         left_col.addWidget(img)
         # Type de munition (gras)
-        ammo = item.get('ammoType', '')
+        ammo = definition.ammo_type_name if definition else ''
         ammo_label = QLabel(f"{ammo}")
         ammo_label.setStyleSheet("font-weight: bold; font-size: 16px;")
         left_col.addWidget(ammo_label, alignment=Qt.AlignmentFlag.AlignLeft)
         # Énergie (normal)
-        energy = item.get('energy', '')
+        energy = definition.energy_name if definition else ''
         energy_label = QLabel(f"{energy}")
         energy_label.setStyleSheet("font-size: 14px;")
         left_col.addWidget(energy_label, alignment=Qt.AlignmentFlag.AlignLeft)
@@ -775,20 +1020,17 @@ class EquipmentPage(QWidget):
         # Colonne droite : nom, perk, stats
         right_col = QVBoxLayout()
         # Nom de l'arme (doré)
-        name_label = QLabel(item.get('name', ''))
+        name_label = QLabel(item.name)
         name_label.setStyleSheet("color: #ffd700; font-size: 28px; font-weight: bold;")
         right_col.addWidget(name_label)
         # Perk exotique (gros, encadré)
-        perks = item.get('perks', [])
+        perks = definition.perks if definition else ()
         if perks:
-            perk_label = QLabel(perks[0])
+            perk_label = QLabel(str(perks[0]))
             perk_label.setStyleSheet("border: 2px solid #ffd700; border-radius: 6px; padding: 10px; font-size: 18px; font-weight: bold; background: #232a3a;")
             right_col.addWidget(perk_label)
         # Statistiques (encadré)
-        stats = item.get('stats', {})
-        # Filtrer et trier les stats
-        filtered_stats = {k: v for k, v in stats.items() if v != 0 and isinstance(v, dict) and "value" in v}
-        sorted_stats = dict(sorted(filtered_stats.items(), key=lambda x: x[1]["value"], reverse=True))
+        sorted_stats = self.get_display_stats(item)
         if sorted_stats:
             stats_group = QGroupBox("Statistiques")
             stats_group.setStyleSheet("""
@@ -810,9 +1052,7 @@ class EquipmentPage(QWidget):
             """)
             stats_layout = QVBoxLayout()
             stats_layout.setSpacing(8)
-            for stat_hash, stat_data in sorted_stats.items():
-                stat_name = stat_data["name"]
-                stat_value = stat_data["value"]
+            for stat_name, stat_value in sorted_stats:
                 stat_row = QHBoxLayout()
                 stat_row.setSpacing(10)
                 
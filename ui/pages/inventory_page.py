@@ -0,0 +1,316 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit,
+                             QListView, QStyledItemDelegate, QStyle)
+from PyQt6.QtCore import Qt, QSize, QRect, QThread, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QPixmap, QPixmapCache, QColor, QPen, QFont, QPainter
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import requests
+from api.manifest import manifest
+from api.models import ItemDefinitionRef, characters_from_profile, inventory_from_profile, private_components_missing
+from api.search_index import InventoryIndex, item_key
+from api.item_filter import compile_filter, FilterSyntaxError
+from api.wishlist import wishlist
+
+ITEM_ROLE = Qt.ItemDataRole.UserRole
+ICON_SIZE = 64
+CELL_SIZE = QSize(ICON_SIZE + 12, ICON_SIZE + 30)
+RESOLVE_BATCH = 100
+
+def icon_path(item_hash):
+    return f'icons/{item_hash}.png'
+
+class DefinitionResolver(QThread):
+    """Résout les définitions et télécharge les icônes manquantes, par lots."""
+    resolved = pyqtSignal(list)
+    plugs_resolved = pyqtSignal(list)
+
+    def __init__(self, item_hashes, plug_hashes=(), parent=None):
+        super().__init__(parent)
+        self.item_hashes = list(item_hashes)
+        self.plug_hashes = list(plug_hashes)
+
+    def download_icon(self, item_hash, definition):
+        path = icon_path(item_hash)
+        icon = definition.get('displayProperties', {}).get('icon')
+        if not icon or (os.path.exists(path) and os.path.getsize(path) > 0):
+            return
+        try:
+            response = requests.get(f"https://www.bungie.net{icon}", timeout=10)
+            if response.status_code == 200:
+                with open(path, 'wb') as f:
+                    f.write(response.content)
+        except Exception as e:
+            logging.error(f"Erreur téléchargement icône {item_hash}: {str(e)}")
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for start in range(0, len(self.item_hashes), RESOLVE_BATCH):
+                if self.isInterruptionRequested():
+                    return
+                batch = self.item_hashes[start:start + RESOLVE_BATCH]
+                definitions = manifest.get_item_definitions(batch)
+                list(executor.map(lambda entry: self.download_icon(*entry), definitions.items()))
+                self.resolved.emit([int(item_hash) for item_hash in definitions])
+            # Perks (plugs) : seuls les noms servent, pour la recherche
+            for start in range(0, len(self.plug_hashes), RESOLVE_BATCH):
+                if self.isInterruptionRequested():
+                    return
+                definitions = manifest.get_item_definitions(self.plug_hashes[start:start + RESOLVE_BATCH])
+                if definitions:
+                    self.plugs_resolved.emit([int(plug_hash) for plug_hash in definitions])
+
+class InventoryModel(QAbstractListModel):
+    """Liste d'ItemInstance ; aucune ressource graphique par item."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        if role == ITEM_ROLE:
+            return item
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{item.name}\n{item.light}" if item.light else item.name
+        return None
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self.items = items
+        self.endResetModel()
+
+    def refresh(self):
+        """Signale que les définitions ou icônes ont changé (seules les cellules visibles sont repeintes)."""
+        if self.items:
+            self.dataChanged.emit(self.index(0), self.index(len(self.items) - 1))
+
+class ItemDelegate(QStyledItemDelegate):
+    """Dessine une cellule (icône, bordure de rareté, puissance ou quantité, badge wishlist)."""
+
+    def sizeHint(self, option, index):
+        return CELL_SIZE
+
+    def pixmap(self, item_hash):
+        key = f'inventory:{item_hash}'
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            path = icon_path(item_hash)
+            if not os.path.exists(path):
+                return None
+            pixmap = QPixmap(path).scaled(ICON_SIZE, ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                                          Qt.TransformationMode.SmoothTransformation)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def paint(self, painter, option, index):
+        item = index.data(ITEM_ROLE)
+        if item is None:
+            return
+        painter.save()
+        rect = option.rect.adjusted(3, 3, -3, -3)
+        selected = option.state & QStyle.StateFlag.State_Selected
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor('#ffd700') if item.is_exotic else QColor('#4d7aff'), 2))
+        painter.setBrush(QColor('#2e3650') if selected else QColor('#232a3a'))
+        painter.drawRoundedRect(rect, 6, 6)
+
+        icon_rect = QRect(rect.left() + (rect.width() - ICON_SIZE) // 2, rect.top() + 3, ICON_SIZE, ICON_SIZE)
+        pixmap = self.pixmap(item.item_hash)
+        if pixmap is not None:
+            painter.drawPixmap(icon_rect, pixmap)
+        else:
+            painter.fillRect(icon_rect, QColor('#1a1a1a'))
+
+        match = wishlist.match(item)
+        if match is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor('#c0392b') if match.trash else QColor('#27ae60'))
+            painter.drawEllipse(QRect(icon_rect.right() - 12, icon_rect.top() + 2, 12, 12))
+
+        text = str(item.light) if item.light else (f"x{item.quantity}" if item.quantity > 1 else "")
+        if text:
+            font = QFont(option.font)
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(QColor('#ffffff'))
+            text_rect = QRect(rect.left(), icon_rect.bottom() + 2, rect.width(), rect.bottom() - icon_rect.bottom() - 2)
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+class InventoryPage(QWidget):
+    """Coffre et inventaires des personnages dans une grille virtualisée."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.all_items = []
+        self.index = InventoryIndex()
+        self.resolver = None
+        # Icônes de tout le coffre (~600 x 64x64) : le cache par défaut (10 Mo) est trop juste
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), 32 * 1024))
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        self.count_label = QLabel("Aucun item")
+        self.count_label.setStyleSheet("color: #888; font-size: 12px;")
+        header.addWidget(self.count_label)
+        header.addStretch()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('Rechercher ou filtrer (ex. is:weapon ammo:special perk:"Outlaw" -is:exotic)')
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.apply_filter)
+        header.addWidget(self.search_input)
+        self.owner_selector = QComboBox()
+        self.owner_selector.addItem("Tout", None)
+        self.owner_selector.addItem("Coffre", 'vault')
+        self.owner_selector.currentIndexChanged.connect(self.apply_filter)
+        header.addWidget(self.owner_selector)
+        layout.addLayout(header)
+
+        self.auth_label = QLabel("Connexion requise : sans jeton Bungie (auth_tokens.json), seul l'équipement "
+                                 "porté est visible ; le coffre et les inventaires sont privés.")
+        self.auth_label.setWordWrap(True)
+        self.auth_label.setStyleSheet("color: #ffb84d; background: #3a2f1a; border-radius: 6px; padding: 8px;")
+        self.auth_label.hide()
+        layout.addWidget(self.auth_label)
+
+        self.model = InventoryModel(self)
+        self.view = QListView()
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setMovement(QListView.Movement.Static)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.view.setBatchSize(200)
+        self.view.setGridSize(CELL_SIZE)
+        self.view.setItemDelegate(ItemDelegate(self.view))
+        self.view.setModel(self.model)
+        layout.addWidget(self.view)
+
+    def set_profile(self, response):
+        """Charge tous les items d'une réponse de profil (composants 102, 201, 205, 300)."""
+        try:
+            self.auth_label.setVisible(private_components_missing(response))
+            items = inventory_from_profile(response)
+            missing = set()
+            missing_plugs = set()
+            for item in items:
+                item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+                if item.definition is None or not os.path.exists(icon_path(item.item_hash)):
+                    missing.add(item.item_hash)
+                missing_plugs.update(plug for plug in item.plugs
+                                     if manifest.get_item_definition(plug, fetch=False) is None)
+            self.all_items = items
+            self.index.update(items)
+            self.update_owner_selector(response)
+            self.apply_filter()
+            self.logger.info(f"Inventaire chargé : {len(items)} items ({len(missing)} à résoudre)")
+            if missing or missing_plugs:
+                self.start_resolver(missing, missing_plugs)
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement de l'inventaire: {str(e)}")
+            self.logger.exception("Détails de l'erreur:")
+
+    def update_owner_selector(self, response):
+        characters = [(c.character_id, f"{c.class_name} - {c.light}") for c in characters_from_profile(response)]
+        current = [self.owner_selector.itemData(i) for i in range(2, self.owner_selector.count())]
+        if current == [character_id for character_id, _ in characters]:
+            return
+        selected = self.owner_selector.currentData()
+        self.owner_selector.blockSignals(True)
+        while self.owner_selector.count() > 2:
+            self.owner_selector.removeItem(2)
+        for character_id, label in characters:
+            self.owner_selector.addItem(label, character_id)
+        index = self.owner_selector.findData(selected)
+        self.owner_selector.setCurrentIndex(index if index >= 0 else 0)
+        self.owner_selector.blockSignals(False)
+
+    def apply_filter(self):
+        owner = self.owner_selector.currentData()
+        query = self.search_input.text().strip()
+        items = self.all_items
+        if query:
+            try:
+                keys = compile_filter(query).filter_keys(self.index)
+            except FilterSyntaxError as e:
+                # Expression incomplète pendant la frappe : on garde l'affichage courant
+                self.search_input.setToolTip(str(e))
+                self.search_input.setStyleSheet("border: 1px solid #ff4d4d;")
+                return
+            self.search_input.setToolTip("")
+            self.search_input.setStyleSheet("")
+            seen = set()
+            matched = []
+            for item in items:
+                key = item_key(item, seen)
+                seen.add(key)
+                if key in keys:
+                    matched.append(item)
+            items = matched
+        if owner == 'vault':
+            items = [item for item in items if item.in_vault]
+        elif owner is not None:
+            items = [item for item in items if item.owner_id == owner]
+        self.model.set_items(items)
+        self.count_label.setText(f"{len(items)} items")
+
+    def on_wishlist_changed(self):
+        """Nouvelle wishlist : badges repeints et filtres is:wishlist réévalués."""
+        self.model.refresh()
+        if self.search_input.text().strip():
+            self.apply_filter()
+
+    def start_resolver(self, item_hashes, plug_hashes=()):
+        if self.resolver is not None:
+            # Résolveur périmé : abandonné sans attente (il finit son lot puis se supprime)
+            stale = self.resolver
+            stale.resolved.disconnect(self.on_definitions_resolved)
+            stale.plugs_resolved.disconnect(self.on_plugs_resolved)
+            stale.requestInterruption()
+            stale.finished.connect(stale.deleteLater)
+            if not stale.isRunning():
+                stale.deleteLater()
+        self.resolver = DefinitionResolver(item_hashes, plug_hashes, self)
+        self.resolver.resolved.connect(self.on_definitions_resolved)
+        self.resolver.plugs_resolved.connect(self.on_plugs_resolved)
+        self.resolver.start()
+
+    def on_definitions_resolved(self, item_hashes):
+        resolved = set(item_hashes)
+        for item in self.all_items:
+            if item.item_hash in resolved:
+                if item.definition is None:
+                    item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+                QPixmapCache.remove(f'inventory:{item.item_hash}')
+        self.reindex(lambda item: item.item_hash in resolved)
+
+    def on_plugs_resolved(self, plug_hashes):
+        # Noms des perks disponibles : termes à ajouter pour les seuls items qui les portent
+        resolved = set(plug_hashes)
+        self.reindex(lambda item: not resolved.isdisjoint(item.plugs))
+
+    def reindex(self, affected):
+        """Réindexe les items pour lesquels `affected(item)` est vrai puis rafraîchit l'affichage."""
+        seen = set()
+        keys = []
+        for item in self.all_items:
+            key = item_key(item, seen)
+            seen.add(key)
+            if affected(item):
+                keys.append(key)
+        self.index.reindex(keys)
+        if self.search_input.text().strip():
+            self.apply_filter()
+        else:
+            self.model.refresh()
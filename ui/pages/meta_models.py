@@ -0,0 +1,134 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QSize, QRect, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QColor, QFont
+
+WEAPON_ROLE = Qt.ItemDataRole.UserRole
+IMAGE_SIZE = 64
+ROW_SIZE = QSize(480, IMAGE_SIZE + 28)
+
+class MetaWeaponModel(QAbstractListModel):
+    """Armes meta (dictionnaires name/type/image_url/usage_rate/activity), toutes activités confondues."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.weapons = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.weapons)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        weapon = self.weapons[index.row()]
+        if role == WEAPON_ROLE:
+            return weapon
+        if role == Qt.ItemDataRole.DisplayRole:
+            return weapon.get('name', '')
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{weapon.get('name', '')} · {weapon.get('type', '')} · {weapon.get('usage_rate', 'N/A')}"
+        return None
+
+    def set_weapons(self, weapons):
+        self.beginResetModel()
+        self.weapons = list(weapons)
+        self.endResetModel()
+
+    def image_ready(self, url):
+        """Repeint les lignes dont l'image vient d'arriver."""
+        for row, weapon in enumerate(self.weapons):
+            if weapon.get('image_url') == url:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+class MetaFilterProxy(QSortFilterProxyModel):
+    """Vue filtrée d'une activité (PvE/PvP) par l'expression compilée courante."""
+
+    def __init__(self, activity, parent=None):
+        super().__init__(parent)
+        self.activity = activity
+        self.compiled = None
+
+    def set_filter(self, compiled):
+        if compiled is self.compiled:
+            return
+        self.compiled = compiled
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        weapon = self.sourceModel().weapons[source_row]
+        # Les armes sans activité PvP sont rangées en PvE (comme l'ancien affichage)
+        activity = 'PvP' if weapon.get('activity') == 'PvP' else 'PvE'
+        if activity != self.activity:
+            return False
+        return self.compiled is None or self.compiled.matches(weapon)
+
+class MetaWeaponDelegate(QStyledItemDelegate):
+    """Dessine une ligne : rang, image, nom, type, activité et usage."""
+
+    def __init__(self, pixmap_provider, parent=None):
+        super().__init__(parent)
+        self.pixmap_provider = pixmap_provider
+        self.rank_font = None
+        self.name_font = None
+
+    def sizeHint(self, option, index):
+        return ROW_SIZE
+
+    def _fonts(self, base):
+        if self.rank_font is None:
+            self.rank_font = QFont(base)
+            self.rank_font.setPixelSize(20)
+            self.rank_font.setBold(True)
+            self.name_font = QFont(base)
+            self.name_font.setPixelSize(16)
+            self.name_font.setBold(True)
+        return self.rank_font, self.name_font
+
+    def paint(self, painter, option, index):
+        weapon = index.data(WEAPON_ROLE)
+        if weapon is None:
+            return
+        rank_font, name_font = self._fonts(option.font)
+        painter.save()
+        rect = option.rect.adjusted(5, 5, -5, -5)
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 77 if hovered else 51))
+        painter.drawRoundedRect(rect, 10, 10)
+
+        rank_rect = QRect(rect.left() + 10, rect.top(), 50, rect.height())
+        painter.setFont(rank_font)
+        painter.setPen(QColor('#4d7aff'))
+        painter.drawText(rank_rect, Qt.AlignmentFlag.AlignVCenter, f"#{index.row() + 1}")
+
+        image_rect = QRect(rank_rect.right() + 5, rect.top() + (rect.height() - IMAGE_SIZE) // 2, IMAGE_SIZE, IMAGE_SIZE)
+        pixmap = self.pixmap_provider(weapon.get('image_url'), IMAGE_SIZE)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(image_rect, pixmap)
+        else:
+            painter.fillRect(image_rect, QColor('#1a1a1a'))
+
+        text_left = image_rect.right() + 15
+        details = [weapon.get('activity', '')]
+        if 'score' in weapon:
+            details.append(f"Score: {weapon['score']}")
+        if 'kill_share' in weapon:
+            details.append(f"Usage: {weapon.get('usage_rate', 'N/A')} · Kills: {weapon['kill_share']}")
+        elif weapon.get('usage_rate') not in (None, '', 'N/A'):
+            details.append(f"Usage: {weapon['usage_rate']}")
+        painter.setFont(option.font)
+        details_text = "   ".join(detail for detail in details if detail)
+        details_width = painter.fontMetrics().horizontalAdvance(details_text) + 15
+        painter.drawText(QRect(rect.right() - details_width, rect.top(), details_width, rect.height()),
+                         Qt.AlignmentFlag.AlignVCenter, details_text)
+
+        name_rect = QRect(text_left, rect.top() + 8, rect.right() - details_width - text_left, rect.height() // 2)
+        painter.setFont(name_font)
+        painter.setPen(QColor('#ffffff'))
+        name = painter.fontMetrics().elidedText(weapon.get('name', ''), Qt.TextElideMode.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignBottom, name)
+        painter.setFont(option.font)
+        painter.setPen(QColor('#888888'))
+        painter.drawText(QRect(text_left, name_rect.bottom() + 4, name_rect.width(), rect.height() // 2 - 12),
+                         Qt.AlignmentFlag.AlignTop, weapon.get('type', ''))
+        painter.restore()
@@ -0,0 +1,102 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QSpinBox,
+                             QPushButton, QListWidget)
+from PyQt6.QtCore import QThread, pyqtSignal
+import logging
+from api.manifest import manifest
+from api.models import ItemDefinitionRef, inventory_from_profile, CLASS_NAMES
+from api.loadout_optimizer import LoadoutOptimizer, ARMOR_STATS, MAX_TIER
+
+class OptimizerThread(QThread):
+    """Résout les définitions d'armure puis lance l'optimiseur hors du thread graphique."""
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, response, class_type, targets, bonus, parent=None):
+        super().__init__(parent)
+        self.response = response
+        self.class_type = class_type
+        self.targets = targets
+        self.bonus = bonus
+
+    def run(self):
+        try:
+            items = [item for item in inventory_from_profile(self.response) if item.instance_id]
+            manifest.get_item_definitions({item.item_hash for item in items})
+            for item in items:
+                item.definition = ItemDefinitionRef.resolve(item.item_hash, manifest, fetch=False)
+            results = LoadoutOptimizer(items, self.class_type).optimize(self.targets, self.bonus)
+            self.finished.emit(results)
+        except Exception as e:
+            logging.error(f"Erreur de l'optimiseur d'armure: {str(e)}")
+            self.error.emit(str(e))
+
+class LoadoutOptimizerDialog(QDialog):
+    """Paliers de stats visés -> meilleures combinaisons d'armure possédées."""
+
+    def __init__(self, response, class_type, parent=None):
+        super().__init__(parent)
+        self.response = response
+        self.class_type = class_type
+        self.thread = None
+        self.setWindowTitle(f"Optimiseur d'armure - {CLASS_NAMES.get(class_type, 'Inconnu')}")
+        self.setMinimumSize(640, 480)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        grid = QGridLayout()
+        grid.addWidget(QLabel("Palier minimum"), 0, 1)
+        grid.addWidget(QLabel("Bonus (mods)"), 0, 2)
+        self.target_inputs = {}
+        self.bonus_inputs = {}
+        for row, (key, _, label) in enumerate(ARMOR_STATS, 1):
+            grid.addWidget(QLabel(label), row, 0)
+            target = QSpinBox()
+            target.setRange(0, MAX_TIER)
+            grid.addWidget(target, row, 1)
+            bonus = QSpinBox()
+            bonus.setRange(0, 100)
+            bonus.setSingleStep(5)
+            grid.addWidget(bonus, row, 2)
+            self.target_inputs[key] = target
+            self.bonus_inputs[key] = bonus
+        layout.addLayout(grid)
+
+        buttons = QHBoxLayout()
+        self.status_label = QLabel("")
+        buttons.addWidget(self.status_label)
+        buttons.addStretch()
+        self.run_button = QPushButton("Optimiser")
+        self.run_button.clicked.connect(self.run_optimizer)
+        buttons.addWidget(self.run_button)
+        layout.addLayout(buttons)
+
+        self.results_list = QListWidget()
+        layout.addWidget(self.results_list)
+
+    def run_optimizer(self):
+        if self.thread is not None and self.thread.isRunning():
+            return
+        targets = {key: spin.value() for key, spin in self.target_inputs.items()}
+        bonus = {key: spin.value() for key, spin in self.bonus_inputs.items()}
+        self.run_button.setEnabled(False)
+        self.status_label.setText("Recherche en cours...")
+        self.results_list.clear()
+        self.thread = OptimizerThread(self.response, self.class_type, targets, bonus, self)
+        self.thread.finished.connect(self.show_results)
+        self.thread.error.connect(self.show_error)
+        self.thread.start()
+
+    def show_results(self, results):
+        self.run_button.setEnabled(True)
+        self.status_label.setText(f"{len(results)} combinaison(s)")
+        if not results:
+            self.results_list.addItem("Aucune combinaison n'atteint ces paliers")
+        for result in results:
+            tiers = " / ".join(f"{label[:3]} {tier}" for (_, _, label), tier in zip(ARMOR_STATS, result.tiers))
+            names = ", ".join(item.name for item in result.items)
+            self.results_list.addItem(f"T{result.total_tier}  {tiers}\n    {names}")
+
+    def show_error(self, message):
+        self.run_button.setEnabled(True)
+        self.status_label.setText(f"Erreur : {message}")
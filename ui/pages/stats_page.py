@@ -0,0 +1,208 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QListWidget, QGroupBox)
+from PyQt6.QtCore import Qt, QRectF, QThread, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor
+from datetime import datetime
+import logging
+from api.account_session import account_session
+from api.activity_crawler import activity_crawler
+from api.manifest import manifest
+from api.pgcr_analytics import PgcrAnalytics
+
+CHART_COLORS = ['#4d7aff', '#ffd700', '#27ae60', '#c0392b', '#9b59b6', '#e67e22', '#1abc9c', '#95a5a6']
+
+class CrawlThread(QThread):
+    """Synchronise l'historique d'activités et les PGCR du compte."""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(str)
+
+    def run(self):
+        try:
+            membership_type, membership_id = account_session.membership()
+            self.finished.emit(activity_crawler.crawl(membership_type, membership_id, progress=self.progress.emit))
+        except Exception as e:
+            logging.error(f"Erreur de synchronisation de l'historique: {str(e)}")
+            self.error.emit(str(e))
+
+class AnalyticsThread(QThread):
+    """Matérialise les nouveaux PGCR puis calcule les agrégats affichés."""
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, analytics, activity, parent=None):
+        super().__init__(parent)
+        self.analytics = analytics
+        self.activity = activity
+
+    def run(self):
+        try:
+            self.analytics.refresh()
+            top = self.analytics.top_weapons(self.activity)
+            definitions = manifest.get_item_definitions(top['weapon_hash'].tolist())
+            top['name'] = [definitions.get(str(weapon_hash), {}).get('displayProperties', {}).get('name', str(weapon_hash))
+                           for weapon_hash in top['weapon_hash'].tolist()]
+            self.finished.emit({
+                'kd': self.analytics.kd_by_week(self.activity),
+                'types': self.analytics.kills_by_weapon_type(self.activity),
+                'top': top,
+            })
+        except Exception as e:
+            logging.error(f"Erreur d'analyse des PGCR: {str(e)}")
+            self.error.emit(str(e))
+
+class BarChart(QWidget):
+    """Histogramme simple (une ou plusieurs séries empilées) dessiné au QPainter."""
+
+    def __init__(self, title, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.labels = []
+        self.series = []     # [(nom, valeurs)]
+        self.value_format = "{:.0f}"
+        self.setMinimumHeight(220)
+
+    def set_data(self, labels, series, value_format="{:.0f}"):
+        self.labels = list(labels)
+        self.series = [(name, [float(value) for value in values]) for name, values in series]
+        self.value_format = value_format
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor('#ffffff'))
+        painter.drawText(QRectF(0, 0, self.width(), 20), Qt.AlignmentFlag.AlignCenter, self.title)
+        if not self.labels or not self.series:
+            painter.setPen(QColor('#888888'))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Aucune donnée")
+            return
+        legend_height = 18 if len(self.series) > 1 else 0
+        area = QRectF(10, 28, self.width() - 20, self.height() - 58 - legend_height)
+        totals = [sum(values[index] for _, values in self.series) for index in range(len(self.labels))]
+        maximum = max(totals) or 1
+        slot = area.width() / len(self.labels)
+        bar_width = max(4.0, slot * 0.7)
+        for index, label in enumerate(self.labels):
+            x = area.left() + index * slot + (slot - bar_width) / 2
+            bottom = area.bottom()
+            for series_index, (_, values) in enumerate(self.series):
+                height = area.height() * values[index] / maximum
+                painter.fillRect(QRectF(x, bottom - height, bar_width, height),
+                                 QColor(CHART_COLORS[series_index % len(CHART_COLORS)]))
+                bottom -= height
+            painter.setPen(QColor('#cccccc'))
+            painter.drawText(QRectF(x - 10, bottom - 16, bar_width + 20, 14), Qt.AlignmentFlag.AlignCenter,
+                             self.value_format.format(totals[index]))
+            painter.drawText(QRectF(area.left() + index * slot, area.bottom() + 4, slot, 16),
+                             Qt.AlignmentFlag.AlignCenter, label)
+        if legend_height:
+            x = area.left()
+            for series_index, (name, _) in enumerate(self.series):
+                painter.fillRect(QRectF(x, self.height() - 16, 10, 10), QColor(CHART_COLORS[series_index % len(CHART_COLORS)]))
+                painter.setPen(QColor('#cccccc'))
+                width = painter.fontMetrics().horizontalAdvance(name) + 24
+                painter.drawText(QRectF(x + 14, self.height() - 20, width, 16), Qt.AlignmentFlag.AlignVCenter, name)
+                x += width
+
+class StatsPage(QWidget):
+    """Statistiques calculées sur l'historique local des PGCR."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.crawl_thread = None
+        self.analytics_thread = None
+        self.analytics = None
+        self.setup_ui()
+        self.refresh_charts()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        title = QLabel("Statistiques")
+        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #4d7aff; padding: 10px;")
+        header.addWidget(title)
+
+        self.activity_selector = QComboBox()
+        self.activity_selector.addItem("Toutes les activités", None)
+        self.activity_selector.addItem("PvP", 'PvP')
+        self.activity_selector.addItem("PvE", 'PvE')
+        self.activity_selector.currentIndexChanged.connect(self.refresh_charts)
+        header.addWidget(self.activity_selector)
+
+        self.sync_button = QPushButton("Synchroniser l'historique")
+        self.sync_button.clicked.connect(self.sync_history)
+        header.addWidget(self.sync_button)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #888; font-size: 12px;")
+        header.addWidget(self.status_label)
+        header.addStretch()
+        layout.addLayout(header)
+
+        charts = QHBoxLayout()
+        self.kd_chart = BarChart("K/D par semaine")
+        charts.addWidget(self.kd_chart)
+        self.types_chart = BarChart("Kills par type d'arme et par semaine")
+        charts.addWidget(self.types_chart)
+        layout.addLayout(charts, 2)
+
+        top_group = QGroupBox("Armes les plus meurtrières")
+        top_layout = QVBoxLayout(top_group)
+        self.top_list = QListWidget()
+        top_layout.addWidget(self.top_list)
+        layout.addWidget(top_group, 1)
+
+    def sync_history(self):
+        if not account_session.is_registered:
+            self.status_label.setText("Aucun compte enregistré")
+            return
+        if self.crawl_thread is not None and self.crawl_thread.isRunning():
+            activity_crawler.stop()
+            return
+        self.sync_button.setText("Arrêter")
+        self.crawl_thread = CrawlThread(self)
+        self.crawl_thread.progress.connect(self.status_label.setText)
+        self.crawl_thread.finished.connect(self.on_crawl_finished)
+        self.crawl_thread.error.connect(self.on_crawl_error)
+        self.crawl_thread.start()
+
+    def on_crawl_finished(self, report):
+        self.sync_button.setText("Synchroniser l'historique")
+        self.status_label.setText(f"{report.activities} activité(s), {report.pgcrs} PGCR en {report.elapsed:.0f} s")
+        self.refresh_charts()
+
+    def on_crawl_error(self, message):
+        self.sync_button.setText("Synchroniser l'historique")
+        self.status_label.setText(f"Erreur : {message}")
+
+    def refresh_charts(self):
+        if not account_session.is_registered:
+            return
+        if self.analytics_thread is not None and self.analytics_thread.isRunning():
+            return
+        if self.analytics is None or self.analytics.membership_id != str(account_session.membership_id):
+            self.analytics = PgcrAnalytics(account_session.membership_id)
+        self.analytics_thread = AnalyticsThread(self.analytics, self.activity_selector.currentData(), self)
+        self.analytics_thread.finished.connect(self.show_results)
+        self.analytics_thread.error.connect(lambda message: self.status_label.setText(f"Erreur : {message}"))
+        self.analytics_thread.start()
+
+    def show_results(self, results):
+        kd = results['kd']
+        self.kd_chart.set_data([datetime.fromtimestamp(week).strftime('%d/%m') for week in kd['week_start']],
+                               [("K/D", kd['kd'])], "{:.2f}")
+        weeks, labels, matrix = results['types']
+        # Les types les plus utilisés, le reste regroupé
+        order = matrix.sum(axis=1).argsort()[::-1]
+        series = [(labels[index], matrix[index]) for index in order[:len(CHART_COLORS) - 1]]
+        if len(order) >= len(CHART_COLORS):
+            series.append(("Autres", matrix[order[len(CHART_COLORS) - 1:]].sum(axis=0)))
+        self.types_chart.set_data([datetime.fromtimestamp(week).strftime('%d/%m') for week in weeks], series)
+
+        top = results['top']
+        self.top_list.clear()
+        for rank, (name, kills, matches, precision) in enumerate(
+                zip(top['name'], top['kills'], top['matches'], top['precision']), 1):
+            self.top_list.addItem(f"#{rank}  {name} — {kills:.0f} kills en {matches} activité(s), "
+                                  f"{precision * 100:.0f}% de précision")
@@ -8,6 +8,7 @@ load_dotenv()
 OAUTH_CONFIG = {
     'client_id': '49198',
     'api_key': os.getenv('BUNGIE_API_KEY'),
+    'client_secret': os.getenv('BUNGIE_CLIENT_SECRET'),
     'auth_url': 'https://www.bungie.net/en/OAuth/Authorize',
     'token_url': 'https://www.bungie.net/Platform/App/OAuth/token/',
     'redirect_uri': 'https://ory.ovh/'
@@ -38,6 +39,17 @@ BUCKET_TYPES = {
     '4023194814': 'ghost',
 }
 
+# Compression des snapshots de profil : None (JSON compact), 'gzip' ou 'zstd'
+SNAPSHOT_COMPRESSION = os.getenv('SNAPSHOT_COMPRESSION') or None
+
+# Composants du profil synchronisé (application et cli.py)
+# 102 : coffre, 201 : inventaires des personnages, 305 : perks (page Inventaire)
+PROFILE_COMPONENTS = '102,200,201,205,300,304,305'
+PROFILE_SNAPSHOT_PATH = 'data/full_account.json'
+
+# Durée de validité des données meta (secondes) avant une nouvelle récupération
+META_CACHE_TTL = int(os.getenv('META_CACHE_TTL') or 6 * 3600)
+
 # Répertoires de l'application
 DIRECTORIES = ['data', 'icons']
 
@@ -0,0 +1,619 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from api.profile_container import ProfileContainer
+
+STORE_PATH = 'data/destiny_hub.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    membership_id TEXT PRIMARY KEY,
+    membership_type INTEGER NOT NULL,
+    display_name TEXT,
+    minted TEXT,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS characters (
+    character_id TEXT PRIMARY KEY,
+    membership_id TEXT NOT NULL,
+    class_type INTEGER,
+    race_type INTEGER,
+    gender_type INTEGER,
+    light INTEGER,
+    date_last_played TEXT,
+    emblem_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_characters_membership ON characters(membership_id);
+
+CREATE TABLE IF NOT EXISTS items (
+    item_key TEXT PRIMARY KEY,
+    membership_id TEXT NOT NULL,
+    character_id TEXT,
+    location TEXT NOT NULL,
+    item_hash INTEGER NOT NULL,
+    item_instance_id TEXT,
+    bucket_hash INTEGER,
+    quantity INTEGER,
+    state INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_items_membership ON items(membership_id);
+CREATE INDEX IF NOT EXISTS idx_items_owner ON items(character_id, location);
+CREATE INDEX IF NOT EXISTS idx_items_hash ON items(item_hash);
+CREATE INDEX IF NOT EXISTS idx_items_bucket ON items(bucket_hash);
+
+CREATE TABLE IF NOT EXISTS instances (
+    item_instance_id TEXT PRIMARY KEY,
+    membership_id TEXT NOT NULL,
+    power INTEGER,
+    damage_type INTEGER,
+    energy_type INTEGER,
+    item_level INTEGER,
+    quality INTEGER,
+    is_equipped INTEGER,
+    can_equip INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_instances_power ON instances(power);
+
+CREATE TABLE IF NOT EXISTS stats (
+    item_instance_id TEXT NOT NULL,
+    stat_hash INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (item_instance_id, stat_hash)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sockets (
+    item_instance_id TEXT NOT NULL,
+    socket_index INTEGER NOT NULL,
+    plug_hash INTEGER,
+    is_enabled INTEGER,
+    is_visible INTEGER,
+    PRIMARY KEY (item_instance_id, socket_index)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS history_snapshots (
+    membership_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    is_keyframe INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (membership_id, recorded_at)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS history_points (
+    membership_id TEXT NOT NULL,
+    character_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    light INTEGER,
+    stats TEXT,
+    loadout TEXT,
+    PRIMARY KEY (membership_id, character_id, recorded_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_history_points_time ON history_points(membership_id, recorded_at);
+
+CREATE TABLE IF NOT EXISTS meta_pgcr (
+    instance_id INTEGER PRIMARY KEY,
+    period REAL,
+    mode INTEGER,
+    activity TEXT,
+    players INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_meta_pgcr_period ON meta_pgcr(activity, period);
+
+CREATE TABLE IF NOT EXISTS activity_history (
+    character_id TEXT NOT NULL,
+    instance_id INTEGER NOT NULL,
+    membership_id TEXT NOT NULL,
+    period REAL NOT NULL,
+    mode INTEGER,
+    modes TEXT,
+    reference_hash INTEGER,
+    PRIMARY KEY (character_id, instance_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_activity_history_instance ON activity_history(instance_id);
+CREATE INDEX IF NOT EXISTS idx_activity_history_period ON activity_history(membership_id, period);
+
+CREATE TABLE IF NOT EXISTS pgcrs (
+    instance_id INTEGER PRIMARY KEY,
+    period REAL NOT NULL,
+    mode INTEGER,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pgcrs_period ON pgcrs(period);
+
+CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+    character_id TEXT PRIMARY KEY,
+    membership_id TEXT NOT NULL,
+    newest_instance_id INTEGER,
+    resume_page INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS clan_members (
+    group_id TEXT NOT NULL,
+    membership_id TEXT NOT NULL,
+    membership_type INTEGER NOT NULL,
+    display_name TEXT,
+    is_online INTEGER,
+    joined_at TEXT,
+    synced_at REAL,
+    PRIMARY KEY (group_id, membership_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta_weapon_usage (
+    instance_id INTEGER NOT NULL,
+    weapon_hash INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    PRIMARY KEY (instance_id, weapon_hash)
+) WITHOUT ROWID;
+"""
+
+# Fichiers JSON historiques importés comme documents (les jetons OAuth restent dans auth_tokens.json)
+LEGACY_DOCUMENTS = {
+    'account': 'data/account.json',
+    'user_profile': 'user_profile.json',
+}
+LEGACY_PROFILES = ['data/profile_data.json', 'data/full_account.json']
+
+class LocalStore:
+    """Stockage local SQLite (WAL) des profils, personnages, items, instances, stats et sockets."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self):
+        """Connexion propre au thread appelant (sqlite3 n'est pas partageable entre threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Transaction explicite : tout est validé ou rien ne l'est."""
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- Documents (compte, profil utilisateur) ---
+
+    def put_document(self, key, data):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO documents (key, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at "
+                "WHERE data IS NOT excluded.data",
+                (key, json.dumps(data, separators=(',', ':')), time.time())
+            )
+
+    def get_document(self, key, default=None):
+        row = self.connection().execute("SELECT data FROM documents WHERE key = ?", (key,)).fetchone()
+        return json.loads(row['data']) if row else default
+
+    def delete_document(self, key):
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM documents WHERE key = ?", (key,)).rowcount
+
+    # --- Profils ---
+
+    @staticmethod
+    def _upsert(conn, table, keys, columns, rows):
+        """Insère ou met à jour seulement les lignes dont une valeur a changé."""
+        if not rows:
+            return 0
+        all_columns = keys + columns
+        placeholders = ', '.join('?' for _ in all_columns)
+        sql = f"INSERT INTO {table} ({', '.join(all_columns)}) VALUES ({placeholders})"
+        if columns:
+            assignments = ', '.join(f"{c} = excluded.{c}" for c in columns)
+            changed = ' OR '.join(f"{c} IS NOT excluded.{c}" for c in columns)
+            sql += f" ON CONFLICT({', '.join(keys)}) DO UPDATE SET {assignments} WHERE {changed}"
+        else:
+            sql += f" ON CONFLICT({', '.join(keys)}) DO NOTHING"
+        before = conn.total_changes
+        conn.executemany(sql, rows)
+        return conn.total_changes - before
+
+    @staticmethod
+    def _delete_missing(conn, table, key, scope_sql, scope_args, keep):
+        """Supprime les lignes du périmètre qui ne figurent plus dans le profil."""
+        existing = {row[0] for row in conn.execute(f"SELECT {key} FROM {table} WHERE {scope_sql}", scope_args)}
+        stale = [(value,) for value in existing - keep]
+        if stale:
+            conn.executemany(f"DELETE FROM {table} WHERE {key} = ?", stale)
+        return len(stale)
+
+    @staticmethod
+    def _item_rows(membership_id, owner_id, location, items, keys):
+        rows = []
+        for item in items:
+            instance_id = item.get('itemInstanceId')
+            item_key = instance_id
+            if not item_key:
+                # Items non instanciés (consommables, matériaux) : clé stable par emplacement
+                base = f"{owner_id or membership_id}:{location}:{item.get('bucketHash')}:{item.get('itemHash')}"
+                item_key = base
+                suffix = 1
+                while item_key in keys:
+                    suffix += 1
+                    item_key = f"{base}:{suffix}"
+            keys.add(item_key)
+            rows.append((item_key, membership_id, owner_id, location, item.get('itemHash'),
+                         instance_id, item.get('bucketHash'), item.get('quantity', 1), item.get('state', 0)))
+        return rows
+
+    def upsert_profile(self, membership_type, membership_id, response):
+        """Enregistre la réponse GetProfile ; seules les lignes modifiées sont écrites.
+
+        Retourne le nombre de lignes insérées, modifiées ou supprimées par table.
+        """
+        membership_id = str(membership_id)
+        counts = {}
+        start = time.perf_counter()
+
+        profile = response.get('profile', {}).get('data', {})
+        display_name = profile.get('userInfo', {}).get('bungieGlobalDisplayName')
+        characters = response.get('characters', {}).get('data', {})
+        item_components = response.get('itemComponents', {})
+        instances = item_components.get('instances', {}).get('data', {})
+        stats = item_components.get('stats', {}).get('data', {})
+        sockets = item_components.get('sockets', {}).get('data', {})
+
+        item_rows = []
+        item_keys = set()
+        for location, component in (('equipped', 'characterEquipment'), ('inventory', 'characterInventories')):
+            for character_id, data in response.get(component, {}).get('data', {}).items():
+                item_rows += self._item_rows(membership_id, character_id, location, data.get('items', []), item_keys)
+        profile_items = response.get('profileInventory', {}).get('data', {}).get('items')
+        if profile_items is not None:
+            item_rows += self._item_rows(membership_id, None, 'profile', profile_items, item_keys)
+
+        with self.transaction() as conn:
+            # Instances du compte avant mise à jour : seules celles qui disparaissent sont nettoyées
+            owned = "SELECT item_instance_id FROM items WHERE membership_id = ? AND item_instance_id IS NOT NULL"
+            previous_instances = {row[0] for row in conn.execute(owned, (membership_id,))} if item_rows else set()
+            counts['profiles'] = self._upsert(
+                conn, 'profiles', ['membership_id'], ['membership_type', 'display_name', 'minted', 'updated_at'],
+                [(membership_id, membership_type, display_name, response.get('responseMintedTimestamp'), time.time())]
+            )
+            counts['characters'] = self._upsert(
+                conn, 'characters', ['character_id'],
+                ['membership_id', 'class_type', 'race_type', 'gender_type', 'light', 'date_last_played', 'emblem_path'],
+                [(char_id, membership_id, c.get('classType'), c.get('raceType'), c.get('genderType'),
+                  c.get('light'), c.get('dateLastPlayed'), c.get('emblemPath'))
+                 for char_id, c in characters.items()]
+            )
+            if characters:
+                counts['characters'] += self._delete_missing(
+                    conn, 'characters', 'character_id', 'membership_id = ?', (membership_id,), set(characters))
+
+            if item_rows:
+                counts['items'] = self._upsert(
+                    conn, 'items', ['item_key'],
+                    ['membership_id', 'character_id', 'location', 'item_hash', 'item_instance_id',
+                     'bucket_hash', 'quantity', 'state'],
+                    item_rows
+                )
+                # Les emplacements absents de la réponse (composant non demandé) sont conservés
+                locations = {row[3] for row in item_rows}
+                scope = f"membership_id = ? AND location IN ({', '.join('?' for _ in locations)})"
+                counts['items'] += self._delete_missing(
+                    conn, 'items', 'item_key', scope, (membership_id, *locations), item_keys)
+
+            counts['instances'] = self._upsert(
+                conn, 'instances', ['item_instance_id'],
+                ['membership_id', 'power', 'damage_type', 'energy_type', 'item_level', 'quality',
+                 'is_equipped', 'can_equip'],
+                [(instance_id, membership_id, data.get('primaryStat', {}).get('value'), data.get('damageType'),
+                  data.get('energy', {}).get('energyType'), data.get('itemLevel'), data.get('quality'),
+                  int(data.get('isEquipped', False)), int(data.get('canEquip', False)))
+                 for instance_id, data in instances.items()]
+            )
+            counts['stats'] = self._upsert(
+                conn, 'stats', ['item_instance_id', 'stat_hash'], ['value'],
+                [(instance_id, int(stat_hash), stat.get('value', 0))
+                 for instance_id, data in stats.items()
+                 for stat_hash, stat in data.get('stats', {}).items()]
+            )
+            counts['sockets'] = self._upsert(
+                conn, 'sockets', ['item_instance_id', 'socket_index'], ['plug_hash', 'is_enabled', 'is_visible'],
+                [(instance_id, index, socket.get('plugHash'), int(socket.get('isEnabled', False)),
+                  int(socket.get('isVisible', False)))
+                 for instance_id, data in sockets.items()
+                 for index, socket in enumerate(data.get('sockets', []))]
+            )
+
+            if item_rows:
+                # Instances, stats et sockets des items qui ont quitté ce compte (clé primaire, sans parcours global)
+                dropped = [(instance_id,) for instance_id in
+                           previous_instances - {row[0] for row in conn.execute(owned, (membership_id,))}]
+                for table in ('instances', 'stats', 'sockets'):
+                    before = conn.total_changes
+                    conn.executemany(f"DELETE FROM {table} WHERE item_instance_id = ?", dropped)
+                    counts[table] += conn.total_changes - before
+
+        logging.debug(f"Profil {membership_id} enregistré en {(time.perf_counter() - start) * 1000:.1f} ms: {counts}")
+        return counts
+
+    # --- Requêtes ---
+
+    def get_characters(self, membership_id):
+        return [dict(row) for row in self.connection().execute(
+            "SELECT * FROM characters WHERE membership_id = ? ORDER BY date_last_played DESC",
+            (str(membership_id),)
+        )]
+
+    def get_items(self, membership_id, character_id=None, location=None):
+        """Items d'un compte, filtrés par personnage et/ou emplacement, avec la puissance d'instance."""
+        sql = ("SELECT items.*, instances.power, instances.damage_type FROM items "
+               "LEFT JOIN instances ON instances.item_instance_id = items.item_instance_id "
+               "WHERE items.membership_id = ?")
+        args = [str(membership_id)]
+        if character_id is not None:
+            sql += " AND items.character_id = ?"
+            args.append(str(character_id))
+        if location is not None:
+            sql += " AND items.location = ?"
+            args.append(location)
+        return [dict(row) for row in self.connection().execute(sql, args)]
+
+    def find_items_by_hash(self, item_hash):
+        return [dict(row) for row in self.connection().execute(
+            "SELECT * FROM items WHERE item_hash = ?", (int(item_hash),)
+        )]
+
+    def get_item_stats(self, item_instance_id):
+        return {row['stat_hash']: row['value'] for row in self.connection().execute(
+            "SELECT stat_hash, value FROM stats WHERE item_instance_id = ?", (str(item_instance_id),)
+        )}
+
+    def get_item_sockets(self, item_instance_id):
+        return [dict(row) for row in self.connection().execute(
+            "SELECT socket_index, plug_hash, is_enabled, is_visible FROM sockets "
+            "WHERE item_instance_id = ? ORDER BY socket_index", (str(item_instance_id),)
+        )]
+
+    # --- Échantillons PGCR (meta) ---
+
+    def add_meta_samples(self, samples):
+        """Enregistre des PGCR échantillonnés : [(instance_id, period, mode, activity, players, {hash: (joueurs, kills)})]."""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO meta_pgcr (instance_id, period, mode, activity, players) VALUES (?, ?, ?, ?, ?)",
+                [sample[:5] for sample in samples]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO meta_weapon_usage (instance_id, weapon_hash, players, kills) VALUES (?, ?, ?, ?)",
+                [(sample[0], weapon_hash, players, kills)
+                 for sample in samples for weapon_hash, (players, kills) in sample[5].items()]
+            )
+
+    def known_meta_samples(self, instance_ids):
+        ids = [int(instance_id) for instance_id in instance_ids]
+        known = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            known.update(row[0] for row in self.connection().execute(
+                f"SELECT instance_id FROM meta_pgcr WHERE instance_id IN ({','.join('?' * len(chunk))})", chunk))
+        return known
+
+    def latest_meta_sample(self):
+        row = self.connection().execute("SELECT MAX(instance_id) FROM meta_pgcr").fetchone()
+        return row[0] if row else None
+
+    def get_meta_usage(self, activity, since=0, limit=10):
+        """Armes les plus utilisées : part des joueurs et part des kills de l'activité depuis `since`."""
+        conn = self.connection()
+        totals = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(players), 0) FROM meta_pgcr WHERE activity = ? AND period >= ?",
+            (activity, since)
+        ).fetchone()
+        total_kills = conn.execute(
+            "SELECT COALESCE(SUM(usage.kills), 0) FROM meta_weapon_usage usage "
+            "JOIN meta_pgcr pgcr ON pgcr.instance_id = usage.instance_id WHERE pgcr.activity = ? AND pgcr.period >= ?",
+            (activity, since)
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT usage.weapon_hash, SUM(usage.players) AS players, SUM(usage.kills) AS kills "
+            "FROM meta_weapon_usage usage JOIN meta_pgcr pgcr ON pgcr.instance_id = usage.instance_id "
+            "WHERE pgcr.activity = ? AND pgcr.period >= ? "
+            "GROUP BY usage.weapon_hash ORDER BY players DESC, kills DESC LIMIT ?",
+            (activity, since, limit)
+        ).fetchall()
+        matches, players = totals
+        return {
+            'matches': matches,
+            'players': players,
+            'weapons': [{'weapon_hash': row['weapon_hash'], 'players': row['players'], 'kills': row['kills'],
+                         'usage': row['players'] / players if players else 0.0,
+                         'kill_share': row['kills'] / total_kills if total_kills else 0.0} for row in rows],
+        }
+
+    def prune_meta_samples(self, before):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM meta_weapon_usage WHERE instance_id IN "
+                         "(SELECT instance_id FROM meta_pgcr WHERE period < ?)", (before,))
+            conn.execute("DELETE FROM meta_pgcr WHERE period < ?", (before,))
+
+    # --- Historique d'activités et PGCR ---
+
+    def get_crawl_checkpoint(self, character_id):
+        row = self.connection().execute(
+            "SELECT * FROM crawl_checkpoints WHERE character_id = ?", (str(character_id),)).fetchone()
+        return dict(row) if row else None
+
+    def save_activity_page(self, membership_id, character_id, rows, checkpoint):
+        """Enregistre une page d'historique et le point de reprise dans la même transaction.
+
+        `rows` : [(instance_id, période, mode, modes, reference_hash)] ; retourne le nombre de nouvelles activités.
+        """
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO activity_history "
+                "(character_id, instance_id, membership_id, period, mode, modes, reference_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(str(character_id), row[0], str(membership_id)) + tuple(row[1:]) for row in rows]
+            )
+            added = conn.total_changes - before
+            conn.execute(
+                "INSERT INTO crawl_checkpoints (character_id, membership_id, newest_instance_id, resume_page, "
+                "complete, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(character_id) DO UPDATE SET newest_instance_id = excluded.newest_instance_id, "
+                "resume_page = excluded.resume_page, complete = excluded.complete, updated_at = excluded.updated_at",
+                (str(character_id), str(membership_id), checkpoint.get('newest_instance_id'),
+                 checkpoint.get('resume_page', 0), int(checkpoint.get('complete', False)), time.time())
+            )
+        return added
+
+    def missing_pgcr_ids(self, membership_id=None, limit=None):
+        """Activités de l'historique dont le PGCR n'est pas encore stocké (plus récentes d'abord)."""
+        sql = ("SELECT DISTINCT history.instance_id FROM activity_history history "
+               "LEFT JOIN pgcrs ON pgcrs.instance_id = history.instance_id WHERE pgcrs.instance_id IS NULL")
+        args = []
+        if membership_id is not None:
+            sql += " AND history.membership_id = ?"
+            args.append(str(membership_id))
+        sql += " ORDER BY history.instance_id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        return [row[0] for row in self.connection().execute(sql, args)]
+
+    def put_pgcrs(self, rows):
+        """[(instance_id, période, mode, payload compressé)]"""
+        with self.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO pgcrs (instance_id, period, mode, payload) VALUES (?, ?, ?, ?)",
+                             rows)
+
+    def pgcr_ids(self, membership_id=None):
+        if membership_id is None:
+            return [row[0] for row in self.connection().execute("SELECT instance_id FROM pgcrs")]
+        return [row[0] for row in self.connection().execute(
+            "SELECT pgcrs.instance_id FROM pgcrs WHERE pgcrs.instance_id IN "
+            "(SELECT instance_id FROM activity_history WHERE membership_id = ?)", (str(membership_id),))]
+
+    def get_pgcr_payloads(self, instance_ids):
+        """(instance_id, période, mode, payload) d'une liste d'activités, par lots."""
+        ids = [int(instance_id) for instance_id in instance_ids]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in self.connection().execute(
+                    f"SELECT instance_id, period, mode, payload FROM pgcrs "
+                    f"WHERE instance_id IN ({','.join('?' * len(chunk))})", chunk):
+                yield tuple(row)
+
+    # --- Clan ---
+
+    def upsert_clan_members(self, group_id, members):
+        """Remplace le roster d'un clan : [(membership_id, membership_type, nom, en ligne, arrivée)]."""
+        group_id = str(group_id)
+        with self.transaction() as conn:
+            count = self._upsert(conn, 'clan_members', ['group_id', 'membership_id'],
+                                 ['membership_type', 'display_name', 'is_online', 'joined_at'],
+                                 [(group_id, str(member[0])) + tuple(member[1:]) for member in members])
+            # Membres partis : supprimés du roster de ce clan seulement (leur profil reste stocké)
+            keep = {str(member[0]) for member in members}
+            existing = {row[0] for row in conn.execute(
+                "SELECT membership_id FROM clan_members WHERE group_id = ?", (group_id,))}
+            conn.executemany("DELETE FROM clan_members WHERE group_id = ? AND membership_id = ?",
+                             [(group_id, membership_id) for membership_id in existing - keep])
+            count += len(existing - keep)
+        return count
+
+    def mark_clan_member_synced(self, group_id, membership_id):
+        with self.transaction() as conn:
+            conn.execute("UPDATE clan_members SET synced_at = ? WHERE group_id = ? AND membership_id = ?",
+                         (time.time(), str(group_id), str(membership_id)))
+
+    def get_clan_roster(self, group_id):
+        """Membres du clan avec la puissance maximale de leurs personnages."""
+        return [dict(row) for row in self.connection().execute(
+            "SELECT members.*, MAX(characters.light) AS power, COUNT(characters.character_id) AS characters "
+            "FROM clan_members members "
+            "LEFT JOIN characters ON characters.membership_id = members.membership_id "
+            "WHERE members.group_id = ? GROUP BY members.membership_id ORDER BY power DESC",
+            (str(group_id),)
+        )]
+
+    def get_clan_item_holders(self, group_id):
+        """(item_hash, membre, nom, puissance max de l'exemplaire) pour les items instanciés du clan."""
+        return [dict(row) for row in self.connection().execute(
+            "SELECT items.item_hash, members.membership_id, members.display_name, MAX(instances.power) AS power "
+            "FROM clan_members members JOIN items ON items.membership_id = members.membership_id "
+            "JOIN instances ON instances.item_instance_id = items.item_instance_id "
+            "WHERE members.group_id = ? GROUP BY items.item_hash, members.membership_id",
+            (str(group_id),)
+        )]
+
+    # --- Migration ---
+
+    def import_legacy_files(self):
+        """Importe les anciens fichiers JSON (une seule fois par document)."""
+        if self.delete_document('auth_tokens'):
+            # Copie en clair des jetons laissée par une version précédente
+            logging.info("Jetons OAuth retirés du stockage local")
+        for key, path in LEGACY_DOCUMENTS.items():
+            if self.get_document(key) is None and os.path.exists(path):
+                try:
+                    with open(path, 'r') as f:
+                        self.put_document(key, json.load(f))
+                    logging.info(f"✓ {path} importé dans le stockage local")
+                except Exception as e:
+                    logging.error(f"Erreur lors de l'import de {path}: {str(e)}")
+
+        account = self.get_document('account')
+        if not account or not account.get('Response'):
+            return
+        player_info = account['Response'][0]
+        if self.get_characters(player_info['membershipId']):
+            return
+        for path in LEGACY_PROFILES:
+            if os.path.exists(path):
+                try:
+                    # Décodage paresseux : progressions et activités ne sont jamais décodées
+                    self.upsert_profile(player_info['membershipType'], player_info['membershipId'],
+                                        ProfileContainer.from_file(path))
+                    logging.info(f"✓ {path} importé dans le stockage local")
+                except Exception as e:
+                    logging.error(f"Erreur lors de l'import de {path}: {str(e)}")
+
+local_store = LocalStore()
@@ -109,7 +109,7 @@ def check_dependencies():
         ('requests', 'requests'),
         ('python-dotenv', 'dotenv'),
         ('psutil', 'psutil'),
-        ('beautifulsoup4', 'bs4')
+        ('lxml', 'lxml')
     ]
     
     for package_name, module_name in dependencies:
@@ -0,0 +1,64 @@
+import logging
+import time
+from utils.config import META_CACHE_TTL
+from utils.local_store import local_store
+
+META_DOCUMENT = 'meta_weapons'
+
+class MetaEntry:
+    __slots__ = ('weapons', 'fetched_at', 'source')
+
+    def __init__(self, weapons, fetched_at, source=None):
+        self.weapons = weapons
+        self.fetched_at = fetched_at
+        self.source = source
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+class MetaCache:
+    """Dernier jeu de données meta valide, persistant dans le stockage local.
+
+    Stale-while-revalidate : les données expirées restent affichables pendant
+    qu'une nouvelle récupération tourne ; un échec de récupération ne les
+    remplace jamais.
+    """
+
+    def __init__(self, store=local_store, key=META_DOCUMENT, ttl=META_CACHE_TTL):
+        self.store = store
+        self.key = key
+        self.ttl = ttl
+        self._entry = None
+
+    def load(self):
+        """Dernier jeu de données (mémoire puis stockage local) ; None si jamais récupéré."""
+        if self._entry is None:
+            try:
+                data = self.store.get_document(self.key)
+            except Exception as e:
+                logging.error(f"Erreur de lecture du cache meta: {str(e)}")
+                data = None
+            if data and data.get('weapons'):
+                self._entry = MetaEntry(data['weapons'], data.get('fetched_at', 0), data.get('source'))
+        return self._entry
+
+    def is_stale(self, entry=None):
+        entry = entry or self.load()
+        return entry is None or entry.age >= self.ttl
+
+    def seconds_until_stale(self):
+        entry = self.load()
+        return 0 if entry is None else max(0, self.ttl - entry.age)
+
+    def save(self, weapons, source=None):
+        """Enregistre un jeu de données valide (les résultats vides sont ignorés)."""
+        if not weapons:
+            return self.load()
+        entry = MetaEntry(weapons, time.time(), source)
+        self.store.put_document(self.key, {'weapons': weapons, 'fetched_at': entry.fetched_at, 'source': source})
+        self._entry = entry
+        logging.info(f"✓ Cache meta mis à jour : {len(weapons)} armes ({source or 'inconnu'})")
+        return entry
+
+meta_cache = MetaCache()
@@ -0,0 +1,282 @@
+import json
+import logging
+import threading
+import time
+import zlib
+from utils.local_store import local_store
+
+# Profondeur d'aplatissement : composant / sous-composant / data / identifiant
+FLATTEN_DEPTH = 4
+SEPARATOR = '\x1f'
+# Listes d'items : une entrée par item (chemin + LIST_MARKER + clé) et une entrée d'ordre (chemin + LIST_MARKER)
+LIST_MARKER = '\x1e'
+# Clés qui changent à chaque réponse sans refléter un changement du compte
+VOLATILE_KEYS = {'responseMintedTimestamp', 'secondaryComponentsMintedTimestamp'}
+
+def _encode_value(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+def _is_item_list(value):
+    return bool(value) and isinstance(value, list) and all(isinstance(item, dict) and 'itemHash' in item
+                                                           for item in value)
+
+def item_list_keys(items):
+    """Clé stable de chaque item d'une liste : itemInstanceId, sinon itemHash et rang parmi ses doublons."""
+    keys, occurrences = [], {}
+    for item in items:
+        key = item.get('itemInstanceId')
+        if key is None:
+            item_hash = str(item['itemHash'])
+            occurrence = occurrences.get(item_hash, 0)
+            occurrences[item_hash] = occurrence + 1
+            key = f"{item_hash}#{occurrence}"
+        keys.append(str(key))
+    return keys
+
+def flatten_profile(response, depth=FLATTEN_DEPTH):
+    """Aplatit une réponse de profil en {chemin: valeur JSON compacte}.
+
+    Les objets sont aplatis (jusqu'à `depth` niveaux) : chaque item
+    d'instance, personnage ou stat devient une entrée comparable par simple
+    égalité de chaînes. Les listes d'items (inventaires, coffre, équipement)
+    sont indexées par item, plus une entrée d'ordre : un item modifié ne
+    réécrit pas toute la liste dans le delta. Les autres listes restent
+    des valeurs entières.
+    """
+    flat = {}
+
+    def walk(value, path, level):
+        if _is_item_list(value):
+            prefix = SEPARATOR.join(path) + LIST_MARKER
+            keys = item_list_keys(value)
+            flat[prefix] = _encode_value(keys)
+            for key, item in zip(keys, value):
+                flat[prefix + key] = _encode_value(item)
+        elif isinstance(value, dict) and value and level < depth:
+            for key, child in value.items():
+                walk(child, path + (key,), level + 1)
+        else:
+            flat[SEPARATOR.join(path)] = _encode_value(value)
+
+    for name in response.keys():
+        walk(response[name], (name,), 1)
+    return flat
+
+def _set_path(response, path, value):
+    keys = path.split(SEPARATOR)
+    node = response
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = value
+
+def unflatten_profile(flat):
+    """Reconstruit la réponse de profil à partir de sa forme aplatie."""
+    response = {}
+    lists = {}  # chemin -> (ordre des clés, {clé: item})
+    for path, encoded in flat.items():
+        if LIST_MARKER in path:
+            path, _, key = path.partition(LIST_MARKER)
+            order, items = lists.setdefault(path, ([], {}))
+            if key:
+                items[key] = json.loads(encoded)
+            else:
+                order.extend(json.loads(encoded))
+            continue
+        _set_path(response, path, json.loads(encoded))
+    for path, (order, items) in lists.items():
+        _set_path(response, path, [items[key] for key in order if key in items])
+    return response
+
+def compute_delta(previous, current):
+    """Delta entre deux profils aplatis : valeurs modifiées ou ajoutées, clés supprimées."""
+    changed = {key: value for key, value in current.items() if previous.get(key) != value}
+    removed = [key for key in previous if key not in current]
+    return {'set': changed, 'del': removed}
+
+def apply_delta(flat, delta):
+    flat.update(delta['set'])
+    for key in delta['del']:
+        flat.pop(key, None)
+    return flat
+
+def _encode(data):
+    return zlib.compress(json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), 6)
+
+def _decode(payload):
+    return json.loads(zlib.decompress(payload))
+
+class ProfileHistory:
+    """Historique des profils : une image complète périodique et des deltas compacts entre deux.
+
+    Chaque enregistrement alimente aussi une série par personnage (lumière,
+    stats, équipement) indexée par date, pour les graphiques sans
+    reconstruction.
+    """
+
+    def __init__(self, store=local_store, keyframe_interval=48, keyframe_ratio=0.5):
+        self.store = store
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_ratio = keyframe_ratio
+        self.lock = threading.Lock()
+        # membership_id -> (état aplati courant, deltas depuis la dernière image complète)
+        self._heads = {}
+
+    def _head(self, membership_id):
+        head = self._heads.get(membership_id)
+        if head is None:
+            conn = self.store.connection()
+            row = conn.execute(
+                "SELECT recorded_at FROM history_snapshots WHERE membership_id = ? AND is_keyframe = 1 "
+                "ORDER BY recorded_at DESC LIMIT 1", (membership_id,)
+            ).fetchone()
+            if row is None:
+                head = (None, 0)
+            else:
+                flat, deltas = self._reconstruct_flat(conn, membership_id, None)
+                head = (flat, deltas)
+            self._heads[membership_id] = head
+        return head
+
+    def record(self, membership_id, response, recorded_at=None):
+        """Enregistre un profil ; retourne 'keyframe', 'delta' ou None si rien n'a changé."""
+        membership_id = str(membership_id)
+        recorded_at = recorded_at or time.time()
+        start = time.perf_counter()
+        flat = flatten_profile(response)
+        points = self._points(membership_id, response, recorded_at)
+        with self.lock:
+            previous, deltas = self._head(membership_id)
+            kind = None
+            payload = None
+            if previous is None:
+                kind, payload = 'keyframe', _encode(flat)
+            else:
+                delta = compute_delta(previous, flat)
+                if delta['del'] or any(key not in VOLATILE_KEYS for key in delta['set']):
+                    kind, payload = 'delta', _encode(delta)
+                    if deltas + 1 >= self.keyframe_interval:
+                        kind, payload = 'keyframe', _encode(flat)
+                    else:
+                        keyframe = _encode(flat)
+                        if len(payload) > self.keyframe_ratio * len(keyframe):
+                            kind, payload = 'keyframe', keyframe
+            with self.store.transaction() as conn:
+                if payload is not None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO history_snapshots (membership_id, recorded_at, is_keyframe, payload) "
+                        "VALUES (?, ?, ?, ?)", (membership_id, recorded_at, int(kind == 'keyframe'), payload)
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO history_points (membership_id, character_id, recorded_at, light, stats, loadout) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", points
+                )
+            if kind == 'keyframe':
+                self._heads[membership_id] = (flat, 0)
+            elif kind == 'delta':
+                self._heads[membership_id] = (flat, deltas + 1)
+        logging.debug(f"Historique {membership_id}: {kind or 'inchangé'} "
+                      f"({len(payload) if payload else 0} octets, {(time.perf_counter() - start) * 1000:.1f} ms)")
+        return kind
+
+    @staticmethod
+    def _points(membership_id, response, recorded_at):
+        """Lignes de série temporelle par personnage."""
+        characters = response.get('characters', {}).get('data', {})
+        equipment = response.get('characterEquipment', {}).get('data', {})
+        rows = []
+        for character_id, character in characters.items():
+            loadout = [item.get('itemInstanceId') or item.get('itemHash')
+                       for item in equipment.get(character_id, {}).get('items', [])]
+            rows.append((membership_id, character_id, recorded_at, character.get('light'),
+                         json.dumps(character.get('stats', {}), separators=(',', ':')),
+                         json.dumps(loadout, separators=(',', ':'))))
+        return rows
+
+    def _reconstruct_flat(self, conn, membership_id, at):
+        """État aplati à la date `at` (None = dernier) : dernière image complète puis deltas."""
+        time_filter = "" if at is None else " AND recorded_at <= ?"
+        args = (membership_id,) if at is None else (membership_id, at)
+        keyframe = conn.execute(
+            "SELECT recorded_at, payload FROM history_snapshots WHERE membership_id = ? AND is_keyframe = 1"
+            f"{time_filter} ORDER BY recorded_at DESC LIMIT 1", args
+        ).fetchone()
+        if keyframe is None:
+            return None, 0
+        flat = _decode(keyframe['payload'])
+        rows = conn.execute(
+            "SELECT payload FROM history_snapshots WHERE membership_id = ? AND is_keyframe = 0 "
+            f"AND recorded_at > ?{time_filter} ORDER BY recorded_at",
+            (membership_id, keyframe['recorded_at']) + (() if at is None else (at,))
+        ).fetchall()
+        for row in rows:
+            apply_delta(flat, _decode(row['payload']))
+        return flat, len(rows)
+
+    def reconstruct(self, membership_id, at=None):
+        """Réponse de profil telle qu'elle était à la date `at` (timestamp), ou None."""
+        flat, _ = self._reconstruct_flat(self.store.connection(), str(membership_id), at)
+        return unflatten_profile(flat) if flat is not None else None
+
+    def timestamps(self, membership_id, since=None, until=None):
+        """Dates des enregistrements (images complètes et deltas)."""
+        sql = "SELECT recorded_at FROM history_snapshots WHERE membership_id = ?"
+        args = [str(membership_id)]
+        if since is not None:
+            sql += " AND recorded_at >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND recorded_at <= ?"
+            args.append(until)
+        return [row[0] for row in self.store.connection().execute(sql + " ORDER BY recorded_at", args)]
+
+    def series(self, membership_id, character_id=None, since=None, until=None):
+        """Points (recorded_at, character_id, light, stats, loadout) d'une période, par date croissante."""
+        sql = "SELECT character_id, recorded_at, light, stats, loadout FROM history_points WHERE membership_id = ?"
+        args = [str(membership_id)]
+        if character_id is not None:
+            sql += " AND character_id = ?"
+            args.append(str(character_id))
+        if since is not None:
+            sql += " AND recorded_at >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND recorded_at <= ?"
+            args.append(until)
+        return [{
+            'recorded_at': row['recorded_at'],
+            'character_id': row['character_id'],
+            'light': row['light'],
+            'stats': json.loads(row['stats']) if row['stats'] else {},
+            'loadout': json.loads(row['loadout']) if row['loadout'] else [],
+        } for row in self.store.connection().execute(sql + " ORDER BY recorded_at", args)]
+
+    def light_series(self, membership_id, days=30, character_id=None):
+        """Lumière par personnage sur les `days` derniers jours : {character_id: [(recorded_at, light)]}."""
+        sql = ("SELECT character_id, recorded_at, light FROM history_points "
+               "WHERE membership_id = ? AND recorded_at >= ?")
+        args = [str(membership_id), time.time() - days * 86400]
+        if character_id is not None:
+            sql += " AND character_id = ?"
+            args.append(str(character_id))
+        result = {}
+        for row in self.store.connection().execute(sql + " ORDER BY recorded_at", args):
+            result.setdefault(row['character_id'], []).append((row['recorded_at'], row['light']))
+        return result
+
+    def prune(self, membership_id, before):
+        """Supprime l'historique antérieur à `before` en conservant une image complète de départ."""
+        membership_id = str(membership_id)
+        state, _ = self._reconstruct_flat(self.store.connection(), membership_id, before)
+        with self.lock, self.store.transaction() as conn:
+            conn.execute("DELETE FROM history_snapshots WHERE membership_id = ? AND recorded_at <= ?",
+                         (membership_id, before))
+            conn.execute("DELETE FROM history_points WHERE membership_id = ? AND recorded_at < ?",
+                         (membership_id, before))
+            if state is not None:
+                conn.execute(
+                    "INSERT INTO history_snapshots (membership_id, recorded_at, is_keyframe, payload) "
+                    "VALUES (?, ?, 1, ?)", (membership_id, before, _encode(state))
+                )
+            self._heads.pop(membership_id, None)
+
+profile_history = ProfileHistory()
@@ -0,0 +1,234 @@
+import importlib.abc
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _TimedLoader:
+    """Enveloppe un loader pour mesurer l'exécution d'un module."""
+
+    def __init__(self, loader, fullname, profiler):
+        self._loader = loader
+        self._fullname = fullname
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.span(self._fullname, category='import'):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Finder placé en tête de sys.meta_path qui chronomètre chaque import."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, 'busy', False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, fullname, self.profiler)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+
+class StartupProfiler:
+    """Chronologie du démarrage : imports, construction des pages et premier appel réseau."""
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = []
+        self.marks = []
+        self.first_network = None
+        self._import_timer = None
+        self._original_send = None
+
+    def enable(self):
+        """Active l'enregistrement (à appeler avant les imports lourds)."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._import_timer = _ImportTimer(self)
+        sys.meta_path.insert(0, self._import_timer)
+        self.mark('profiler')
+        self._hook_network()
+
+    def disable(self):
+        """Retire les hooks d'import et de réseau."""
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+        self._import_timer = None
+        if self._original_send is not None:
+            import requests
+            requests.sessions.Session.send = self._original_send
+            self._original_send = None
+        self.enabled = False
+
+    def _hook_network(self):
+        """Chronomètre le premier appel réseau effectué via requests."""
+        try:
+            import requests
+        except ImportError:
+            return
+        original_send = requests.sessions.Session.send
+        profiler = self
+
+        def timed_send(session, request, **kwargs):
+            if profiler.first_network is not None:
+                return original_send(session, request, **kwargs)
+            start = time.perf_counter()
+            try:
+                return original_send(session, request, **kwargs)
+            finally:
+                end = time.perf_counter()
+                if profiler.first_network is None:
+                    profiler.first_network = (request.url, start, end)
+                    profiler._add_event(f"{request.method} {request.url}", 'network', start, end)
+                    profiler.mark('first_network')
+
+        self._original_send = original_send
+        requests.sessions.Session.send = timed_send
+
+    def _add_event(self, name, category, start, end):
+        self.events.append({
+            'name': name,
+            'category': category,
+            'start': start,
+            'end': end,
+            'tid': threading.get_ident(),
+        })
+
+    @contextmanager
+    def span(self, name, category='startup'):
+        """Mesure la durée d'un bloc."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_event(name, category, start, time.perf_counter())
+
+    def mark(self, name):
+        """Enregistre un jalon instantané de la chronologie."""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter()))
+
+    def elapsed_ms(self, name=None):
+        """Durée en ms entre l'origine et un jalon (le dernier par défaut) ; None si absent."""
+        if not self.marks:
+            return None
+        if name is None:
+            return (self.marks[-1][1] - self.origin) * 1000
+        for mark_name, timestamp in self.marks:
+            if mark_name == name:
+                return (timestamp - self.origin) * 1000
+        return None
+
+    def _self_times(self, category):
+        """Temps propre de chaque événement (durée moins celle des enfants directs)."""
+        events = sorted((e for e in self.events if e['category'] == category),
+                        key=lambda e: (e['start'], -e['end']))
+        self_times = {}
+        stack = []
+        for event in events:
+            while stack and stack[-1]['end'] <= event['start']:
+                stack.pop()
+            duration = event['end'] - event['start']
+            self_times[id(event)] = duration
+            if stack:
+                self_times[id(stack[-1])] -= duration
+            stack.append(event)
+        return [(event, self_times[id(event)]) for event in events]
+
+    def report(self, top=25):
+        """Retourne le rapport texte de la chronologie de démarrage."""
+        lines = ["=== Profil de démarrage ==="]
+        for name, timestamp in self.marks:
+            lines.append(f"{(timestamp - self.origin) * 1000:9.1f} ms  {name}")
+
+        startup = [e for e in self.events if e['category'] == 'startup']
+        if startup:
+            lines.append("--- Construction ---")
+            for event in startup:
+                lines.append(f"{(event['end'] - event['start']) * 1000:9.1f} ms  {event['name']}")
+
+        lines.append("--- Premier appel réseau ---")
+        if self.first_network:
+            url, start, end = self.first_network
+            lines.append(f"{(end - start) * 1000:9.1f} ms  {url} "
+                         f"(à +{(start - self.origin) * 1000:.1f} ms)")
+        else:
+            lines.append("      non observé")
+
+        imports = self._self_times('import')
+        if imports:
+            total = sum(self_time for _, self_time in imports)
+            lines.append(f"--- Imports ({len(imports)} modules, {total * 1000:.1f} ms) ---")
+            for event, self_time in sorted(imports, key=lambda x: x[1], reverse=True)[:top]:
+                cumulative = (event['end'] - event['start']) * 1000
+                lines.append(f"{self_time * 1000:9.1f} ms  {event['name']} (cumulé {cumulative:.1f} ms)")
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path):
+        """Écrit la chronologie au format Chrome trace (chrome://tracing, Perfetto)."""
+        trace_events = []
+        for event in self.events:
+            trace_events.append({
+                'name': event['name'],
+                'cat': event['category'],
+                'ph': 'X',
+                'ts': (event['start'] - self.origin) * 1e6,
+                'dur': (event['end'] - event['start']) * 1e6,
+                'pid': 1,
+                'tid': event['tid'],
+            })
+        for name, timestamp in self.marks:
+            trace_events.append({
+                'name': name,
+                'cat': 'mark',
+                'ph': 'i',
+                's': 'g',
+                'ts': (timestamp - self.origin) * 1e6,
+                'pid': 1,
+                'tid': threading.main_thread().ident,
+            })
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        logging.info(f"Trace Chrome écrite: {path}")
+
+    def check_budget(self, budget_ms, mark='window_shown'):
+        """Vérifie que le démarrage à froid reste sous le budget (en ms) ; un jalon absent échoue."""
+        elapsed = self.elapsed_ms(mark)
+        if elapsed is None:
+            logging.error(f"❌ Jalon de démarrage '{mark}' non enregistré : budget non vérifiable")
+            return False
+        if elapsed > budget_ms:
+            logging.error(f"❌ Budget de démarrage dépassé: {elapsed:.1f} ms > {budget_ms:.1f} ms")
+            return False
+        logging.info(f"✅ Démarrage dans le budget: {elapsed:.1f} ms <= {budget_ms:.1f} ms")
+        return True
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,123 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+
+try:
+    import zstandard
+except ImportError:  # Compression zstd optionnelle
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def encode_snapshot(data, compression=None):
+    """Sérialise en JSON compact, éventuellement compressé ('gzip' ou 'zstd')."""
+    raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if compression == 'gzip':
+        return gzip.compress(raw, compresslevel=6)
+    if compression == 'zstd':
+        if zstandard is None:
+            logging.warning("Module zstandard absent, snapshot écrit en gzip")
+            return gzip.compress(raw, compresslevel=6)
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return raw
+
+def decompress_snapshot(payload):
+    """Retourne les octets JSON d'un snapshot, compressé ou non."""
+    if payload[:2] == GZIP_MAGIC:
+        return gzip.decompress(payload)
+    if payload[:4] == ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Snapshot zstd mais module zstandard absent")
+        return zstandard.ZstdDecompressor().decompress(payload, max_output_size=1 << 30)
+    return payload
+
+def decode_snapshot(payload):
+    """Décode un snapshot compact, compressé ou au format historique (indent=4)."""
+    return json.loads(decompress_snapshot(payload))
+
+def read_snapshot_bytes(path):
+    with open(path, 'rb') as f:
+        return decompress_snapshot(f.read())
+
+def read_snapshot(path):
+    return json.loads(read_snapshot_bytes(path))
+
+def write_snapshot(path, data, compression=None):
+    """Écrit un snapshot de façon atomique : fichier temporaire, fsync, puis rename."""
+    payload = encode_snapshot(data, compression)
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # Rendre le rename durable (sans effet sous Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return len(payload)
+
+class SnapshotWriter:
+    """Écrit les snapshots depuis un thread dédié.
+
+    Les demandes successives pour un même fichier sont fusionnées : seule la
+    dernière version en attente est écrite.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self.writing = 0
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='SnapshotWriter', daemon=True)
+            self.thread.start()
+
+    def submit(self, path, data, compression=None):
+        """Planifie l'écriture de `data` dans `path` et rend la main immédiatement."""
+        with self.condition:
+            self.pending[path] = (data, compression)
+            self._ensure_thread()
+            self.condition.notify()
+
+    def flush(self, timeout=10):
+        """Attend que toutes les écritures en attente soient terminées."""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.writing, timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                path, (data, compression) = self.pending.popitem()
+                self.writing += 1
+            try:
+                size = write_snapshot(path, data, compression)
+                logging.debug(f"Snapshot écrit: {path} ({size} octets)")
+            except Exception as e:
+                logging.error(f"Erreur lors de l'écriture du snapshot {path}: {str(e)}")
+            finally:
+                with self.condition:
+                    self.writing -= 1
+                    self.condition.notify_all()
+
+snapshot_writer = SnapshotWriter()
+atexit.register(snapshot_writer.flush)